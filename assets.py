@@ -0,0 +1,51 @@
+import pygame
+from constants import FONT_FILE
+
+# The assets already loaded, so that each file is only read once, the first time it is used.
+fonts = {}  # The fonts of the game, keyed by size.
+images = {}  # The images converted for the display, keyed by (path, size). The size is None for the original image.
+
+
+def get_font(size):
+    """
+    Get the font of the game at a given size.
+    The font file is only loaded the first time a size is requested, so that the screens that are never shown do not
+    slow down the start of the game.
+
+    Parameters:
+    - size (int): The size of the font, in pixels.
+
+    Returns:
+    - pygame.font.Font: The font of the game at this size.
+    """
+    font = fonts.get(size)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()  # Initialize the font module to use custom fonts.
+        font = pygame.font.Font(FONT_FILE, size)
+        fonts[size] = font
+    return font
+
+
+def get_image(path, size=None):
+    """
+    Get an image, converted for faster blitting and optionally scaled.
+    The image file is only loaded the first time it is requested, and each size is only scaled once.
+    The display must be created before the first call, since the image is converted to its pixel format.
+
+    Parameters:
+    - path (str): The path of the image file.
+    - size (tuple, optional): The (width, height) of the scaled image. Defaults to None, which keeps the original size.
+
+    Returns:
+    - pygame.Surface: The image. It is shared between the callers, so it must not be drawn on.
+    """
+    key = (path, size)
+    image = images.get(key)
+    if image is None:
+        if size is None:
+            image = pygame.image.load(path).convert()
+        else:
+            image = pygame.transform.scale(get_image(path), size)
+        images[key] = image
+    return image
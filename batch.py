@@ -0,0 +1,236 @@
+"""
+Generates and solves many labyrinths in several processes, and writes statistics about each resolution to a file.
+
+Each labyrinth is generated with the chosen algorithm, then solved with every resolution algorithm. For each algorithm,
+the labyrinth is solved twice: at once with `solve`, which gives the time taken by the algorithm, and step by step as in
+the resolution menu, which gives the statistics of the search (number of moves, visited and banned cells).
+
+The labyrinths are spread over a pool of processes. Each labyrinth gets its own seed, drawn from the seed of the batch,
+so the results do not depend on the number of processes or on the order in which the labyrinths are done. The rows are
+written to the file as soon as a labyrinth is done, and only a few labyrinths are queued at once, so the memory used
+does not depend on the number of labyrinths.
+
+Run it from the root of the repository:
+
+    python batch.py 1000 stats.csv --size 50
+    python batch.py 10000 stats.jsonl --size 30 --generation-algorithm kruskal --looping-factor 0.2 --workers 8
+    python batch.py 100 stats.csv --size 200 --png-dir images
+
+The columns are:
+- maze, seed: The index of the labyrinth in the batch, and the seed it was generated and solved with.
+- size, generation_algorithm, looping_factor: The parameters of the labyrinth.
+- resolution_algorithm: The algorithm of the row.
+- generation_time, solve_time, step_time: The time taken by `generate`, by `solve`, and by the resolution steps, in
+  seconds.
+- path_length: The number of cells of the path found, start and end included.
+- total_move_count: The number of steps of the resolution (the number of sweeps for dead-end filling).
+- visited_count: The number of cells reached by the search, empty for dead-end filling.
+- banned_count: The number of cells banned by the recursive backtracking, or filled by the dead-end filling.
+"""
+
+import argparse
+import concurrent.futures
+import contextlib
+import csv
+import io
+import json
+import math
+import os
+import random
+import time
+
+from maze import Maze, GENERATION_ALGORITHMS, RESOLUTION_ALGORITHMS
+
+COLUMNS = [
+    "maze",
+    "seed",
+    "size",
+    "generation_algorithm",
+    "looping_factor",
+    "resolution_algorithm",
+    "generation_time",
+    "solve_time",
+    "step_time",
+    "path_length",
+    "total_move_count",
+    "visited_count",
+    "banned_count",
+]
+QUEUED_PER_WORKER = 4  # The number of labyrinths queued for each process, so that no process waits for work
+
+
+def get_search_statistics(labyrinth):
+    """
+    Gets the statistics of a resolution performed step by step, from the resolution data of the labyrinth.
+
+    Parameters:
+    - labyrinth (Maze): The solved labyrinth.
+
+    Returns:
+    - dict: The path length, and the numbers of moves, visited and banned cells (None when they are not tracked).
+    """
+    data = labyrinth.resolution_data
+    algorithm = labyrinth.resolution_algorithm
+    statistics = {
+        "path_length": None,
+        "total_move_count": data["total_move_count"],
+        "visited_count": None,
+        "banned_count": None,
+    }
+    if algorithm == "recursive-backtracking":
+        statistics["path_length"] = len(data["stack"])  # The stack holds the path from the start to the end
+        statistics["visited_count"] = len(data["visited"]) + 1  # The start cell is not in the list of visited cells
+        statistics["banned_count"] = len(data["banned"])
+    else:
+        statistics["path_length"] = len(data["path"])
+        if algorithm == "a-star":
+            statistics["visited_count"] = len(data["cameFrom"]) + 1  # Every cell reached has a parent, but the start
+        elif algorithm == "bidirectional":
+            statistics["visited_count"] = len(data["startCameFrom"]) + len(data["endCameFrom"])
+        elif algorithm == "dead-end-filling":
+            statistics["banned_count"] = data["filled_count"]
+    return statistics
+
+
+def warm_up():
+    """
+    Solves a small labyrinth with every resolution algorithm, when a worker process starts.
+
+    Some algorithms import modules the first time they run (NumPy for the dead-end filling, and NumPy itself loads some
+    of its modules on first use). Without this, the first labyrinth of each process would include these imports.
+    """
+    process_maze(0, 0, 4, GENERATION_ALGORITHMS[0], 0)
+
+
+def process_maze(index, seed, size, generation_algorithm, looping_factor, png_dir=None):
+    """
+    Generates a labyrinth and solves it with every resolution algorithm. This function runs in the worker processes.
+
+    Parameters:
+    - index (int): The index of the labyrinth in the batch.
+    - seed (int): The seed of the random generator for this labyrinth.
+    - size (int): The width and height of the labyrinth, in cells.
+    - generation_algorithm (str): The generation algorithm.
+    - looping_factor (float): The looping factor of the labyrinth.
+    - png_dir (str): The folder where the image of the labyrinth is exported, or None to skip the export.
+
+    Returns:
+    - list: The rows of statistics of the labyrinth, one for each resolution algorithm.
+    """
+    rows = []
+    # The generation and the resolution print their progress, which would be mixed between the processes.
+    with contextlib.redirect_stdout(io.StringIO()):
+        labyrinth = Maze((size, size), generation_algorithm, RESOLUTION_ALGORITHMS[0], looping_factor)
+        start = time.perf_counter()
+        labyrinth.generate(seed)  # The seed is also used by the random choices of the resolutions that follow
+        generation_time = time.perf_counter() - start
+
+        for resolution_algorithm in RESOLUTION_ALGORITHMS:
+            labyrinth = Maze.from_walls(labyrinth.walls, generation_algorithm, resolution_algorithm, looping_factor)
+            labyrinth.seed = seed
+            start = time.perf_counter()
+            labyrinth.solve()
+            solve_time = time.perf_counter() - start
+
+            labyrinth.run_steps(math.inf)
+            rows.append(
+                {
+                    "maze": index,
+                    "seed": seed,
+                    "size": size,
+                    "generation_algorithm": generation_algorithm,
+                    "looping_factor": looping_factor,
+                    "resolution_algorithm": resolution_algorithm,
+                    "generation_time": generation_time,
+                    "solve_time": solve_time,
+                    "step_time": labyrinth.resolution_data["algorithm_time"],
+                    **get_search_statistics(labyrinth),
+                }
+            )
+
+    if png_dir is not None:
+        from export import export_png  # Imported here, since it needs NumPy, which is only used for the export
+
+        export_png(labyrinth.walls, os.path.join(png_dir, f"maze_{index}.png"))
+    return rows
+
+
+def run_batch(count, writer, seed, workers, **options):
+    """
+    Processes the labyrinths of a batch in a pool of processes, and writes their rows as soon as they are done.
+
+    Parameters:
+    - count (int): The number of labyrinths.
+    - writer (function): Called with each row of statistics.
+    - seed (int): The seed of the batch, from which the seed of each labyrinth is drawn.
+    - workers (int): The number of processes, None for one per processor.
+    - options: The other arguments of `process_maze` (size, generation_algorithm, looping_factor, png_dir).
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = random.Random(seed)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=warm_up) as executor:
+        max_queued = workers * QUEUED_PER_WORKER
+        pending = set()
+        for index in range(count):
+            pending.add(executor.submit(process_maze, index, seeds.getrandbits(32), **options))
+            if len(pending) >= max_queued:
+                # Wait for a labyrinth to be done before queuing the next one, so that the results do not pile up.
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    for row in future.result():
+                        writer(row)
+        for future in concurrent.futures.as_completed(pending):
+            for row in future.result():
+                writer(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates and solves many labyrinths, and saves their statistics.")
+    parser.add_argument("count", type=int, help="Number of labyrinths.")
+    parser.add_argument("output", help="Path of the statistics file, in CSV or JSONL depending on its extension.")
+    parser.add_argument("--size", type=int, default=30, help="Width and height of the labyrinths, in cells.")
+    parser.add_argument(
+        "--generation-algorithm",
+        default="depth-first-search",
+        choices=GENERATION_ALGORITHMS,
+        help="Generation algorithm.",
+    )
+    parser.add_argument("--looping-factor", type=float, default=0.1, help="Looping factor of the labyrinths.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the batch.")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Number of processes (one per processor by default)."
+    )
+    parser.add_argument(
+        "--format", choices=["csv", "jsonl"], default=None, help="Format of the file (from its extension by default)."
+    )
+    parser.add_argument("--png-dir", default=None, help="Folder where the image of each labyrinth is exported.")
+    args = parser.parse_args()
+
+    file_format = args.format or ("jsonl" if args.output.endswith((".jsonl", ".json")) else "csv")
+    if args.png_dir is not None:
+        os.makedirs(args.png_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    with open(args.output, "w", newline="") as file:
+        if file_format == "csv":
+            csv_writer = csv.DictWriter(file, fieldnames=COLUMNS)
+            csv_writer.writeheader()
+            writer = csv_writer.writerow
+        else:
+            writer = lambda row: file.write(json.dumps(row) + "\n")
+
+        run_batch(
+            args.count,
+            writer,
+            args.seed,
+            args.workers,
+            size=args.size,
+            generation_algorithm=args.generation_algorithm,
+            looping_factor=args.looping_factor,
+            png_dir=args.png_dir,
+        )
+    print(f"{args.count} labyrinthes traités en {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
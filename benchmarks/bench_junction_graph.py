@@ -0,0 +1,93 @@
+"""
+Compares the path queries on the junction graph with the same queries on the plain grid.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.bench_junction_graph
+    python -m benchmarks.bench_junction_graph --queries 200 --generation-algorithm kruskal
+
+For each size, the labyrinth is generated once, then the same random (start, end) pairs are solved with A* and with
+recursive backtracking, on the grid and on the junction graph. The table shows the size of the graph compared to the
+number of cells, the time taken to build it, and the average latency of a query in milliseconds.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy  # The maze module imports it on first use: it is imported here so that it is not measured
+
+from maze import Maze, GENERATION_ALGORITHMS
+
+SIZES = [16, 32, 64, 128, 256, 512, 1024]
+
+
+def average_latency(function, pairs, **kwargs):
+    """
+    Solves every (start, end) pair with a function and returns the average time of a query, in milliseconds.
+    """
+    start = time.perf_counter()
+    for case_1, case_2 in pairs:
+        function(case_1, case_2, **kwargs)
+    return (time.perf_counter() - start) / len(pairs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Junction graph path query benchmark.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parser.add_argument(
+        "--generation-algorithm",
+        default="depth-first-search",
+        choices=GENERATION_ALGORITHMS,
+        help="Algorithm used to generate the labyrinths.",
+    )
+    parser.add_argument("--looping-factor", type=float, default=0.1, help="Looping factor of the labyrinths.")
+    parser.add_argument("--queries", type=int, default=50, help="Number of random queries for each size.")
+    args = parser.parse_args()
+
+    columns = [
+        "cells",
+        "nodes",
+        "edges",
+        "build (ms)",
+        "a-star grid",
+        "a-star graph",
+        "backtrack grid",
+        "backtrack graph",
+    ]
+    print(f"{'size':>6} " + " ".join(f"{column:>15}" for column in columns))
+    for size in SIZES:
+        random.seed(args.seed)
+        labyrinth = Maze((size, size), args.generation_algorithm, "a-star", args.looping_factor)
+        with contextlib.redirect_stdout(io.StringIO()):  # The generation prints its progress
+            labyrinth.generate()
+
+        rng = random.Random(args.seed)
+        cells = size * size
+        pairs = [(rng.randrange(cells), rng.randrange(cells)) for _ in range(args.queries)]
+
+        start = time.perf_counter()
+        graph = labyrinth.get_junction_graph()
+        build_time = (time.perf_counter() - start) * 1000
+
+        results = [
+            cells,
+            graph.node_count,
+            graph.edge_count,
+            build_time,
+            average_latency(labyrinth.resolve_a_star, pairs),
+            average_latency(labyrinth.resolve_a_star, pairs, use_junction_graph=True),
+            average_latency(labyrinth.resolve_recursive_backtracking, pairs),
+            average_latency(labyrinth.resolve_recursive_backtracking, pairs, use_junction_graph=True),
+        ]
+        print(
+            f"{size:>6} "
+            + " ".join(f"{value:>15}" if isinstance(value, int) else f"{value:>15.3f}" for value in results),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
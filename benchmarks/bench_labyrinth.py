@@ -0,0 +1,105 @@
+"""
+Measures the generation and resolution times of the labyrinth for grid sizes from 16x16 to 2048x2048.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.bench_labyrinth
+    python -m benchmarks.bench_labyrinth --max-seconds 10 --seed 42
+    python -m benchmarks.bench_labyrinth --generation-algorithm kruskal
+
+The size doubles at each line. Once a measure took long enough that the next size would exceed the time budget
+(assuming at least a linear growth with the number of cells), it is skipped for the bigger sizes.
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+import numpy  # The maze module imports it on first use: it is imported here so that it is not measured
+
+from maze import Maze, GENERATION_ALGORITHMS
+
+SIZES = [16, 32, 64, 128, 256, 512, 1024, 2048]
+
+
+def generate_stepped(labyrinth):
+    """
+    Runs the generation of a labyrinth to completion, one step at a time (as the resolution menu does).
+    """
+    while not labyrinth.generation_data["is_generated"]:
+        labyrinth.generate_step()
+
+
+def measure(function, *args):
+    """
+    Calls a function and returns the time it took, in seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Labyrinth generation and resolution benchmark.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parser.add_argument(
+        "--generation-algorithm",
+        default="depth-first-search",
+        choices=GENERATION_ALGORITHMS,
+        help="Algorithm used to generate the labyrinths.",
+    )
+    parser.add_argument("--looping-factor", type=float, default=0.1, help="Looping factor of the labyrinths.")
+    parser.add_argument("--max-seconds", type=float, default=60, help="Time budget of a single measure.")
+    args = parser.parse_args()
+
+    phases = ["generate_step", "generate", "a-star", "bidirectional", "dead-end-filling", "recursive-backtracking"]
+    last_times = {phase: 0 for phase in phases}
+
+    print(f"{'size':>6} " + " ".join(f"{phase:>24}" for phase in phases))
+    for size in SIZES:
+        random.seed(args.seed)
+        labyrinth = Maze((size, size), args.generation_algorithm, "a-star", args.looping_factor)
+        results = {}
+
+        # The generation prints its progress, which we don't want in the benchmark output.
+        with contextlib.redirect_stdout(io.StringIO()):
+            if last_times["generate_step"] * 4 <= args.max_seconds:
+                last_times["generate_step"] = measure(generate_stepped, labyrinth)
+                results["generate_step"] = last_times["generate_step"]
+            else:
+                last_times["generate_step"] = float("inf")
+
+            # The one-shot generation is measured on a new labyrinth with the same seed, so both build the same walls.
+            if last_times["generate"] * 4 <= args.max_seconds:
+                random.seed(args.seed)
+                labyrinth = Maze((size, size), args.generation_algorithm, "a-star", args.looping_factor)
+                last_times["generate"] = measure(labyrinth.generate)
+                results["generate"] = last_times["generate"]
+            else:
+                last_times["generate"] = float("inf")
+
+            # The resolution can only be measured if the labyrinth has been generated.
+            for phase in phases[2:]:
+                if labyrinth.generation_data["is_generated"] and last_times[phase] * 4 <= args.max_seconds:
+                    if phase == "a-star":
+                        last_times[phase] = measure(labyrinth.resolve_a_star, labyrinth.start, labyrinth.end)
+                    elif phase == "bidirectional":
+                        last_times[phase] = measure(labyrinth.resolve_bidirectional, labyrinth.start, labyrinth.end)
+                    elif phase == "dead-end-filling":
+                        last_times[phase] = measure(labyrinth.resolve_dead_end_filling, labyrinth.start, labyrinth.end)
+                    else:
+                        last_times[phase] = measure(
+                            labyrinth.resolve_recursive_backtracking, labyrinth.start, labyrinth.end
+                        )
+                    results[phase] = last_times[phase]
+                else:
+                    last_times[phase] = float("inf")
+
+        columns = [f"{results[phase]:>23.4f}s" if phase in results else f"{'skipped':>24}" for phase in phases]
+        print(f"{size:>6} " + " ".join(columns), flush=True)
+
+
+if __name__ == "__main__":
+    main()
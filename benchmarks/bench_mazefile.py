@@ -0,0 +1,92 @@
+"""
+Measures the round trip of labyrinths through labyrinth files, and the time taken to load them.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.bench_mazefile
+    python -m benchmarks.bench_mazefile --max-size 16384
+
+The first table saves generated labyrinths, loads them back with and without the memory map, and checks that the walls
+are the same. It compares the time of an A* resolution on the walls read from the memory map to the same resolution
+on the walls in memory. The second table only measures the files, on bigger labyrinths where every wall is set (the
+content of a file does not change the time taken to load it): the time to save them, and the time to load them with
+and without the memory map. The lazy loading should take the same time whatever the size.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+import numpy  # The file module imports it on first use: it is imported here so that it is not measured
+
+from maze import Maze
+from walls import WallGrid
+
+ROUND_TRIP_SIZES = [64, 256, 1024]
+LOAD_SIZES = [1024, 2048, 4096, 8192, 16384]
+
+
+def measure(function, *args, **kwargs):
+    """
+    Calls a function and returns its result, and the time it took in milliseconds.
+    """
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Labyrinth file benchmark.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parser.add_argument("--max-size", type=int, default=8192, help="Biggest size of the load latency table.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "labyrinth.laby")
+
+        columns = ["file (KB)", "save (ms)", "lazy load", "eager load", "a-star mmap", "a-star memory", "same walls"]
+        print(f"{'size':>6} " + " ".join(f"{column:>14}" for column in columns))
+        for size in ROUND_TRIP_SIZES:
+            random.seed(args.seed)
+            labyrinth = Maze((size, size), "depth-first-search", "a-star", 0.1)
+            with contextlib.redirect_stdout(io.StringIO()):  # The generation prints its progress
+                labyrinth.generate()
+
+            _, save_time = measure(labyrinth.save, path)
+            lazy, lazy_time = measure(Maze.load, path)
+            eager, eager_time = measure(Maze.load, path, lazy=False)
+            lazy_path, lazy_solve_time = measure(lazy.solve)
+            memory_path, memory_solve_time = measure(labyrinth.solve)
+            same = all(
+                numpy.array_equal(a, b) for a, b in zip(labyrinth.walls.as_arrays(), lazy.walls.as_arrays())
+            ) and all(numpy.array_equal(a, b) for a, b in zip(labyrinth.walls.as_arrays(), eager.walls.as_arrays()))
+            same = same and lazy_path == memory_path
+
+            results = [os.path.getsize(path) / 1024, save_time, lazy_time, eager_time, lazy_solve_time]
+            results += [memory_solve_time]
+            print(f"{size:>6} " + " ".join(f"{value:>14.3f}" for value in results) + f" {str(same):>14}", flush=True)
+
+        columns = ["file (MB)", "save (ms)", "lazy load", "eager load"]
+        print(f"\n{'size':>6} " + " ".join(f"{column:>14}" for column in columns))
+        for size in LOAD_SIZES:
+            if size > args.max_size:
+                break
+            walls = WallGrid(size, size)
+            walls.fill()
+            labyrinth = Maze.from_walls(walls, "depth-first-search", "a-star")
+
+            _, save_time = measure(labyrinth.save, path)
+            del labyrinth, walls  # The memory of the walls is given back before loading them again
+            _, lazy_time = measure(Maze.load, path)
+            _, eager_time = measure(Maze.load, path, lazy=False)
+
+            results = [os.path.getsize(path) / 1024**2, save_time, lazy_time, eager_time]
+            print(f"{size:>6} " + " ".join(f"{value:>14.3f}" for value in results), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Measures the start of the game: the time taken by the imports, and the time to the first frame of the main menu.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10 --budget 300
+
+Each measure runs in a new Python process, so that the modules already imported by a previous run are not reused.
+The import profile is read from the output of `python -X importtime`, and shows the modules that take the longest to
+import, with their own time and their cumulative time (including the modules they import), in milliseconds.
+The modules of the repository are marked with a star.
+
+The time to the first frame goes from the start of the imports to the first flip of the window, following the same
+steps as main.py. The median over the runs is compared to the budget, and the script exits with an error when it is
+exceeded, so that it can be used to check a change.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The same steps as the main function of main.py, until the first frame is shown. The time is printed in milliseconds.
+FIRST_FRAME_SCRIPT = """
+import time
+start = time.perf_counter()
+import pygame
+import constants
+from menu import Menu
+imported = time.perf_counter()
+pygame.init()
+clock = pygame.time.Clock()
+pygame.display.set_caption("Labyrinthe")
+screen = pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
+menu = Menu()
+menu.update(clock)
+menu.draw()
+pygame.display.flip()
+end = time.perf_counter()
+print((imported - start) * 1000, (end - start) * 1000)
+"""
+
+
+def run_python(arguments):
+    """
+    Run a new Python process from the root of the repository, without a window.
+
+    Parameters:
+    - arguments (list): The arguments given to the Python interpreter.
+
+    Returns:
+    - subprocess.CompletedProcess: The finished process, with its standard output and error as text.
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    return subprocess.run([sys.executable] + arguments, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def get_import_profile():
+    """
+    Profile the imports of the game with `python -X importtime`.
+
+    Returns:
+    - list: The (module, self time, cumulative time) tuples of the imported modules, with the times in milliseconds.
+    """
+    process = run_python(["-X", "importtime", "-c", "import main"])
+    profile = []
+    for line in process.stderr.splitlines():
+        # The lines look like "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, cumulative_time, module = line[len("import time:") :].split("|")
+        profile.append((module.strip(), int(self_time) / 1000, int(cumulative_time) / 1000))
+    return profile
+
+
+def is_repository_module(module):
+    """
+    Check if a module is one of the modules of the repository.
+
+    Parameters:
+    - module (str): The name of the module.
+
+    Returns:
+    - bool: True if the module is defined in the repository, False otherwise.
+    """
+    return os.path.isfile(os.path.join(ROOT, module.split(".")[0] + ".py"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time benchmark.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs for the time to the first frame.")
+    parser.add_argument("--top", type=int, default=15, help="Number of modules shown in the import profile.")
+    parser.add_argument(
+        "--budget", type=float, default=400, help="Budget for the median time to the first frame, in milliseconds."
+    )
+    args = parser.parse_args()
+
+    profile = get_import_profile()
+    print(f"{'module':<40} {'self (ms)':>10} {'cumul. (ms)':>12}")
+    for module, self_time, cumulative_time in sorted(profile, key=lambda row: row[2], reverse=True)[: args.top]:
+        name = ("* " if is_repository_module(module) else "  ") + module
+        print(f"{name:<40} {self_time:>10.1f} {cumulative_time:>12.1f}")
+    repository_time = sum(row[1] for row in profile if is_repository_module(row[0]))
+    total_time = sum(row[1] for row in profile)
+    print(f"\nImports : {total_time:.1f} ms, including {repository_time:.1f} ms in the modules of the repository")
+
+    import_times, first_frame_times = [], []
+    for _ in range(args.runs):
+        import_time, first_frame_time = map(float, run_python(["-c", FIRST_FRAME_SCRIPT]).stdout.split())
+        import_times.append(import_time)
+        first_frame_times.append(first_frame_time)
+    first_frame_time = statistics.median(first_frame_times)
+    print(
+        f"First frame : {first_frame_time:.1f} ms (median of {args.runs} runs, "
+        f"{statistics.median(import_times):.1f} ms of imports), budget : {args.budget:.0f} ms"
+    )
+
+    if first_frame_time > args.budget:
+        print("The time to the first frame exceeds the budget.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Runs the benchmarks of the generation, the resolution, the rendering and the game loop, and saves the results to JSON.
+
+Run it from the root of the repository:
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --output results.json --compare baseline.json
+    python -m benchmarks.suite --sizes 16 64 --looping-factors 0.1 --repeat 3
+
+The cases are measured for every grid size and looping factor of the matrix, with a fixed seed, so that two runs build
+the same labyrinths:
+- generate_step: the generation run to completion one step at a time, as the resolution menu does.
+- resolve_a_star and resolve_recursive_backtracking: a path from the start to the end of the generated labyrinth.
+- get_image: a full drawing of the walls. The cells are drawn at the size they are displayed at (see `fit_cell_size`).
+- get_pathfinding_image: a full drawing of the pathfinding layer, after an A* resolution.
+- game_update: one `Game.update` tick in which every enemy moves, which happens once per second in the game. The game
+  builds its levels with a looping factor of 0.1, so this case is only measured once per size, on the level of that size.
+
+The times only include the measured calls, not the frame pacing of the game, which the benchmark clock skips.
+Each case is repeated, and the best and the median times are saved, in seconds. The window is not shown: the SDL
+dummy video driver is used unless another one is set.
+
+In compare mode, the best time of each case is compared to the one of the same case in the baseline, since it is the
+least sensitive to the noise of the machine. A case slower than the threshold is flagged as a regression, unless it only
+lost a fraction of a millisecond (see --min-difference), and the script exits with an error if there is any.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Must be set before pygame creates the window
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from constants import WIDTH, HEIGHT
+from labyrinth import Labyrinth, fit_cell_size
+from game import Game, build_level
+
+SIZES = [16, 32, 64, 128]
+LOOPING_FACTORS = [0, 0.1, 0.5]
+GAME_LOOPING_FACTOR = 0.1  # The looping factor of the levels of the game (see `build_level`)
+
+
+class BenchmarkClock:
+    """
+    Stands in for the game clock, so that the ticks of the game are not slowed down to sixty frames per second.
+    """
+
+    def tick(self, framerate=0):
+        return 0
+
+    def get_fps(self):
+        return 0
+
+
+def measure(setup, function, repeat):
+    """
+    Times a function several times, with a new setup before each run.
+
+    Parameters:
+    - setup (function): Prepares a run, and returns the arguments of the function. It is not timed.
+    - function (function): The function to time.
+    - repeat (int): The number of runs.
+
+    Returns:
+    - dict: The best and the median times of the runs, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return {"best": min(times), "median": statistics.median(times)}
+
+
+def new_labyrinth(size, looping_factor, seed, resolution_algorithm="a-star"):
+    """
+    Creates a labyrinth of the matrix, drawn at the size of the area where the game and the resolution menu show it.
+
+    Parameters:
+    - size (int): The width and height of the labyrinth, in cells.
+    - looping_factor (float): The looping factor of the labyrinth.
+    - seed (int): The seed of the random generator, set before the creation so that the same walls are generated.
+    - resolution_algorithm (str): The resolution algorithm of the labyrinth.
+
+    Returns:
+    - Labyrinth: The labyrinth, not generated yet.
+    """
+    random.seed(seed)
+    cell_size = fit_cell_size((size, size), (HEIGHT - 40, HEIGHT - 40))
+    return Labyrinth((size, size), "depth-first-search", resolution_algorithm, looping_factor, cell_size)
+
+
+def generated_labyrinth(size, looping_factor, seed, resolution_algorithm="a-star"):
+    """
+    Creates a labyrinth of the matrix and generates it (see `new_labyrinth`).
+    """
+    labyrinth = new_labyrinth(size, looping_factor, seed, resolution_algorithm)
+    labyrinth.generate()
+    return labyrinth
+
+
+def generate_stepped(labyrinth):
+    """
+    Runs the generation of a labyrinth to completion, one step at a time (as the resolution menu does).
+    """
+    while not labyrinth.generation_data["is_generated"]:
+        labyrinth.generate_step()
+
+
+def measure_labyrinth(size, looping_factor, seed, repeat):
+    """
+    Measures the generation, resolution and rendering cases of one labyrinth of the matrix.
+
+    Returns:
+    - dict: The times of each case, keyed by the name of the case.
+    """
+    results = {}
+    results["generate_step"] = measure(lambda: (new_labyrinth(size, looping_factor, seed),), generate_stepped, repeat)
+
+    labyrinth = generated_labyrinth(size, looping_factor, seed)
+    route = lambda: (labyrinth.start, labyrinth.end)
+    results["resolve_a_star"] = measure(route, labyrinth.resolve_a_star, repeat)
+    results["resolve_recursive_backtracking"] = measure(route, labyrinth.resolve_recursive_backtracking, repeat)
+
+    def full_redraw():
+        # Forget what has been drawn, so that the whole image is drawn again instead of the changes since the last run
+        labyrinth.drawn_version = None
+        labyrinth.has_changed = True
+        return ()
+
+    labyrinth.get_image()  # The first drawing also allocates the surface, which is not what we want to measure
+    results["get_image"] = measure(full_redraw, labyrinth.get_image, repeat)
+
+    # The pathfinding layer is drawn from the data of the step by step resolution
+    labyrinth.run_steps(math.inf)
+
+    def full_overlay_redraw():
+        labyrinth.overlay_state = None  # Same as above, for the pathfinding layer
+        return ()
+
+    labyrinth.get_pathfinding_image()
+    results["get_pathfinding_image"] = measure(full_overlay_redraw, labyrinth.get_pathfinding_image, repeat)
+    return results
+
+
+def measure_game_update(size, seed, repeat):
+    """
+    Measures a tick of the game, on the level with labyrinths of the given size.
+
+    Returns:
+    - dict: The best and the median times of a tick, in seconds.
+    """
+    stack = []
+    game = Game(stack)
+    stack.append(game)
+    game.loading.result()  # Let the game start its first level, before replacing it with the one we want
+    game.update(BenchmarkClock())
+
+    # The size of the labyrinths grows by 2 cells for each level, starting from 16x16.
+    game.level = max(0, (size - 16) // 2)
+    random.seed(seed)
+    game.start_level(build_level(game.level))
+    clock = BenchmarkClock()
+
+    def every_enemy_moves():
+        for enemy in game.enemies:
+            enemy.last_moved = 0  # The enemies move once per second: this makes them all move during the next tick
+        del stack[1:]  # Close the end screen if an enemy caught the character during the last tick
+        return (clock,)
+
+    return measure(every_enemy_moves, game.update, repeat)
+
+
+def run_suite(sizes, looping_factors, seed, repeat):
+    """
+    Runs every case of the matrix.
+
+    Returns:
+    - list: The results, as dictionaries with the name of the case, the size, the looping factor and the times.
+    """
+    results = []
+    for size in sizes:
+        for looping_factor in looping_factors:
+            for case, times in measure_labyrinth(size, looping_factor, seed, repeat).items():
+                results.append({"case": case, "size": size, "looping_factor": looping_factor, **times})
+        results.append(
+            {
+                "case": "game_update",
+                "size": size,
+                "looping_factor": GAME_LOOPING_FACTOR,
+                **measure_game_update(size, seed, repeat),
+            }
+        )
+    return results
+
+
+def get_key(result):
+    """
+    Gets the key identifying the case of a result, to find the same case in another run.
+    """
+    return (result["case"], result["size"], float(result["looping_factor"]))
+
+
+def compare(results, baseline, threshold, min_difference):
+    """
+    Compares the results to a baseline, and prints the ratio of the best times of each case.
+
+    Parameters:
+    - results (list): The results of this run.
+    - baseline (list): The results of the baseline run.
+    - threshold (float): The relative slowdown above which a case is a regression (0.2 for 20% slower).
+    - min_difference (float): The slowdown below which a case is never a regression, in seconds. The shortest cases
+      vary a lot from a run to another, even when nothing changed.
+
+    Returns:
+    - list: The keys of the cases flagged as regressions.
+    """
+    baseline_times = {get_key(result): result["best"] for result in baseline}
+    regressions = []
+    print(f"\n{'case':<32} {'size':>6} {'loops':>6} {'baseline (ms)':>14} {'now (ms)':>10} {'ratio':>7}")
+    for result in results:
+        key = get_key(result)
+        if key not in baseline_times:
+            print(f"{key[0]:<32} {key[1]:>6} {key[2]:>6} {'-':>14} {result['best'] * 1000:>10.3f} {'new':>7}")
+            continue
+        ratio = result["best"] / baseline_times[key] if baseline_times[key] > 0 else 1
+        flag = ""
+        if ratio > 1 + threshold and result["best"] - baseline_times[key] >= min_difference:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(
+            f"{key[0]:<32} {key[1]:>6} {key[2]:>6} {baseline_times[key] * 1000:>14.3f} "
+            f"{result['best'] * 1000:>10.3f} {ratio:>7.2f}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite of the labyrinth and the game.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="Sizes of the labyrinths, in cells.")
+    parser.add_argument(
+        "--looping-factors", type=float, nargs="+", default=LOOPING_FACTORS, help="Looping factors of the labyrinths."
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    parser.add_argument("--repeat", type=int, default=10, help="Number of runs of each case.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file where the results are saved.")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON file of a previous run to compare the results to.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="Relative slowdown flagged as a regression in compare mode."
+    )
+    parser.add_argument(
+        "--min-difference",
+        type=float,
+        default=0.5,
+        help="Slowdown below which a case is never flagged as a regression, in milliseconds.",
+    )
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))  # The game and its images need a display
+
+    # The generation and the game print their progress, which we don't want in the benchmark output.
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = run_suite(args.sizes, args.looping_factors, args.seed, args.repeat)
+
+    print(f"{'case':<32} {'size':>6} {'loops':>6} {'best (ms)':>10} {'median (ms)':>12}")
+    for result in results:
+        print(
+            f"{result['case']:<32} {result['size']:>6} {result['looping_factor']:>6} "
+            f"{result['best'] * 1000:>10.3f} {result['median'] * 1000:>12.3f}"
+        )
+
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline["results"], args.threshold, args.min_difference / 1000)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            sys.exit(1)
+        print("\nNo regression")
+
+
+if __name__ == "__main__":
+    main()
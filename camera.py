@@ -0,0 +1,547 @@
+import time
+from collections import OrderedDict
+
+import pygame
+
+from constants import BG_COLOR
+from labyrinth import fit_cell_size
+
+TILE_SIZE = 128  # The size of a tile, in pixels. The number of cells in a tile depends on the zoom.
+TILE_CACHE_CAPACITY = 256  # The number of tiles kept in memory, all layers and zoom levels included
+RENDER_BUDGET = 0.008  # The time that can be spent rendering missing tiles during a frame, in seconds
+MIN_CELL_SIZE = 2  # The smallest size of a cell on the screen, in pixels (most zoomed out)
+MAX_CELL_SIZE = 64  # The biggest size of a cell on the screen, in pixels (most zoomed in)
+ZOOM_FACTOR = 1.25  # The factor the size of the cells is multiplied or divided by at each zoom step
+
+
+class TileCache:
+    """
+    A cache of pre-rendered tiles, which forgets the least recently used ones when it is full.
+
+    A tile is identified by a key chosen by the camera: `(layer, cell size, tile x, tile y)`. When the cells of a tile
+    change, the tile is only marked as stale: it can still be displayed while the camera has no time left to render it
+    again, and its surface is reused when it is rendered again.
+
+    Attributes:
+        capacity (int): The maximum number of tiles kept in the cache.
+        tiles (OrderedDict): The surface of each tile, from the least recently used to the most recently used.
+        stale (set): The keys of the tiles whose cells changed since they were rendered.
+        hits (int): The number of times an up-to-date tile was found in the cache.
+        misses (int): The number of times a tile was missing or stale.
+        evictions (int): The number of tiles removed to make room for new ones.
+    """
+
+    def __init__(self, capacity=TILE_CACHE_CAPACITY):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+        - capacity (int): The maximum number of tiles kept in the cache.
+        """
+        self.capacity = capacity
+        self.tiles = OrderedDict()
+        self.stale = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Gets a tile from the cache, and marks it as the most recently used.
+
+        Parameters:
+        - key (tuple): The key of the tile.
+
+        Returns:
+        - tuple: The surface of the tile (None if it is not in the cache), and a flag indicating if it is up to date.
+        """
+        surface = self.tiles.get(key)
+        if surface is None:
+            self.misses += 1
+            return None, False
+        self.tiles.move_to_end(key)
+        if key in self.stale:
+            self.misses += 1
+            return surface, False
+        self.hits += 1
+        return surface, True
+
+    def put(self, key, surface):
+        """
+        Stores an up-to-date tile in the cache, removing the least recently used tiles if the cache is full.
+
+        Parameters:
+        - key (tuple): The key of the tile.
+        - surface (Surface): The surface of the tile.
+        """
+        self.tiles[key] = surface
+        self.tiles.move_to_end(key)
+        self.stale.discard(key)
+        while len(self.tiles) > self.capacity:
+            old_key, _ = self.tiles.popitem(last=False)
+            self.stale.discard(old_key)
+            self.evictions += 1
+
+    def mark_stale(self, keys):
+        """
+        Marks some tiles as stale. The keys that are not in the cache are ignored.
+
+        Parameters:
+        - keys (iterable): The keys of the tiles.
+        """
+        for key in keys:
+            if key in self.tiles:
+                self.stale.add(key)
+
+    def get_keys(self, layer):
+        """
+        Gets the keys of the tiles of a layer in the cache.
+
+        Parameters:
+        - layer (str): The name of the layer.
+
+        Returns:
+        - list: The keys of the tiles.
+        """
+        return [key for key in self.tiles if key[0] == layer]
+
+    def clear(self):
+        """
+        Removes every tile from the cache.
+        """
+        self.tiles.clear()
+        self.stale.clear()
+
+
+class Camera:
+    """
+    A view on a part of a labyrinth, that can be moved and zoomed.
+
+    The labyrinth is split into square tiles, rendered on demand at the current zoom and kept in a `TileCache`. Drawing
+    a frame only blits the tiles that cross the viewport, so its cost depends on the size of the viewport and not on
+    the size of the labyrinth. Before each frame, the tiles whose walls or pathfinding overlay changed are marked as
+    stale, and at most `RENDER_BUDGET` seconds are spent rendering the missing and stale tiles: the others are rendered
+    during the next frames, and the stale ones are displayed in the meantime.
+
+    Attributes:
+        labyrinth (Labyrinth): The labyrinth seen by the camera.
+        viewport (Rect): The area of the screen the labyrinth is drawn in.
+        cell_size (int): The size of a cell on the screen, in pixels.
+        center (list): The point of the labyrinth at the center of the viewport, in cells (floats).
+        tiles (TileCache): The cache of the rendered tiles.
+        walls_version (int): The version of the walls the tiles were last updated with.
+        drawn_view (tuple): The view drawn at the last frame (see `get_view`), None if nothing has been drawn yet.
+        pending_tiles (int): The number of visible tiles that were missing or stale at the end of the last frame.
+    """
+
+    def __init__(self, labyrinth, viewport, cell_size=None):
+        """
+        Initializes a camera centered on the labyrinth.
+
+        Parameters:
+        - labyrinth (Labyrinth): The labyrinth seen by the camera.
+        - viewport (Rect): The area of the screen the labyrinth is drawn in.
+        - cell_size (int): The initial size of a cell on the screen, in pixels. By default, the whole labyrinth fits
+          in the viewport (see `fit`).
+        """
+        self.labyrinth = labyrinth
+        self.viewport = pygame.Rect(viewport)
+        self.tiles = TileCache()
+        self.walls_version = labyrinth.walls.version
+        self.pending_tiles = 0
+        self.drawn_view = None
+        self.center = [labyrinth.width / 2, labyrinth.height / 2]
+        self.cell_size = MIN_CELL_SIZE
+        if cell_size is None:
+            self.fit()
+        else:
+            self.set_cell_size(cell_size)
+
+    def fit(self):
+        """
+        Zooms out so that the whole labyrinth fits in the viewport (if the cells are not too small), and centers it.
+        """
+        size = (self.labyrinth.width, self.labyrinth.height)
+        self.cell_size = min(MAX_CELL_SIZE, fit_cell_size(size, self.viewport.size, MIN_CELL_SIZE))
+        self.center = [self.labyrinth.width / 2, self.labyrinth.height / 2]
+
+    def set_cell_size(self, cell_size):
+        """
+        Sets the zoom, keeping the same point at the center of the viewport.
+
+        Parameters:
+        - cell_size (int): The size of a cell on the screen, in pixels. It is clamped between the zoom limits.
+        """
+        self.cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, int(cell_size)))
+        self.clamp()
+
+    def zoom(self, steps, pivot=None):
+        """
+        Zooms in (positive steps) or out (negative steps), keeping the point under the pivot at the same place.
+
+        Parameters:
+        - steps (int): The number of zoom steps.
+        - pivot (tuple): The position on the screen that should not move, such as the mouse cursor. Defaults to the
+          center of the viewport.
+        """
+        if pivot is None:
+            pivot = self.viewport.center
+        before = self.screen_to_point(pivot)
+        cell_size = self.cell_size * ZOOM_FACTOR**steps
+        # The size of the cells is an integer, so a small step must still change it by at least one pixel.
+        if steps > 0:
+            cell_size = max(cell_size, self.cell_size + 1)
+        elif steps < 0:
+            cell_size = min(cell_size, self.cell_size - 1)
+        self.cell_size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, round(cell_size)))
+        after = self.screen_to_point(pivot)
+        self.center[0] += before[0] - after[0]
+        self.center[1] += before[1] - after[1]
+        self.clamp()
+
+    def pan(self, dx, dy):
+        """
+        Moves the view by a number of pixels on the screen.
+
+        Parameters:
+        - dx (float): The horizontal move, in pixels. A positive value shows what is on the right.
+        - dy (float): The vertical move, in pixels. A positive value shows what is below.
+        """
+        self.center[0] += dx / self.cell_size
+        self.center[1] += dy / self.cell_size
+        self.clamp()
+
+    def follow(self, case):
+        """
+        Centers the view on a cell, as far as the borders of the labyrinth allow it.
+
+        Parameters:
+        - case (int): The ID of the cell.
+        """
+        x, y = self.labyrinth.id_to_coord(case)
+        self.center = [x + 0.5, y + 0.5]
+        self.clamp()
+
+    def clamp(self):
+        """
+        Keeps the view inside the labyrinth. A labyrinth smaller than the viewport stays centered in it.
+        """
+        for axis, (cells, pixels) in enumerate(
+            ((self.labyrinth.width, self.viewport.width), (self.labyrinth.height, self.viewport.height))
+        ):
+            half = pixels / 2 / self.cell_size  # Half of the viewport, in cells
+            if cells <= 2 * half:
+                self.center[axis] = cells / 2
+            else:
+                self.center[axis] = max(half, min(cells - half, self.center[axis]))
+
+    def get_origin(self):
+        """
+        Gets the position of the top-left corner of the viewport in the labyrinth, in pixels at the current zoom.
+
+        Returns:
+        - tuple: The position, negative when the labyrinth is smaller than the viewport.
+        """
+        return (
+            round(self.center[0] * self.cell_size - self.viewport.width / 2),
+            round(self.center[1] * self.cell_size - self.viewport.height / 2),
+        )
+
+    def screen_to_point(self, position):
+        """
+        Converts a position on the screen to a point of the labyrinth.
+
+        Parameters:
+        - position (tuple): The position on the screen, in pixels.
+
+        Returns:
+        - tuple: The point of the labyrinth, in cells (floats).
+        """
+        origin = self.get_origin()
+        return (
+            (position[0] - self.viewport.x + origin[0]) / self.cell_size,
+            (position[1] - self.viewport.y + origin[1]) / self.cell_size,
+        )
+
+    def case_to_screen(self, case):
+        """
+        Gets the position of the top-left corner of a cell on the screen.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - tuple: The position on the screen, in pixels.
+        """
+        x, y = self.labyrinth.id_to_coord(case)
+        origin = self.get_origin()
+        return (self.viewport.x + x * self.cell_size - origin[0], self.viewport.y + y * self.cell_size - origin[1])
+
+    def is_visible(self, case):
+        """
+        Checks if a cell is at least partly in the viewport.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - bool: True if the cell is visible, False otherwise.
+        """
+        x, y = self.case_to_screen(case)
+        return self.viewport.colliderect((x, y, self.cell_size, self.cell_size))
+
+    def get_visible_area(self):
+        """
+        Gets the cells that are at least partly in the viewport.
+
+        Returns:
+        - Rect: The rectangle of cells, in cells.
+        """
+        origin = self.get_origin()
+        left = origin[0] // self.cell_size
+        top = origin[1] // self.cell_size
+        right = (origin[0] + self.viewport.width - 1) // self.cell_size + 1
+        bottom = (origin[1] + self.viewport.height - 1) // self.cell_size + 1
+        return pygame.Rect(left, top, right - left, bottom - top).clip(
+            pygame.Rect(0, 0, self.labyrinth.width, self.labyrinth.height)
+        )
+
+    def get_tile_cells(self, cell_size):
+        """
+        Gets the number of cells on each side of a tile at a given zoom.
+
+        Parameters:
+        - cell_size (int): The size of a cell, in pixels.
+
+        Returns:
+        - int: The number of cells.
+        """
+        return max(1, TILE_SIZE // cell_size)
+
+    def get_tile_area(self, tile_x, tile_y, cell_size):
+        """
+        Gets the cells covered by a tile. The tiles on the right and bottom borders may be smaller than the others.
+
+        Parameters:
+        - tile_x (int): The column of the tile.
+        - tile_y (int): The row of the tile.
+        - cell_size (int): The size of a cell, in pixels.
+
+        Returns:
+        - Rect: The rectangle of cells, in cells.
+        """
+        tile_cells = self.get_tile_cells(cell_size)
+        area = pygame.Rect(tile_x * tile_cells, tile_y * tile_cells, tile_cells, tile_cells)
+        return area.clip(pygame.Rect(0, 0, self.labyrinth.width, self.labyrinth.height))
+
+    def invalidate(self, layer, areas):
+        """
+        Marks as stale the tiles of a layer that cross some rectangles of cells, at every zoom in the cache.
+
+        Parameters:
+        - layer (str): The name of the layer.
+        - areas (list): The rectangles of cells, as `(left, top, right, bottom)` tuples (both ends included).
+        """
+        keys = self.tiles.get_keys(layer)
+        for cell_size in {key[1] for key in keys}:
+            tile_cells = self.get_tile_cells(cell_size)
+            dirty = set()
+            for left, top, right, bottom in areas:
+                for tile_y in range(max(0, top) // tile_cells, max(0, bottom) // tile_cells + 1):
+                    for tile_x in range(max(0, left) // tile_cells, max(0, right) // tile_cells + 1):
+                        dirty.add((layer, cell_size, tile_x, tile_y))
+            self.tiles.mark_stale(dirty)
+
+    def update_tiles(self, overlay):
+        """
+        Marks as stale the tiles whose walls or overlay changed since the last frame.
+
+        Parameters:
+        - overlay (bool): Flag indicating if the pathfinding overlay is displayed.
+        """
+        width = self.labyrinth.width
+        walls = self.labyrinth.walls
+        if walls.version != self.walls_version:
+            changes = walls.get_changes_since(self.walls_version)
+            if changes is None:  # The walls were written in bulk: every tile may have changed
+                self.tiles.mark_stale(self.tiles.get_keys("walls"))
+            else:
+                # As in `Labyrinth.redraw_area`, the walls of the cells around a wall can reach the same pixels.
+                self.invalidate(
+                    "walls",
+                    [
+                        (case_1 % width - 1, case_1 // width - 1, case_2 % width + 1, case_2 // width + 1)
+                        for case_1, case_2 in changes
+                    ],
+                )
+            self.walls_version = walls.version
+
+        if overlay:
+            dirty = self.labyrinth.get_overlay_changes()
+            if dirty is None:
+                self.tiles.mark_stale(self.tiles.get_keys("overlay"))
+            else:
+                # As in `Labyrinth.repaint_overlay_area`, a cell is drawn on the tiles up to two cells around it.
+                self.invalidate(
+                    "overlay", [(c % width - 2, c // width - 2, c % width + 2, c // width + 2) for c in dirty]
+                )
+
+    def render_tile(self, key, surface=None):
+        """
+        Renders a tile.
+
+        Parameters:
+        - key (tuple): The key of the tile.
+        - surface (Surface): The previous surface of the tile, reused if it has the right size.
+
+        Returns:
+        - Surface: The surface of the tile.
+        """
+        layer, cell_size, tile_x, tile_y = key
+        area = self.get_tile_area(tile_x, tile_y, cell_size)
+        size = (area.width * cell_size, area.height * cell_size)
+        if surface is None or surface.get_size() != size:
+            surface = pygame.Surface(size, pygame.SRCALPHA, 32) if layer == "overlay" else pygame.Surface(size)
+        if layer == "walls":
+            self.labyrinth.draw_tile(surface, area, cell_size)
+        else:
+            self.labyrinth.draw_overlay_tile(surface, area, cell_size)
+        return surface
+
+    def get_view(self):
+        """
+        Gets what the viewport shows: the position of its top-left corner in the labyrinth, and the zoom.
+
+        Returns:
+        - tuple: The origin (see `get_origin`) and the size of a cell, in pixels.
+        """
+        return self.get_origin(), self.cell_size
+
+    def get_visible_tiles(self, area):
+        """
+        Gets the tiles that cross an area of the viewport.
+
+        Parameters:
+        - area (Rect): The area of the screen.
+
+        Returns:
+        - list: The (x, y) coordinates of the tiles, and the position of their top-left corner on the screen.
+        """
+        cell_size = self.cell_size
+        tile_pixels = self.get_tile_cells(cell_size) * cell_size
+        tile_columns = -(-self.labyrinth.width * cell_size // tile_pixels)
+        tile_rows = -(-self.labyrinth.height * cell_size // tile_pixels)
+        origin = self.get_origin()
+
+        left = area.left - self.viewport.x + origin[0]
+        top = area.top - self.viewport.y + origin[1]
+        return [
+            (
+                (tile_x, tile_y),
+                (
+                    self.viewport.x + tile_x * tile_pixels - origin[0],
+                    self.viewport.y + tile_y * tile_pixels - origin[1],
+                ),
+            )
+            for tile_y in range(max(0, top // tile_pixels), min(tile_rows, (top + area.height - 1) // tile_pixels + 1))
+            for tile_x in range(
+                max(0, left // tile_pixels), min(tile_columns, (left + area.width - 1) // tile_pixels + 1)
+            )
+        ]
+
+    def draw(self, screen, overlay=True, only_changes=False):
+        """
+        Draws the visible part of the labyrinth in the viewport.
+
+        Parameters:
+        - screen (Surface): The surface to draw on.
+        - overlay (bool): Flag indicating if the pathfinding overlay is drawn on top of the walls.
+        - only_changes (bool): Flag indicating if only the tiles that changed since the last frame are drawn. The
+          screen must then still show the last frame. The whole viewport is drawn anyway if the view moved.
+
+        Returns:
+        - list: The areas of the screen that show something different from the last frame: the whole viewport if the
+          view moved, or the tiles that were rendered again.
+        """
+        overlay = overlay and self.labyrinth.generation_data["is_generated"]  # There is no overlay before that
+        self.update_tiles(overlay)
+
+        previous_clip = screen.get_clip()
+        clip = self.viewport.clip(previous_clip)
+        screen.set_clip(clip)
+        view = self.get_view()
+        moved = view != self.drawn_view
+        self.drawn_view = view
+        changed = []
+        if moved:
+            # A labyrinth smaller than the viewport does not cover it: the rest of the last frame must be cleared.
+            screen.fill(BG_COLOR)
+            changed.append(clip)
+
+        cell_size = self.cell_size
+        tile_pixels = self.get_tile_cells(cell_size) * cell_size
+        origin = view[0]
+        layers = ("walls", "overlay") if overlay else ("walls",)
+
+        # The tiles in the middle of the viewport are rendered first, in case there is no time left for the others.
+        visible = self.get_visible_tiles(clip)
+        center = (
+            (origin[0] + self.viewport.width / 2) / tile_pixels,
+            (origin[1] + self.viewport.height / 2) / tile_pixels,
+        )
+        visible.sort(key=lambda tile: abs(tile[0][0] + 0.5 - center[0]) + abs(tile[0][1] + 0.5 - center[1]))
+
+        deadline = time.perf_counter() + RENDER_BUDGET
+        rendered = 0
+        self.pending_tiles = 0
+        for (tile_x, tile_y), position in visible:
+            surfaces = []
+            has_changed = False
+            for layer in layers:
+                key = (layer, cell_size, tile_x, tile_y)
+                surface, is_fresh = self.tiles.get(key)
+                # At least one tile is rendered at each frame, so that the view is always completed in the end.
+                if not is_fresh and (rendered == 0 or time.perf_counter() < deadline):
+                    surface = self.render_tile(key, surface)
+                    self.tiles.put(key, surface)
+                    rendered += 1
+                    has_changed = True
+                elif not is_fresh:
+                    self.pending_tiles += 1
+                if surface is not None:
+                    surfaces.append(surface)
+
+            # The layers of a tile are drawn again together, since the overlay is transparent.
+            if moved or not only_changes or has_changed:
+                for surface in surfaces:
+                    screen.blit(surface, position)
+            if has_changed and not moved:
+                changed.append(pygame.Rect(position, surfaces[0].get_size()).clip(clip))
+        screen.set_clip(previous_clip)
+        return changed
+
+    def draw_area(self, screen, area, overlay=True):
+        """
+        Draws an area of the viewport again, with the tiles as they are in the cache, to erase the sprites drawn on it.
+
+        No tile is rendered: the missing ones are left empty, and the stale ones are drawn as they are until `draw`
+        renders them again.
+
+        Parameters:
+        - screen (Surface): The surface to draw on.
+        - area (Rect): The area of the screen to draw.
+        - overlay (bool): Flag indicating if the pathfinding overlay is drawn on top of the walls.
+        """
+        overlay = overlay and self.labyrinth.generation_data["is_generated"]
+        layers = ("walls", "overlay") if overlay else ("walls",)
+
+        previous_clip = screen.get_clip()
+        clip = self.viewport.clip(area).clip(previous_clip)
+        screen.set_clip(clip)
+        screen.fill(BG_COLOR)
+        for (tile_x, tile_y), position in self.get_visible_tiles(clip):
+            for layer in layers:
+                surface = self.tiles.tiles.get((layer, self.cell_size, tile_x, tile_y))
+                if surface is not None:
+                    screen.blit(surface, position)
+        screen.set_clip(previous_clip)
@@ -15,7 +15,7 @@ class Character(pygame.sprite.Sprite):
         pos (int): The current position of the character in the labyrinth.
         labyrinth (Labyrinth): The labyrinth object.
         game (Game): The game object.
-        size (int): The size of the character sprite. It is the same as the "labyrinth resolution" constant which holds the size of the labyrinth cells.
+        size (int): The size of the character sprite. It is the same as the size of the labyrinth cells on the labyrinth image.
         image (Surface): The surface representing the character sprite.
         has_changed (bool): Flag indicating if the character sprite has changed. Used to avoid redrawing the sprite every frame.
     """
@@ -26,7 +26,7 @@ class Character(pygame.sprite.Sprite):
         self.labyrinth = labyrinth
         self.pos = pos  # The character's position in the labyrinth is represented by a single integer, which is the index of the cell in the labyrinth.
         self.game = game
-        self.size = constants.LABYRINTH_RESOLUTION
+        self.size = labyrinth.cell_size
 
         self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA, 32)
         self.has_changed = True
@@ -59,7 +59,7 @@ class Character(pygame.sprite.Sprite):
                 self.image,
                 constants.CHARACTER_COLOR,
                 (self.size // 2, self.size // 2),
-                self.size // 2 - constants.LABYRINTH_RESOLUTION // 4,
+                self.size // 2 - self.size // 4,
             )
 
             self.has_changed = False
@@ -102,7 +102,6 @@ class Character(pygame.sprite.Sprite):
             self.game.points = [p for p in self.game.points if p.pos != new_pos]
             self.game.point_count += 1
             self.game.total_points += 1
-            
 
         end_pos = self.game.stairs_pos
         if new_pos == end_pos:
@@ -130,18 +129,20 @@ class Enemy(pygame.sprite.Sprite):
         pos (int): The current position of the enemy in the labyrinth.
         labyrinth (Labyrinth): The labyrinth object.
         character (Character): The character object.
+        flow_field (FlowField): The flow field leading to the character, shared by all the enemies.
         size (int): The size of the enemy sprite.
         image (Surface): The surface representing the enemy sprite.
         has_changed (bool): Flag indicating if the enemy sprite has changed.
         last_moved (float): The time when the enemy last moved.
     """
 
-    def __init__(self, pos, labyrinth, character):
+    def __init__(self, pos, labyrinth, character, flow_field):
         super().__init__()
         self.labyrinth = labyrinth
         self.character = character
+        self.flow_field = flow_field
         self.pos = pos
-        self.size = constants.LABYRINTH_RESOLUTION
+        self.size = labyrinth.cell_size
 
         self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA, 32)
         self.has_changed = True
@@ -155,11 +156,13 @@ class Enemy(pygame.sprite.Sprite):
         This method is called every frame to update the enemy's position and behavior.
         """
         if time.time() - self.last_moved > 1:  # The enemies move every second in the game loop
-            path = self.labyrinth.resolve_a_star(self.pos, self.character.pos)
-            if len(path) < 2:
+            if self.pos == self.character.pos:
                 self.character.lose()
-            elif path:
-                self.pos = path[1]
+            else:
+                # The flow field gives the next cell of a shortest path to the character, without any search per enemy.
+                next_pos = self.flow_field.next_step(self.pos)
+                if next_pos is not None:
+                    self.pos = next_pos
             self.last_moved = time.time()
 
     def draw(self):
@@ -176,7 +179,7 @@ class Enemy(pygame.sprite.Sprite):
                 self.image,
                 constants.ENEMIES_COLOR,
                 (self.size // 2, self.size // 2),
-                self.size // 2 - constants.LABYRINTH_RESOLUTION // 4,
+                self.size // 2 - self.size // 4,
             )
 
             self.has_changed = False
@@ -197,6 +200,8 @@ class Point(pygame.sprite.Sprite):
         animation (int): The current animation frame of the point sprite.
         animation_count (int): The number of times the point sprite has animated.
         width (int): The width of the point sprite.
+        shape (tuple): The width in pixels and the color of the point, as drawn on the image.
+        has_changed (bool): Flag indicating if the image changed during the last call to draw. Used by the game to only draw again the points that changed on the screen.
         labyrinth (Labyrinth): The labyrinth object.
     """
 
@@ -206,14 +211,14 @@ class Point(pygame.sprite.Sprite):
         self.local_x, self.local_y = labyrinth.id_to_coord(
             self.pos
         )  # The position is also stored as the x and y coordinates of the cell in the grid, to be later used in the Game class.
-        self.image = pygame.Surface(
-            (constants.LABYRINTH_RESOLUTION, constants.LABYRINTH_RESOLUTION), pygame.SRCALPHA, 32
-        )
+        self.image = pygame.Surface((labyrinth.cell_size, labyrinth.cell_size), pygame.SRCALPHA, 32)
         self.rect = self.image.get_rect()
 
         self.animation = 0
         self.animation_count = 0
         self.width = 0
+        self.shape = None  # The scaled width and the color the image was last drawn with
+        self.has_changed = True
 
         self.labyrinth = labyrinth
 
@@ -224,8 +229,6 @@ class Point(pygame.sprite.Sprite):
         Returns:
             Surface: The surface representing the point sprite.
         """
-        self.image.fill((0, 0, 0, 0))
-
         if self.animation > 120:  # The point sprite animation lasts for 120 frames.
             self.animation = 0
             self.animation_count += 1
@@ -238,17 +241,26 @@ class Point(pygame.sprite.Sprite):
             self.animation += 1
             self.width -= 1
 
-        center = constants.LABYRINTH_RESOLUTION // 2 - self.width // 2
+        # The animation is designed for cells of LABYRINTH_RESOLUTION pixels, so the width is scaled to the actual cell size.
+        width = self.width * self.labyrinth.cell_size // constants.LABYRINTH_RESOLUTION
+        color = (
+            constants.POINTS_COLOR if self.animation_count % 2 == 0 else constants.POINTS_COLOR_2
+        )  # We alternate the color of the point sprite every time it animates, to give the illusion of the "coin" having two sides.
+
+        # With small cells, the scaled width often stays the same for several frames: the image is then kept as it is.
+        self.has_changed = (width, color) != self.shape
+        if not self.has_changed:
+            return self.image
+        self.shape = (width, color)
+
+        self.image.fill((0, 0, 0, 0))
+        center = self.labyrinth.cell_size // 2 - width // 2
 
         rect = pygame.Rect(
-            center, 0, max(1, self.width), constants.LABYRINTH_RESOLUTION
+            center, 0, max(1, width), self.labyrinth.cell_size
         )  # We center the point sprite in the cell and draw it with the current width. We also make sure the width is at least 1 pixel.
         rect.scale_by_ip(0.7, 0.7)  # We scale the rectangle to make the point sprite look better.
 
-        color = (
-            constants.POINTS_COLOR if self.animation_count % 2 == 0 else constants.POINTS_COLOR_2
-        )  # We alternate the color of the point sprite every time it animates, to give the illusion of the "coin" having two sides.
-
         pygame.draw.ellipse(
             self.image,
             color,
@@ -1,7 +1,3 @@
-import pygame
-
-pygame.font.init()  # Initialize the font module to use custom fonts.
-
 WIDTH, HEIGHT = 1200, 700  # The width and height of the game window.
 
 
@@ -20,8 +16,9 @@ WHITE = (255, 255, 255)
 
 DRAW_CASE_NUMBERS = False  # Flag indicating if the cell numbers should be drawn on the labyrinth. Useful for debugging, but makes the game less visually appealing.
 # This debug option also does not take into account the resolution of the labyrinth, so the numbers may be barely visible or overlap with the walls at higher resolutions
+DRAW_TEXT_CACHE_STATS = False  # Flag indicating if the hit rate of the text cache is displayed in the resolution and game screens. Useful for debugging.
 
-# The font used for the game. This font is loaded from a custom TTF file.
-font_file = "customFont.ttf"
-font = pygame.font.Font(font_file, 16)  # Used for buttons
-font_big = pygame.font.Font(font_file, 32)  # Used for text
+# The font used for the game. This font is loaded from a custom TTF file, the first time it is used (see assets.py).
+FONT_FILE = "customFont.ttf"
+FONT_SIZE = 16  # Used for buttons
+BIG_FONT_SIZE = 32  # Used for text
@@ -0,0 +1,66 @@
+class DisjointSet:
+    """
+    A disjoint-set (union-find) structure over the integers from 0 to size - 1.
+
+    It is used by the Kruskal generation algorithm to know, in almost constant time, if two cells of the labyrinth
+    are already connected. The two usual optimizations are implemented:
+    - Path compression: after looking for the root of an element, every element on the way points directly to the root.
+    - Union by rank: the shallowest tree is always attached under the deepest one.
+
+    Attributes:
+        parent (list): The parent of each element. An element is a root if it is its own parent.
+        rank (bytearray): An upper bound of the height of the tree of each root.
+        set_count (int): The number of disjoint sets.
+    """
+
+    def __init__(self, size):
+        """
+        Initializes the structure with one set per element.
+
+        Parameters:
+        - size (int): The number of elements.
+        """
+        self.parent = list(range(size))
+        self.rank = bytearray(size)  # The rank can't exceed log2(size), so a byte is more than enough
+        self.set_count = size
+
+    def find(self, element):
+        """
+        Finds the root of the set containing an element.
+
+        Parameters:
+        - element (int): The element.
+
+        Returns:
+        - int: The root of the set.
+        """
+        parent = self.parent
+        root = element
+        while parent[root] != root:
+            root = parent[root]
+        while parent[element] != root:  # Path compression
+            parent[element], element = root, parent[element]
+        return root
+
+    def union(self, element_1, element_2):
+        """
+        Merges the sets containing two elements.
+
+        Parameters:
+        - element_1 (int): The first element.
+        - element_2 (int): The second element.
+
+        Returns:
+        - bool: True if the sets were merged, False if both elements were already in the same set.
+        """
+        root_1 = self.find(element_1)
+        root_2 = self.find(element_2)
+        if root_1 == root_2:
+            return False
+        if self.rank[root_1] < self.rank[root_2]:
+            root_1, root_2 = root_2, root_1
+        self.parent[root_2] = root_1
+        if self.rank[root_1] == self.rank[root_2]:
+            self.rank[root_1] += 1
+        self.set_count -= 1
+        return True
@@ -0,0 +1,242 @@
+import random
+import struct
+
+from walls import WallGrid
+from disjointset import DisjointSet
+from maze import Maze
+
+# A row file starts with a header (magic number, width of the labyrinth, number of rows), followed by the rows.
+# Each row is stored as one byte per cell: bit 0 is the right wall of the cell, bit 1 is its bottom wall.
+ROW_FILE_MAGIC = b"ELLR"
+ROW_FILE_HEADER = struct.Struct("<4sIQ")
+
+# Translation tables extracting the right and bottom walls from the bytes of a row file, at C speed.
+RIGHT_WALLS_TABLE = bytes(value & 1 for value in range(256))
+BOTTOM_WALLS_TABLE = bytes((value >> 1) & 1 for value in range(256))
+
+
+def generate_eller_rows(width, height=None, seed=None):
+    """
+    Generates a perfect labyrinth row by row with Eller's algorithm.
+
+    Eller's algorithm only needs to remember which set each cell of the current row belongs to (two cells are in the
+    same set if they are connected by the rows generated so far), so its memory usage is proportional to the width of the
+    labyrinth, whatever its height. For each row:
+    - Adjacent cells that belong to different sets are randomly joined (their right wall is broken).
+    - Each set randomly extends downwards through at least one of its cells, so that no set is cut off from the next rows.
+    - On the last row, every adjacent cells that belong to different sets are joined, which connects the whole labyrinth.
+
+    Parameters:
+    - width (int): The width of the labyrinth in cells.
+    - height (int): The height of the labyrinth in cells. None to generate rows indefinitely (there is no last row).
+    - seed (int): The seed of the random generator. None for a random seed.
+
+    Yields:
+    - tuple: The right and bottom walls of the row, as two bytearrays of `width` bytes (1 if there is a wall).
+      The right wall of the last cell and the bottom walls of the last row are the borders of the labyrinth and are
+      always 0, following the `WallGrid` convention.
+    """
+    rng = random.Random(seed)
+    sets = [-1] * width  # The set of each cell of the current row, -1 if the cell is not connected to the row above
+    next_set = 0
+    row = 0
+
+    while height is None or row < height:
+        is_last_row = height is not None and row == height - 1
+        right = bytearray(width)
+        bottom = bytearray(width)
+
+        # Cells that are not connected to the row above start their own set.
+        members = {}
+        for x in range(width):
+            if sets[x] == -1:
+                sets[x] = next_set
+                next_set += 1
+            members.setdefault(sets[x], []).append(x)
+
+        # Horizontal connections: we join adjacent cells from different sets, or we put a wall between them.
+        for x in range(width - 1):
+            set_1, set_2 = sets[x], sets[x + 1]
+            if set_1 != set_2 and (is_last_row or rng.random() < 0.5):
+                if len(members[set_1]) < len(members[set_2]):  # The smallest set is merged into the biggest one
+                    set_1, set_2 = set_2, set_1
+                for cell in members[set_2]:
+                    sets[cell] = set_1
+                members[set_1].extend(members.pop(set_2))
+            else:
+                right[x] = 1
+
+        # Vertical connections: each set goes down through at least one of its cells.
+        if not is_last_row:
+            for cells in members.values():
+                going_down = [cell for cell in cells if rng.random() < 0.5]
+                if not going_down:
+                    going_down = [rng.choice(cells)]
+                for cell in cells:
+                    bottom[cell] = 1
+                for cell in going_down:
+                    bottom[cell] = 0
+            for x in range(width):
+                if bottom[x]:  # The cell below will start a new set
+                    sets[x] = -1
+
+        yield right, bottom
+        row += 1
+
+
+class RowWriter:
+    """
+    Writes the rows of a labyrinth to a file, one at a time.
+
+    The number of rows is written in the header when the writer is closed, so the height of the labyrinth does not
+    need to be known in advance. The writer can be used as a context manager.
+
+    Attributes:
+        file (file): The file the rows are written to.
+        width (int): The width of the labyrinth in cells.
+        row_count (int): The number of rows written so far.
+    """
+
+    def __init__(self, path, width):
+        """
+        Opens the file and writes a provisional header.
+
+        Parameters:
+        - path (str): The path of the file.
+        - width (int): The width of the labyrinth in cells.
+        """
+        self.file = open(path, "wb")
+        self.width = width
+        self.row_count = 0
+        self.file.write(ROW_FILE_HEADER.pack(ROW_FILE_MAGIC, width, 0))
+
+    def write_row(self, right, bottom):
+        """
+        Writes a row of walls to the file.
+
+        Parameters:
+        - right (bytearray): The right walls of the row (one byte per cell, 0 or 1).
+        - bottom (bytearray): The bottom walls of the row (one byte per cell, 0 or 1).
+        """
+        # Every byte is 0 or 1, so shifting the whole bottom row by one bit moves each wall to bit 1 of its own byte.
+        packed = int.from_bytes(right, "little") | (int.from_bytes(bottom, "little") << 1)
+        self.file.write(packed.to_bytes(self.width, "little"))
+        self.row_count += 1
+
+    def close(self):
+        """
+        Writes the final header and closes the file.
+        """
+        self.file.seek(0)
+        self.file.write(ROW_FILE_HEADER.pack(ROW_FILE_MAGIC, self.width, self.row_count))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def write_rows(path, width, rows):
+    """
+    Streams rows of walls to a file, without keeping them in memory.
+
+    Parameters:
+    - path (str): The path of the file.
+    - width (int): The width of the labyrinth in cells.
+    - rows (iterable): The rows, as (right, bottom) tuples such as the ones yielded by `generate_eller_rows`.
+
+    Returns:
+    - int: The number of rows written.
+    """
+    with RowWriter(path, width) as writer:
+        for right, bottom in rows:
+            writer.write_row(right, bottom)
+    return writer.row_count
+
+
+def read_header(file):
+    """
+    Reads the header of a row file.
+
+    Parameters:
+    - file (file): The file, opened in binary mode.
+
+    Returns:
+    - tuple: The width of the labyrinth and the number of rows in the file.
+
+    Raises:
+    - ValueError: If the file is not a row file.
+    """
+    magic, width, row_count = ROW_FILE_HEADER.unpack(file.read(ROW_FILE_HEADER.size))
+    if magic != ROW_FILE_MAGIC:
+        raise ValueError("Not a labyrinth row file.")
+    return width, row_count
+
+
+def load_window(path, first_row, row_count, resolution_algorithm="a-star", connect=True):
+    """
+    Loads a horizontal window of a row file into a Labyrinth, for solving or display.
+
+    Only the requested rows are read from the file. In a labyrinth generated with Eller's algorithm, two cells of the
+    window may only be connected through rows outside of it. With `connect`, the window is made into a perfect labyrinth
+    of its own by breaking one wall between each of its disconnected parts, so that any two cells can be joined.
+
+    Parameters:
+    - path (str): The path of the row file.
+    - first_row (int): The index of the first row of the window.
+    - row_count (int): The number of rows in the window. It is truncated to the end of the file.
+    - resolution_algorithm (str): The algorithm to use for resolving the labyrinth.
+    - connect (bool): Whether to connect the disconnected parts of the window.
+
+    Returns:
+    - Maze: The labyrinth of the window, already generated. Use `Labyrinth.from_walls` with its walls to display it.
+
+    Raises:
+    - ValueError: If the window is outside of the file.
+    """
+    with open(path, "rb") as file:
+        width, total_rows = read_header(file)
+        if first_row < 0 or first_row >= total_rows or row_count <= 0:
+            raise ValueError(f"The window starting at row {first_row} is outside of the labyrinth.")
+        row_count = min(row_count, total_rows - first_row)
+        file.seek(ROW_FILE_HEADER.size + first_row * width)
+        data = file.read(row_count * width)
+
+    walls = WallGrid(width, row_count)
+    walls.right[:] = data.translate(RIGHT_WALLS_TABLE)
+    walls.bottom[:] = data.translate(BOTTOM_WALLS_TABLE)
+    walls.bottom[(row_count - 1) * width :] = bytes(width)  # The last row of the window is the border of the labyrinth
+    walls.count = walls.right.count(1) + walls.bottom.count(1)
+
+    if connect:
+        connect_walls(walls)
+
+    return Maze.from_walls(walls, "eller", resolution_algorithm)
+
+
+def connect_walls(walls):
+    """
+    Breaks the minimum number of walls needed for every cell of a wall grid to be reachable.
+
+    The cells that are already connected are grouped with a disjoint-set, then the walls are scanned in order and a
+    wall is broken whenever it separates two groups. A forest of perfect labyrinths becomes a single perfect labyrinth.
+
+    Parameters:
+    - walls (WallGrid): The wall grid, modified in place.
+    """
+    width = walls.width
+    size = walls.width * walls.height
+    sets = DisjointSet(size)
+    for case in range(size):
+        if case % width != width - 1 and not walls.right[case]:
+            sets.union(case, case + 1)
+        if case + width < size and not walls.bottom[case]:
+            sets.union(case, case + width)
+
+    for case_1, case_2 in list(walls):
+        if sets.set_count == 1:
+            break
+        if sets.union(case_1, case_2):
+            walls.remove(case_1, case_2)
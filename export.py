@@ -0,0 +1,319 @@
+"""
+Exports labyrinths to PNG images without going through pygame surfaces.
+
+`Labyrinth.get_image` draws one line per wall on a surface of the size of the whole labyrinth, which does not scale to
+the labyrinths generated offline. Here, the wall planes are rasterized directly into NumPy arrays of palette indices,
+one horizontal strip of cells at a time, with vectorized slicing: every line of a strip is drawn at once. The strips
+are compressed and written to the file as soon as they are rasterized, so the memory used only depends on the width
+of the image and on the height of the strips.
+
+The lines are drawn like the walls of `get_image` and the path of `get_pathfinding_image`: a line of width `w` on a
+border at pixel `b` covers the pixels `b - (w - 1) // 2` to `b + w // 2`, and goes from one end to the other, both
+included.
+
+Run it from the root of the repository:
+
+    python export.py 4000 labyrinth.png
+    python export.py 500 labyrinth.png --cell-size 8 --resolution-algorithm a-star --seed 3
+"""
+
+import argparse
+import contextlib
+import io
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from constants import BUTTON_COLOR, WHITE
+
+BACKGROUND = 0  # The palette index of the background
+WALL = 1  # The palette index of the walls
+PATH = 2  # The palette index of the path
+PALETTE = [BUTTON_COLOR, WHITE, (0, 255, 0)]  # The colors of the palette indices, as in the labyrinth images
+
+STRIP_PIXELS = 1 << 22  # The number of pixels rasterized at once when writing a file (4 MiB per strip)
+BIT_DEPTH = 2  # The number of bits per pixel in the PNG files, enough for the palette
+COMPRESSION_LEVEL = 1  # The zlib level of the PNG files: the compression takes most of the time from level 2 on
+
+
+def get_path_links(path, width, height):
+    """
+    Gets the moves of a path as two planes, in the same layout as the wall planes.
+
+    Parameters:
+    - path (list): The cells of the path, each one adjacent to the previous one.
+    - width (int): The width of the labyrinth, in cells.
+    - height (int): The height of the labyrinth, in cells.
+
+    Returns:
+    - tuple: Two boolean arrays of shape (height, width): the cells linked to their right neighbor, and the cells linked
+      to their bottom neighbor.
+    """
+    right = np.zeros(width * height, dtype=bool)
+    bottom = np.zeros(width * height, dtype=bool)
+    if path is not None and len(path) > 1:
+        cells = np.asarray(path, dtype=np.int64)
+        first = np.minimum(cells[:-1], cells[1:])  # The upper or leftmost cell of each move
+        horizontal = np.abs(cells[1:] - cells[:-1]) == 1
+        right[first[horizontal]] = True
+        bottom[first[~horizontal]] = True
+    return right.reshape(height, width), bottom.reshape(height, width)
+
+
+def draw_horizontal_lines(strip, top, plane, offset, cell_size, line_width, color):
+    """
+    Draws a horizontal line for every true cell of a plane, on the rows of a strip.
+
+    The line of the cell (x, y) goes from pixel `(x * cell_size + offset[0], y * cell_size + offset[1])` to the same
+    point one cell to the right.
+
+    Parameters:
+    - strip (ndarray): The pixels of the strip, as palette indices.
+    - top (int): The row of the image of the first row of the strip.
+    - plane (ndarray): The boolean plane of shape (height, width).
+    - offset (tuple): The position of the start of the lines in the cells, in pixels.
+    - cell_size (int): The size of a cell, in pixels.
+    - line_width (int): The width of the lines, in pixels.
+    - color (int): The palette index of the lines.
+    """
+    height, width = plane.shape
+    image_width = strip.shape[1]
+    rows = np.arange(top, top + strip.shape[0]) - offset[1] + (line_width - 1) // 2
+    cells = rows // cell_size
+    on_line = (rows >= 0) & (rows % cell_size < line_width) & (cells < height)
+    if not on_line.any():
+        return
+    lines, row_line = np.unique(cells[on_line], return_inverse=True)
+
+    # The columns covered by the line of each cell, then the last pixel of each line (the lines include both ends).
+    masks = np.zeros((len(lines), image_width + cell_size + 1), dtype=bool)
+    masks[:, offset[0] : offset[0] + width * cell_size] = np.repeat(plane[lines], cell_size, axis=1)
+    masks[:, offset[0] + cell_size : offset[0] + (width + 1) * cell_size : cell_size] |= plane[lines]
+    strip[on_line] = np.where(masks[row_line, :image_width], color, strip[on_line])
+
+
+def draw_vertical_lines(strip, top, plane, offset, cell_size, line_width, color):
+    """
+    Draws a vertical line for every true cell of a plane, on the rows of a strip.
+
+    The line of the cell (x, y) goes from pixel `(x * cell_size + offset[0], y * cell_size + offset[1])` to the same
+    point one cell below.
+
+    Parameters:
+    - strip (ndarray): The pixels of the strip, as palette indices.
+    - top (int): The row of the image of the first row of the strip.
+    - plane (ndarray): The boolean plane of shape (height, width).
+    - offset (tuple): The position of the start of the lines in the cells, in pixels.
+    - cell_size (int): The size of a cell, in pixels.
+    - line_width (int): The width of the lines, in pixels.
+    - color (int): The palette index of the lines.
+    """
+    height, width = plane.shape
+    image_width = strip.shape[1]
+    rows = np.arange(top, top + strip.shape[0]) - offset[1]
+    cells = rows // cell_size
+    first = max(0, cells[0] - 1)  # The line of a cell ends on the first row of the cell below
+    last = min(height, cells[-1] + 1)
+    if first >= last:
+        return
+
+    # The columns covered by the lines of each row of cells. The last mask is left empty, for the rows without lines.
+    masks = np.zeros((last - first + 1, image_width), dtype=bool)
+    for column in range(line_width):
+        columns = np.arange(width) * cell_size + offset[0] - (line_width - 1) // 2 + column
+        valid = (columns >= 0) & (columns < image_width)
+        masks[: last - first, columns[valid]] |= plane[first:last, valid]
+
+    def get_mask_index(cells):
+        return np.where((cells >= first) & (cells < last), cells - first, last - first)
+
+    # A row of pixels crosses the lines of its row of cells, and the ends of the lines of the row above.
+    row_masks = masks[get_mask_index(cells)]
+    ends = rows % cell_size == 0
+    row_masks[ends] |= masks[get_mask_index(cells[ends] - 1)]
+    strip[row_masks] = color
+
+
+def rasterize_strip(walls, first_row, last_row, cell_size, line_width=None, path_links=None):
+    """
+    Rasterizes the rows of cells from `first_row` to `last_row` (excluded) of a labyrinth.
+
+    Parameters:
+    - walls (WallGrid): The walls of the labyrinth.
+    - first_row (int): The first row of cells of the strip.
+    - last_row (int): The row of cells after the last one of the strip.
+    - cell_size (int): The size of a cell, in pixels.
+    - line_width (int): The width of the walls and of the path, in pixels. Defaults to the width used by `Labyrinth`.
+    - path_links (tuple): The moves of the path to draw, as returned by `get_path_links`, or None.
+
+    Returns:
+    - ndarray: The pixels of the strip, as palette indices of shape (rows, columns).
+    """
+    if line_width is None:
+        line_width = max(1, cell_size // 10)
+
+    # Only the rows of cells of the strip and the rows right around it have lines that can reach the strip.
+    band = slice(max(0, first_row - 1), min(walls.height, last_row + 1))
+    right, bottom = walls.as_arrays()
+    right = right.reshape(walls.height, walls.width)[band].astype(bool)
+    bottom = bottom.reshape(walls.height, walls.width)[band].astype(bool)
+
+    strip = np.full(((last_row - first_row) * cell_size, walls.width * cell_size), BACKGROUND, dtype=np.uint8)
+    top = (first_row - band.start) * cell_size  # The position of the strip in the band, in pixels
+    draw_vertical_lines(strip, top, right, (cell_size, 0), cell_size, line_width, WALL)
+    draw_horizontal_lines(strip, top, bottom, (0, cell_size), cell_size, line_width, WALL)
+    if path_links is not None:
+        # The path goes from the center of a cell to the center of the next one, on top of the walls.
+        center = (cell_size // 2, cell_size // 2)
+        draw_horizontal_lines(strip, top, path_links[0][band], center, cell_size, line_width, PATH)
+        draw_vertical_lines(strip, top, path_links[1][band], center, cell_size, line_width, PATH)
+    return strip
+
+
+def rasterize(walls, cell_size, line_width=None, path=None):
+    """
+    Rasterizes a whole labyrinth into an array of palette indices (see `PALETTE`).
+
+    Parameters:
+    - walls (WallGrid): The walls of the labyrinth.
+    - cell_size (int): The size of a cell, in pixels.
+    - line_width (int): The width of the walls and of the path, in pixels. Defaults to the width used by `Labyrinth`.
+    - path (list): The cells of a path to draw on top of the walls, or None.
+
+    Returns:
+    - ndarray: The image, of shape (height * cell_size, width * cell_size).
+    """
+    links = get_path_links(path, walls.width, walls.height) if path else None
+    return rasterize_strip(walls, 0, walls.height, cell_size, line_width, links)
+
+
+def write_chunk(file, kind, data):
+    """
+    Writes a PNG chunk.
+
+    Parameters:
+    - file (file): The file, opened in binary mode.
+    - kind (bytes): The type of the chunk.
+    - data (bytes): The content of the chunk.
+    """
+    file.write(struct.pack(">I", len(data)))
+    file.write(kind)
+    file.write(data)
+    file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
+
+
+def pack_rows(strip):
+    """
+    Packs the pixels of a strip into the rows of a PNG image, `BIT_DEPTH` bits per pixel.
+
+    There are only three colors, so four pixels fit in a byte: this divides by four the amount of data to compress,
+    which is the slowest part of the export.
+
+    Parameters:
+    - strip (ndarray): The pixels of the strip, as palette indices.
+
+    Returns:
+    - ndarray: The rows of bytes, each one starting with its filter type (0: none).
+    """
+    pixels_per_byte = 8 // BIT_DEPTH
+    height, width = strip.shape
+    padded = np.zeros((height, -(-width // pixels_per_byte) * pixels_per_byte), dtype=np.uint8)
+    padded[:, :width] = strip
+    groups = padded.reshape(height, -1, pixels_per_byte)
+    rows = np.zeros((height, groups.shape[1] + 1), dtype=np.uint8)
+    for index in range(pixels_per_byte):  # The first pixel goes in the most significant bits
+        rows[:, 1:] |= groups[:, :, index] << (8 - BIT_DEPTH * (index + 1))
+    return rows
+
+
+def export_png(
+    walls, filename, cell_size=4, line_width=None, path=None, strip_rows=None, compression_level=COMPRESSION_LEVEL
+):
+    """
+    Writes the image of a labyrinth to a palette PNG file, one strip of cells at a time.
+
+    Parameters:
+    - walls (WallGrid): The walls of the labyrinth.
+    - filename (str): The path of the file.
+    - cell_size (int): The size of a cell, in pixels.
+    - line_width (int): The width of the walls and of the path, in pixels. Defaults to the width used by `Labyrinth`.
+    - path (list): The cells of a path to draw on top of the walls, or None.
+    - strip_rows (int): The number of rows of cells rasterized at once. By default, a strip holds about
+      `STRIP_PIXELS` pixels.
+    - compression_level (int): The zlib compression level, from 0 (no compression) to 9 (smallest files).
+    """
+    image_width = walls.width * cell_size
+    image_height = walls.height * cell_size
+    if strip_rows is None:
+        strip_rows = max(1, STRIP_PIXELS // (image_width * cell_size))
+    links = get_path_links(path, walls.width, walls.height) if path else None
+
+    with open(filename, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        # Palette colors, default compression, filter and interlace methods
+        write_chunk(file, b"IHDR", struct.pack(">IIBBBBB", image_width, image_height, BIT_DEPTH, 3, 0, 0, 0))
+        write_chunk(file, b"PLTE", bytes(channel for color in PALETTE for channel in color))
+
+        compressor = zlib.compressobj(compression_level)
+        for first_row in range(0, walls.height, strip_rows):
+            strip = rasterize_strip(
+                walls, first_row, min(walls.height, first_row + strip_rows), cell_size, line_width, links
+            )
+            data = compressor.compress(pack_rows(strip).tobytes())
+            if data:
+                write_chunk(file, b"IDAT", data)
+        write_chunk(file, b"IDAT", compressor.flush())
+        write_chunk(file, b"IEND", b"")
+
+
+def main():
+    from maze import Maze, GENERATION_ALGORITHMS, RESOLUTION_ALGORITHMS
+
+    parser = argparse.ArgumentParser(description="Generates a labyrinth and exports it to a PNG image.")
+    parser.add_argument("size", type=int, help="Width and height of the labyrinth, in cells.")
+    parser.add_argument("output", help="Path of the PNG file.")
+    parser.add_argument("--cell-size", type=int, default=4, help="Size of a cell, in pixels.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the random generator.")
+    parser.add_argument(
+        "--generation-algorithm",
+        default="depth-first-search",
+        choices=GENERATION_ALGORITHMS,
+        help="Generation algorithm.",
+    )
+    parser.add_argument(
+        "--resolution-algorithm",
+        default=None,
+        choices=RESOLUTION_ALGORITHMS,
+        help="Algorithm used to draw the path from the start to the end (no path by default).",
+    )
+    parser.add_argument("--looping-factor", type=float, default=0.1, help="Looping factor of the labyrinth.")
+    parser.add_argument(
+        "--compression-level", type=int, default=COMPRESSION_LEVEL, choices=range(10), help="zlib compression level."
+    )
+    args = parser.parse_args()
+
+    labyrinth = Maze(
+        (args.size, args.size), args.generation_algorithm, args.resolution_algorithm or "a-star", args.looping_factor
+    )
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # The generation prints its progress
+        labyrinth.generate(args.seed)
+    print(f"Génération : {time.perf_counter() - start:.2f}s")
+
+    path = None
+    if args.resolution_algorithm is not None:
+        start = time.perf_counter()
+        path = labyrinth.solve()
+        print(f"Résolution : {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    export_png(
+        labyrinth.walls, args.output, args.cell_size, path=path or None, compression_level=args.compression_level
+    )
+    print(f"Export : {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+class FlowField:
+    """
+    A distance field shared by every enemy chasing the same target.
+
+    Instead of each enemy looking for its own path to the character, a single breadth-first search is run from the
+    target cell, filling the distance of every cell to the target. An enemy then only has to step to its neighbor with
+    the lowest distance, which is a constant time operation whatever the size of the labyrinth.
+
+    The field is only computed when an enemy asks for a step after the target has moved, so a character moving every
+    frame does not cost a search per frame. The distance list is allocated once and reused from one search to the next.
+
+    Attributes:
+        labyrinth (Labyrinth): The labyrinth the field is computed on.
+        target (int): The ID of the cell the field leads to, None if no target has been set.
+        distances (list): The distance of each cell to the target, -1 if the cell can't reach it.
+        unreached (list): A list of -1 of the same size, copied over the distances before each search.
+        is_outdated (bool): Flag indicating if the target has moved since the last search.
+        search_count (int): The number of searches done so far (for debugging and benchmarking).
+    """
+
+    def __init__(self, labyrinth):
+        """
+        Initializes an empty flow field.
+
+        Parameters:
+        - labyrinth (Labyrinth): The labyrinth the field is computed on. Its walls must not change afterwards.
+        """
+        self.labyrinth = labyrinth
+        self.target = None
+        self.distances = [-1] * (labyrinth.width * labyrinth.height)
+        self.unreached = [-1] * (labyrinth.width * labyrinth.height)
+        self.is_outdated = False
+        self.search_count = 0
+
+    def set_target(self, target):
+        """
+        Sets the cell the field leads to. The field is only marked as outdated, the search is done when it is needed.
+
+        Parameters:
+        - target (int): The ID of the target cell.
+        """
+        if target != self.target:
+            self.target = target
+            self.is_outdated = True
+
+    def compute(self):
+        """
+        Runs a breadth-first search from the target cell, filling the distance of every cell.
+
+        The search goes layer by layer: all the cells of a layer are at the same distance from the target.
+        The walls are read directly from the wall grid of the labyrinth.
+        """
+        width = self.labyrinth.width
+        last_line = width * (self.labyrinth.height - 1)
+        right = self.labyrinth.walls.right
+        bottom = self.labyrinth.walls.bottom
+        distances = self.distances
+        distances[:] = self.unreached
+
+        distances[self.target] = 0
+        layer = [self.target]
+        distance = 0
+        while layer:
+            distance += 1
+            next_layer = []
+            for case in layer:
+                x = case % width
+                if x != 0 and not right[case - 1] and distances[case - 1] < 0:
+                    distances[case - 1] = distance
+                    next_layer.append(case - 1)
+                if x != width - 1 and not right[case] and distances[case + 1] < 0:
+                    distances[case + 1] = distance
+                    next_layer.append(case + 1)
+                if case >= width and not bottom[case - width] and distances[case - width] < 0:
+                    distances[case - width] = distance
+                    next_layer.append(case - width)
+                if case < last_line and not bottom[case] and distances[case + width] < 0:
+                    distances[case + width] = distance
+                    next_layer.append(case + width)
+            layer = next_layer
+
+        self.is_outdated = False
+        self.search_count += 1
+
+    def next_step(self, case):
+        """
+        Gets the cell to move to from a given cell to get closer to the target.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - int: The ID of the accessible neighbor with the lowest distance to the target, or None if the cell is the target
+          itself or can't reach it.
+        """
+        if self.target is None:
+            return None
+        if self.is_outdated:
+            self.compute()
+
+        distances = self.distances
+        if distances[case] <= 0:  # The cell is the target, or can't reach it
+            return None
+        for neighbor in self.labyrinth.get_accessible_cases(case):
+            if distances[neighbor] == distances[case] - 1:  # There is always one, since the cell reaches the target
+                return neighbor
+        return None
@@ -1,9 +1,92 @@
 import pygame
-from constants import HEIGHT, LABYRINTH_RESOLUTION, WHITE, WIDTH, BUTTON_COLOR
-from labyrinth import Labyrinth
+from constants import HEIGHT, WHITE, WIDTH, BUTTON_COLOR, BG_COLOR, DRAW_TEXT_CACHE_STATS
+from labyrinth import Labyrinth, fit_cell_size
 from character import Character, Point, Enemy
-from menufactory import MenuFactory, Text, Button
+from flowfield import FlowField
+from camera import Camera
+from assets import get_image
+from menufactory import MenuFactory, Text, Button, get_text_cache_stats
+from concurrent.futures import ThreadPoolExecutor
 import random
+import time
+
+PLAYABLE_CELL_SIZE = 16  # The smallest size of a cell in the game, in pixels. Bigger labyrinths are scrolled.
+
+# The levels are built one at a time, in a worker thread shared by all the games.
+LEVEL_LOADER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-loader")
+
+
+def build_level(level):
+    """
+    Build the labyrinth of a level, and choose where its enemies and points start.
+
+    This function runs in the worker thread of `LEVEL_LOADER`, so it must not touch the display. It uses the random
+    generator of the `random` module, which is safe as long as the game does not draw random numbers while a level is
+    loading.
+
+    Parameters:
+    - level (int): The level to build.
+
+    Returns:
+    - dict: The generated labyrinth, the flow field leading to the start cell, and the positions of the enemies and of
+      the points.
+    """
+
+    # Generate a new labyrinth for the game using the level as a parameter.
+    # The size of the labyrinth increases by 2 for each level, starting from 16x16.
+    # The generation algorithm is "depth-first-search". The solving algorithm is pointless in this context.
+    # The looping factor is set to 0.1 to create a fair amount of loops in the labyrinth.
+    # The more loops there are, the easier it is to navigate the labyrinth without getting stuck between enemies.
+    # The cells get smaller as the levels go, until they reach a size that is still comfortable to play with.
+    # From then on, the labyrinth no longer fits in the window, and the camera follows the character.
+    size = (16 + level * 2, 16 + level * 2)
+    cell_size = max(PLAYABLE_CELL_SIZE, fit_cell_size(size, (HEIGHT - 40, HEIGHT - 40)))
+    labyrinth = Labyrinth(size, "depth-first-search", "recursive-backtracking", 0.1, cell_size)
+
+    # We don't really want to see the generation process, so we do it all at once.
+    # The generate method runs the algorithm in a tight loop, which is much faster than calling generate_step repeatedly.
+    labyrinth.generate()
+
+    # A single flow field is shared by all the enemies, since they all chase the character, which starts at cell 0.
+    flow_field = FlowField(labyrinth)
+    flow_field.set_target(0)
+
+    # We want one enemy for every 100 cells in the labyrinth.
+    # The positions already taken are kept in sets: there are thousands of enemies and points in the bigger levels.
+    cell_count = labyrinth.width * labyrinth.height
+    enemies_count = cell_count // 100
+    enemies = []
+    taken = set()
+    for e in range(enemies_count):
+        position_valid = False
+        while not position_valid:
+            # Generate a new random position for the enemy in the labyrinth.
+            position = random.randint(0, cell_count - 1)
+            # Make sure the position is not already occupied by another enemy and is far enough from the character. We can use the Manhattan distance for this, as it is already implemented for the A* algorithm.
+            if position not in taken and labyrinth.MD(0, position) > 10:
+                position_valid = True
+        # If all conditions are met, keep the position for a new enemy.
+        enemies.append(position)
+        taken.add(position)
+
+    # We want three points for every enemy in the labyrinth.
+    points_count = enemies_count * 3
+    points = []
+    taken = set()
+    for p in range(points_count):
+        position_valid = False
+        while not position_valid:
+            # Make sure the position is not overlapping with the start or the end of the labyrinth.
+            # This is not such a big deal for the enemies since they move around, but it's important for the points.
+            position = random.randint(1, cell_count - 2)
+            if position not in taken:
+                # We don't want the points to overlap with each other either.
+                position_valid = True
+        # If all conditions are met, keep the position for a new point.
+        points.append(position)
+        taken.add(position)
+
+    return {"labyrinth": labyrinth, "flow_field": flow_field, "enemies": enemies, "points": points}
 
 
 class Game(MenuFactory):
@@ -17,7 +100,8 @@ class Game(MenuFactory):
 
     Attributes:
     - stack (list): A list representing the screen stack.
-    - STAIRS_IMAGE (pygame.Surface): The image of the stairs.
+    - STAIRS_IMAGE (pygame.Surface): The image of the stairs, resized to the cells of the current level. It is shared through
+      the assets cache, so it must not be drawn on.
     - screen (pygame.Surface): The game screen.
     - points_label (Text): The debug text object.
     - level_label (Text): The second debug text object.
@@ -25,13 +109,18 @@ class Game(MenuFactory):
     - level (int): The current level of the game.
     - total_points (int): The total points collected in the game.
     - labyrinth (Labyrinth): The labyrinth object.
-    - lab_layer (pygame.Surface): The labyrinth layer.
-    - game_layer (pygame.Surface): The game layer.
+    - camera (Camera): The view on the labyrinth, which follows the character.
     - point_count (int): The number of points collected in the current level.
     - points_to_get (int): The total number of points to collect to unlock the stairs.
     - points (list): A list of Point objects.
     - enemies (list): A list of Enemy objects.
     - character (Character): The character object.
+    - flow_field (FlowField): The flow field leading to the character, used by all the enemies to chase it.
+    - drawn_state (tuple): The positions of the sprites at the last frame (see `get_drawn_state`).
+    - camera_area (pygame.Rect): The area of the screen where the labyrinth is displayed.
+    - loading (concurrent.futures.Future): The level being built in the worker thread, None once it is set up.
+    - loading_label (Text): The message displayed while a level is loading.
+    - drawn_loading_text (str): The loading message displayed at the last frame.
     """
 
     def __init__(self, stack):
@@ -44,13 +133,6 @@ class Game(MenuFactory):
         super().__init__()
 
         self.stack = stack
-        self.STAIRS_IMAGE = pygame.image.load(
-            "stairs.png"
-        ).convert()  # The convert method is used to optimize the image for faster blitting.
-        self.STAIRS_IMAGE = pygame.transform.scale(
-            self.STAIRS_IMAGE, (int(LABYRINTH_RESOLUTION * 0.7), int(LABYRINTH_RESOLUTION * 0.7))
-        )  # Resize the image to avoid overlapping with the walls and make it fit in the cell.
-
         self.screen = pygame.display.get_surface()
 
         # Add two debug text elements to display information about the game state.
@@ -61,6 +143,9 @@ class Game(MenuFactory):
         self.elements.add(self.level_label)
         self.total_points_label = Text(self.screen.get_width() - 500, 110, WHITE, "LoremIpsum")
         self.elements.add(self.total_points_label)
+        if DRAW_TEXT_CACHE_STATS:  # The hit rate of the text cache, for debugging
+            self.cache_stats_label = Text(self.screen.get_width() - 500, 170, WHITE, "", counter=True)
+            self.elements.add(self.cache_stats_label)
 
         self.elements.add(Text(self.screen.get_width() - 500, 250, WHITE, "Déplacements :"))
         self.elements.add(Text(self.screen.get_width() - 500, 280, WHITE, "Flèches directionnelles"))
@@ -82,39 +167,44 @@ class Game(MenuFactory):
         )
         self.total_points = 0  # The total points collected in the game. It is used to calculate the final score.
 
+        # The labyrinth is displayed in this area, and the loading message too while a level is loading.
+        self.camera_area = pygame.Rect(20, 20, HEIGHT - 40, HEIGHT - 40)
+        self.loading_label = Text(
+            self.camera_area.x + 40, self.camera_area.centery - 20, WHITE, "Chargement du niveau"
+        )
+        self.drawn_loading_text = None
+
         self.load_level()  # Load the first level of the game.
 
     def load_level(self):
         """
-        Load a new level in the game.
+        Start loading a new level in the game.
 
-        This method generates a new labyrinth, points, enemies, and character for the game.
+        The labyrinth of the level is built in a worker thread (see `build_level`), so the window stays responsive
+        while the bigger levels are generated. A loading message is displayed in the meantime, and the game is set up
+        with the new labyrinth, points, enemies, and character as soon as the thread is done (see `start_level`).
         """
+        self.loading = LEVEL_LOADER.submit(build_level, self.level)
 
-        # Generate a new labyrinth for the game using the level as a parameter.
-        # The size of the labyrinth increases by 2 for each level, starting from 16x16.
-        # The generation algorithm is "depth-first-search". The solving algorithm is pointless in this context.
-        # The looping factor is set to 0.1 to create a fair amount of loops in the labyrinth.
-        # The more loops there are, the easier it is to navigate the labyrinth without getting stuck between enemies.
-        self.labyrinth = Labyrinth(
-            (16 + self.level * 2, 16 + self.level * 2), "depth-first-search", "recursive-backtracking", 0.1
-        )
+    def start_level(self, level_data):
+        """
+        Set up the game with a level built by `build_level`.
 
-        # We don't really want to see the generation process, so we do it all at once.
-        # There is no noticeable performance issue with this approach, even for larger labyrinths.
-        while not self.labyrinth.generation_data["is_generated"]:
-            self.labyrinth.generate_step()
+        The sprites are created here rather than in the worker thread, since they hold pygame surfaces.
 
-        # We want to display the labyrinth separately from the game elements, so we create a separate layer for it.
-        # We conveniently use the labyrinth's get_image method to get a surface representing the labyrinth.
-        self.lab_layer = self.labyrinth.get_image()
+        Parameters:
+        - level_data (dict): The labyrinth, the flow field, and the positions of the enemies and points of the level.
+        """
+        self.labyrinth = level_data["labyrinth"]
+        cell_size = self.labyrinth.cell_size
 
-        # We create a game layer to draw the points, enemies, and character on top of the labyrinth.
-        # We use the same size as the labyrinth layer to ensure proper alignment.
-        # We also make sure the game layer has an alpha channel for transparency.
-        self.game_layer = pygame.Surface(
-            (self.lab_layer.get_size()[0], self.lab_layer.get_size()[1]), pygame.SRCALPHA, 32
-        )
+        # Resize the stairs image to avoid overlapping with the walls and make it fit in the cells of this level.
+        # The image is loaded and scaled once for each size, then shared by all the levels using it.
+        self.STAIRS_IMAGE = get_image("stairs.png", (int(cell_size * 0.7), int(cell_size * 0.7)))
+
+        # The labyrinth is displayed through a camera, which only draws the tiles around the character.
+        # The walls never change during a level, so each tile is only rendered once.
+        self.camera = Camera(self.labyrinth, self.camera_area, cell_size)
 
         # Reset the point count for the new level.
         # The player needs to collect a certain number of points to unlock the stairs and progress to the next level.
@@ -124,45 +214,17 @@ class Game(MenuFactory):
         # Create the points, enemies, and character for the new level.
         # Pygame Groups could be used to manage these objects more efficiently,
         # But the performance gains would be negligible for the current scale of the game.
-        self.points = []
-        self.enemies = []
         self.character = Character(0, self.labyrinth, self)
+        self.flow_field = level_data["flow_field"]
+        self.enemies = [
+            Enemy(position, self.labyrinth, self.character, self.flow_field) for position in level_data["enemies"]
+        ]
+        self.points = [Point(position, self.labyrinth) for position in level_data["points"]]
 
         # Indicate the stairs are locked or not to avoid creating other stairs after unlocking them
-
         self.stairs_unlocked = False
         self.stairs_pos = self.labyrinth.width * self.labyrinth.height
 
-        # We want one enemy for every 100 cells in the labyrinth.
-        enemies_count = self.labyrinth.width * self.labyrinth.height // 100
-        for e in range(enemies_count):
-            position_valid = False
-            while not position_valid:
-                # Generate a new random position for the enemy in the labyrinth.
-                position = random.randint(0, self.labyrinth.width * self.labyrinth.height - 1)
-                # Make sure the position is not already occupied by another enemy and is far enough from the character. We can use the Manhattan distance for this, as it is already implemented for the A* algorithm.
-                if (
-                    position not in [e.pos for e in self.enemies]
-                    and self.labyrinth.MD(self.character.pos, position) > 10
-                ):
-                    position_valid = True
-            # If all conditions are met, create a new enemy object and add it to the list.
-            self.enemies.append(Enemy(position, self.labyrinth, self.character))
-
-        # We want three points for every enemy in the labyrinth.
-        points_count = enemies_count * 3
-        for p in range(points_count):
-            position_valid = False
-            while not position_valid:
-                # Make sure the position is not overlapping with the start or the end of the labyrinth.
-                # This is not such a big deal for the enemies since they move around, but it's important for the points.
-                position = random.randint(1, self.labyrinth.width * self.labyrinth.height - 2)
-                if position not in [p.pos for p in self.points]:
-                    # We don't want the points to overlap with each other either.
-                    position_valid = True
-            # If all conditions are met, create a new point object and add it to the list.
-            self.points.append(Point(position, self.labyrinth))
-
     def update(self, clock):
         """
         Update the game state.
@@ -171,20 +233,32 @@ class Game(MenuFactory):
         - clock (pygame.time.Clock): The game clock object.
         """
 
+        # While the next level is loading, the game is paused and only the loading message changes.
+        if self.loading is not None:
+            if not self.loading.done():
+                dots = "." * (int(time.perf_counter() * 3) % 4)  # The dots show that the game is not frozen
+                self.loading_label.update_text(f"Chargement du niveau {self.level}{dots}")
+                clock.tick(60)
+                return
+            self.start_level(self.loading.result())  # Any error in the worker thread is raised here
+            self.loading = None
+
         # Update the debug text elements to display the current game state.
         # Here, we are displaying the number of points collected and the number of points needed to unlock the stairs, as well as the current level.
         self.points_label.update_text(f"Points : {self.point_count}/{self.points_to_get}")
         self.level_label.update_text(f"Level : {self.level}")
         self.total_points_label.update_text(f"Total des points : {self.total_points}")
+        if DRAW_TEXT_CACHE_STATS:
+            self.cache_stats_label.update_text(get_text_cache_stats())
 
+        # The flow field is only recomputed when an enemy moves after the character has changed cell.
+        self.flow_field.set_target(self.character.pos)
         for e in self.enemies:
             # Update the state of each enemy in the game
             e.update()
         self.character.update()  # Update the state of the character in the game.
         # If the player has collected enough coins to unlock the stairs, display them at the end of the labyrinth.
         if self.points_to_get <= self.point_count and self.stairs_unlocked == False:
-            stairs_size = self.STAIRS_IMAGE.get_size()[0]
-            offset = (LABYRINTH_RESOLUTION - stairs_size) // 2
             position_valid = False
             while not position_valid:
                 # Make sure the position is not overlapping with the character.
@@ -193,10 +267,6 @@ class Game(MenuFactory):
                     # We don't want the stairs to overlap with the points either
                     position_valid = True
             self.stairs_pos = position
-            stairs_coordinates = self.labyrinth.id_to_coord(position)
-            stairs_x = stairs_coordinates[0] * LABYRINTH_RESOLUTION + offset
-            stairs_y = stairs_coordinates[1] * LABYRINTH_RESOLUTION + offset
-            self.lab_layer.blit(self.STAIRS_IMAGE, (stairs_x, stairs_y))
             self.stairs_unlocked = True
 
         # Slow down the game loop to sixty frames per second.
@@ -209,52 +279,138 @@ class Game(MenuFactory):
         """
         Draw the game screen.
         """
+        if self.loading is not None:
+            self.draw_loading()
+            super().draw()
+            return
 
-        # Calculate the maximum size of the labyrinth image that can fit in the game window.
-        # This theoretically allows the game to be played on different screen sizes,
-        # But this would require additional adjustments to the UI elements and scaling.
-        labyrinth_image_height = self.lab_layer.get_size()[1]
-        displayable_height = HEIGHT - 40
-        ratio = displayable_height / labyrinth_image_height
-        # Scale the labyrinth image to fit the game window.
-        # This can cause the lines of the labyrinth to become invisible on high labyrinth sizes (>75x75).
-        labyrinth_image = pygame.transform.scale(
-            self.lab_layer, (int(ratio * self.lab_layer.get_size()[0]), displayable_height)
-        )
+        # The camera is centered on the character, then draws the tiles of the labyrinth that are in the view.
+        self.camera.follow(self.character.pos)
+        self.update_points()
+        self.draw_view()
+        self.drawn_state = self.get_drawn_state()
+
+        # Draw the UI elements on top of the game screen.
+        super().draw()
+
+    def draw_changes(self):
+        """
+        Draw again the parts of the game screen that changed since the last frame.
+
+        When the view moved, the whole view is drawn again. Otherwise, only the cells that the sprites left or entered
+        are drawn again, as well as the points whose animation changed.
+
+        Returns:
+        - list: The areas of the screen that were drawn again.
+        """
+        if self.loading is not None:
+            rects = [self.camera_area] if self.loading_label.text != self.drawn_loading_text else []
+            if rects:
+                self.draw_loading()
+            return rects + super().draw_changes()
+
+        self.camera.follow(self.character.pos)
+        changed_points = self.update_points()
+        state = self.get_drawn_state()
+
+        if self.camera.get_view() != self.camera.drawn_view:  # Also the case with the new camera of a new level
+            self.draw_view()
+            rects = [self.camera.viewport]
+        else:
+            character_pos, enemies_pos, points_pos, stairs_unlocked = self.drawn_state
+            cells = set(changed_points)
+            if character_pos != self.character.pos:
+                cells.update((character_pos, self.character.pos))
+            for old_pos, new_pos in zip(enemies_pos, state[1]):
+                if old_pos != new_pos:
+                    cells.update((old_pos, new_pos))
+            cells.update(points_pos - state[2])  # The points that were collected
+            if stairs_unlocked != self.stairs_unlocked:
+                cells.add(self.stairs_pos)
+
+            # The tiles that were still missing are rendered first, then the sprites are drawn again on them and on
+            # the cells that changed.
+            rects = self.camera.draw(self.screen, overlay=False, only_changes=True)
+            size = self.labyrinth.cell_size
+            rects += [
+                pygame.Rect(self.camera.case_to_screen(case), (size, size)).clip(self.camera.viewport)
+                for case in cells
+                if self.camera.is_visible(case)
+            ]
+            for rect in rects:
+                self.draw_view(rect)
+
+        self.drawn_state = state
+        return rects + super().draw_changes()
+
+    def draw_loading(self):
+        """
+        Draw the loading message in place of the labyrinth.
+        """
+        self.screen.fill(BG_COLOR, self.camera_area)
+        self.loading_label.draw()
+        self.drawn_loading_text = self.loading_label.text
+
+    def get_drawn_state(self):
+        """
+        Get the positions of the sprites, to find the cells that changed at the next frame.
+
+        Returns:
+        - tuple: The position of the character, the positions of the enemies, the positions of the points and whether
+          the stairs are unlocked.
+        """
+        return self.character.pos, [e.pos for e in self.enemies], {p.pos for p in self.points}, self.stairs_unlocked
+
+    def update_points(self):
+        """
+        Advance the animation of the points that are in the view.
+
+        Returns:
+        - list: The positions of the points whose image changed.
+        """
+        visible = self.camera.get_visible_area()
+        changed = []
+        for p in self.points:
+            if visible.collidepoint(p.local_x, p.local_y):
+                p.draw()
+                if p.has_changed:
+                    changed.append(p.pos)
+        return changed
 
-        self.screen.blit(labyrinth_image, (20, 20))
+    def draw_view(self, area=None):
+        """
+        Draw the labyrinth and the sprites in the view.
 
-        # Clear the game layer
-        self.game_layer.fill((0, 0, 0, 0))
+        Parameters:
+        - area (pygame.Rect): The area of the screen to draw, None to draw the whole view.
+        """
+        if area is None:
+            self.camera.draw(self.screen, overlay=False)
+        else:
+            self.camera.draw_area(self.screen, area, overlay=False)
+
+        # Draw the stairs, points, enemies, and character on top of the labyrinth, only if they are in the view.
+        # The elements are drawn directly on the screen, clipped to the view (or to the area), so the cost of a frame
+        # does not depend on the size of the labyrinth.
+        self.screen.set_clip(self.camera.viewport if area is None else self.camera.viewport.clip(area))
+        visible = self.camera.get_visible_area()
+
+        if self.stairs_unlocked and self.camera.is_visible(self.stairs_pos):
+            # The stairs are smaller than the cells, to avoid overlapping with the walls.
+            offset = (self.labyrinth.cell_size - self.STAIRS_IMAGE.get_width()) // 2
+            stairs_x, stairs_y = self.camera.case_to_screen(self.stairs_pos)
+            self.screen.blit(self.STAIRS_IMAGE, (stairs_x + offset, stairs_y + offset))
 
-        # Draw the points, enemies, and character on the game layer.
         for p in self.points:
-            p_image = p.draw()
-            p_x = p.local_x * LABYRINTH_RESOLUTION
-            p_y = p.local_y * LABYRINTH_RESOLUTION
-            self.game_layer.blit(p_image, (p_x, p_y))
+            if visible.collidepoint(p.local_x, p.local_y):
+                self.screen.blit(p.image, self.camera.case_to_screen(p.pos))
 
         for e in self.enemies:
-            e_image = e.draw()
-            e_coordinates = self.labyrinth.id_to_coord(e.pos)
-            e_x = e_coordinates[0] * LABYRINTH_RESOLUTION
-            e_y = e_coordinates[1] * LABYRINTH_RESOLUTION
-            self.game_layer.blit(e_image, (e_x, e_y))
-
-        character_image = self.character.draw()
-        character_coordinates = self.labyrinth.id_to_coord(self.character.pos)
-        character_x = character_coordinates[0] * LABYRINTH_RESOLUTION
-        character_y = character_coordinates[1] * LABYRINTH_RESOLUTION
-        self.game_layer.blit(character_image, (character_x, character_y))
-
-        # Draw the game layer on top of the labyrinth layer, with the same scaling factor to ensure alignment.
-        game_layer_image = pygame.transform.scale(
-            self.game_layer, (int(ratio * self.game_layer.get_size()[0]), displayable_height)
-        )
-        self.screen.blit(game_layer_image, (20, 20))
+            if self.camera.is_visible(e.pos):
+                self.screen.blit(e.draw(), self.camera.case_to_screen(e.pos))
 
-        # Draw the UI elements on top of the game screen.
-        super().draw()
+        self.screen.blit(self.character.draw(), self.camera.case_to_screen(self.character.pos))
+        self.screen.set_clip(None)
 
     def on_key(self, key, down):
         """
@@ -265,8 +421,8 @@ class Game(MenuFactory):
         - down (bool): Indicates if the key is pressed down.
         """
 
-        # Handle the character movement
-        if down:
+        # Handle the character movement, once the level is loaded
+        if down and self.loading is None:
             if key == pygame.K_UP or key == pygame.K_z:
                 if self.labyrinth.id_to_coord(self.character.pos)[1] > 0:
                     self.character.move("up")
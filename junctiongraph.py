@@ -0,0 +1,319 @@
+import heapq
+import random
+
+
+class JunctionGraph:
+    """
+    An index of a labyrinth where every corridor is contracted into a single weighted edge.
+
+    Most cells of a labyrinth are corridor cells: they have exactly two openings, so a path that enters them has only one
+    way out. The nodes of the graph are the other cells (the junctions, with three or four openings, and the dead ends,
+    with one or zero), and each corridor between two nodes becomes an edge weighted by its length in moves.
+    The path queries then run on this much smaller graph, and the cells of the corridors are only read back when the
+    path is expanded into a list of cells.
+
+    The graph is built from a snapshot of the walls: it knows the version of the wall grid it was built from, so that
+    `Labyrinth.get_junction_graph` can rebuild it lazily when the walls change.
+
+    Attributes:
+        walls (WallGrid): The wall grid the graph was built from.
+        version (int): The version of the wall grid when the graph was built.
+        nodes (list): The cell ID of each node.
+        node_id (list): The node index of each cell, -1 for corridor cells.
+        adjacency (list): For each node, a list of `(neighbor node, edge index)` tuples.
+        edges (list): For each edge, the list of its cells, from one node to the other (both included).
+        edge_of (list): The edge index of each corridor cell, -1 for nodes.
+        offset (list): The index of each corridor cell in the list of cells of its edge.
+    """
+
+    def __init__(self, walls):
+        """
+        Builds the graph from a wall grid.
+
+        Parameters:
+        - walls (WallGrid): The wall grid of the labyrinth.
+        """
+        self.walls = walls
+        self.version = walls.version
+        size = walls.width * walls.height
+
+        import numpy as np  # Imported here, so that importing the maze module stays fast
+
+        # The number of openings of each cell is computed with NumPy, the same way as for the dead-end filling.
+        right, bottom = walls.as_arrays()
+        cases = np.arange(size)
+        open_right = (right == 0) & (cases % walls.width != walls.width - 1)
+        open_bottom = bottom == 0
+        open_bottom[size - walls.width :] = False
+        degree = open_right.astype(np.int8) + open_bottom
+        degree[1:] += open_right[:-1]
+        degree[walls.width :] += open_bottom[: size - walls.width]
+
+        self.nodes = np.flatnonzero(degree != 2).tolist()
+        self.node_id = [-1] * size
+        for index, case in enumerate(self.nodes):
+            self.node_id[case] = index
+        self.adjacency = [[] for _ in self.nodes]
+        self.edges = []
+        self.edge_of = [-1] * size
+        self.offset = [0] * size
+
+        for index in range(len(self.nodes)):
+            self.add_edges_from(index)
+
+        # A corridor that loops on itself without any junction is not reached from any node: one of its cells is made a node.
+        for case in np.flatnonzero(degree == 2).tolist():
+            if self.edge_of[case] == -1 and self.node_id[case] == -1:
+                self.node_id[case] = len(self.nodes)
+                self.nodes.append(case)
+                self.adjacency.append([])
+                self.add_edges_from(self.node_id[case])
+
+    @property
+    def node_count(self):
+        return len(self.nodes)
+
+    @property
+    def edge_count(self):
+        return len(self.edges)
+
+    def get_open_neighbors(self, case):
+        """
+        Gets the cells that can be moved to from a given cell, in the same order as `Labyrinth.get_accessible_cases`.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - list: A list of cell IDs.
+        """
+        width = self.walls.width
+        x = case % width
+        neighbors = []
+        if x != 0 and not self.walls.right[case - 1]:
+            neighbors.append(case - 1)
+        if x != width - 1 and not self.walls.right[case]:
+            neighbors.append(case + 1)
+        if case >= width and not self.walls.bottom[case - width]:
+            neighbors.append(case - width)
+        if case < width * (self.walls.height - 1) and not self.walls.bottom[case]:
+            neighbors.append(case + width)
+        return neighbors
+
+    def add_edges_from(self, node):
+        """
+        Follows every corridor leaving a node, and adds the edges that have not been found from their other end yet.
+
+        Parameters:
+        - node (int): The index of the node.
+        """
+        origin = self.nodes[node]
+        for first in self.get_open_neighbors(origin):
+            if self.edge_of[first] != -1:  # The corridor has already been followed from its other end
+                continue
+            if self.node_id[first] != -1 and self.node_id[first] < node:  # Same for two adjacent nodes
+                continue
+
+            cells = [origin]
+            previous, current = origin, first
+            while self.node_id[current] == -1:
+                cells.append(current)
+                following = self.get_open_neighbors(current)
+                previous, current = current, following[0] if following[0] != previous else following[1]
+            cells.append(current)
+
+            edge = len(self.edges)
+            self.edges.append(cells)
+            for index in range(1, len(cells) - 1):
+                self.edge_of[cells[index]] = edge
+                self.offset[cells[index]] = index
+            self.adjacency[node].append((self.node_id[current], edge))
+            if self.node_id[current] != node:
+                self.adjacency[self.node_id[current]].append((node, edge))
+
+    def get_edge_cells(self, edge, node):
+        """
+        Gets the cells of an edge, oriented from a given node.
+
+        Parameters:
+        - edge (int): The index of the edge.
+        - node (int): The index of the node the edge is left from.
+
+        Returns:
+        - list: The cells of the edge, starting with the cell of the node.
+        """
+        cells = self.edges[edge]
+        return cells if cells[0] == self.nodes[node] else cells[::-1]
+
+    def get_links(self, case):
+        """
+        Gets the nodes that can be reached from a cell without going through any other node.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - list: A list of `(node, cells)` tuples, where `cells` goes from the cell to the node (both included).
+        """
+        if self.node_id[case] != -1:
+            return [(self.node_id[case], [case])]
+        cells = self.edges[self.edge_of[case]]
+        offset = self.offset[case]
+        return [(self.node_id[cells[0]], cells[offset::-1]), (self.node_id[cells[-1]], cells[offset:])]
+
+    def get_direct_path(self, start, end):
+        """
+        Gets the path between two cells of the same corridor that does not leave the corridor.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or None if the cells are not in the same corridor.
+        """
+        if self.edge_of[start] == -1 or self.edge_of[start] != self.edge_of[end]:
+            return None
+        cells = self.edges[self.edge_of[start]]
+        if self.offset[start] <= self.offset[end]:
+            return cells[self.offset[start] : self.offset[end] + 1]
+        return cells[self.offset[end] : self.offset[start] + 1][::-1]
+
+    def resolve_a_star(self, start, end):
+        """
+        Use the A* algorithm on the graph to find a shortest path from the start cell to the end cell.
+
+        The start and end cells are linked to the nodes at both ends of their corridor. The heuristic is the Manhattan
+        distance from the cell of a node to the end cell: it never overestimates the length of a corridor, so the path
+        found is as short as the one found on the grid.
+
+        Parameters:
+        - start (int): The ID of the start cell.
+        - end (int): The ID of the end cell.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        width = self.walls.width
+        end_x, end_y = end % width, end // width
+        nodes = self.nodes
+
+        best_cost = float("inf")
+        best_node = None  # None if the best path is the direct path inside a corridor
+        direct_path = self.get_direct_path(start, end)
+        if direct_path is not None:
+            best_cost = len(direct_path) - 1
+
+        end_links = {}  # The cost from each node linked to the end cell (both links may lead to the same node)
+        for node, cells in self.get_links(end):
+            end_links[node] = min(len(cells) - 1, end_links.get(node, float("inf")))
+        gScore = {}
+        # For each node, the previous node and the edge taken (-1 and the start link for the first nodes)
+        cameFrom = {}
+        openSet = []
+        for node, cells in self.get_links(start):
+            if len(cells) - 1 < gScore.get(node, float("inf")):
+                gScore[node] = len(cells) - 1
+                cameFrom[node] = (-1, cells)
+                case = nodes[node]
+                h = abs(case % width - end_x) + abs(case // width - end_y)
+                heapq.heappush(openSet, (gScore[node] + h, gScore[node], node))
+
+        while openSet:
+            f, g, node = heapq.heappop(openSet)
+            if f >= best_cost:  # No path left in the open set can be shorter than the best one
+                break
+            if g > gScore[node]:  # Outdated tuple
+                continue
+            if node in end_links and g + end_links[node] < best_cost:
+                best_cost = g + end_links[node]
+                best_node = node
+            for neighbor, edge in self.adjacency[node]:
+                tentative_gScore = g + len(self.edges[edge]) - 1
+                if tentative_gScore < gScore.get(neighbor, float("inf")):
+                    gScore[neighbor] = tentative_gScore
+                    cameFrom[neighbor] = (node, edge)
+                    case = nodes[neighbor]
+                    h = abs(case % width - end_x) + abs(case // width - end_y)
+                    heapq.heappush(openSet, (tentative_gScore + h, tentative_gScore, neighbor))
+
+        if best_node is None:
+            return direct_path if direct_path is not None else False
+
+        # We go back from the last node to the start, then expand the corridors in the right order.
+        segments = []
+        node = best_node
+        while True:
+            previous, edge = cameFrom[node]
+            if previous == -1:
+                segments.append(edge)  # The start link
+                break
+            segments.append(self.get_edge_cells(edge, previous))
+            node = previous
+        segments.reverse()
+        return self.join_segments(segments, self.get_links(end), best_node)
+
+    def resolve_recursive_backtracking(self, start, end, choice=random.choice):
+        """
+        Use the recursive backtracking algorithm on the graph to find a path from the start cell to the end cell.
+
+        A random unvisited neighbor node is pushed on the stack until a node linked to the end cell is reached, and the
+        nodes with no unvisited neighbor are popped. Each move goes through a whole corridor at once.
+
+        Parameters:
+        - start (int): The ID of the start cell.
+        - end (int): The ID of the end cell.
+        - choice (function): The function used to pick a random neighbor.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        direct_path = self.get_direct_path(start, end)
+        if direct_path is not None:
+            return direct_path
+
+        end_nodes = {node for node, cells in self.get_links(end)}
+        start_links = self.get_links(start)
+        start_edge = self.edge_of[start]  # Going through the corridor of the start cell would go back through it
+        visited = bytearray(len(self.nodes))
+        stack = []  # The nodes of the path, with the edge taken to reach them (None for the first node)
+
+        while True:
+            if stack and stack[-1][0] in end_nodes:
+                break
+            if stack:
+                available = [
+                    (neighbor, edge)
+                    for neighbor, edge in self.adjacency[stack[-1][0]]
+                    if not visited[neighbor] and edge != start_edge
+                ]
+            else:
+                available = [(node, None) for node, cells in start_links if not visited[node]]
+            if available:
+                node, edge = choice(available)
+                visited[node] = 1
+                stack.append((node, edge))
+            elif stack:  # We have reached a dead end : we must backtrack
+                stack.pop()
+            else:
+                return False
+
+        segments = [cells for node, cells in start_links if node == stack[0][0]][:1]
+        for index in range(1, len(stack)):
+            segments.append(self.get_edge_cells(stack[index][1], stack[index - 1][0]))
+        return self.join_segments(segments, self.get_links(end), stack[-1][0])
+
+    def join_segments(self, segments, end_links, last_node):
+        """
+        Joins the cells of consecutive segments of a path, and the link from the last node to the end cell.
+
+        Parameters:
+        - segments (list): The lists of cells of the segments, each one starting where the previous one ends.
+        - end_links (list): The links of the end cell, as returned by `get_links`.
+        - last_node (int): The last node of the path.
+
+        Returns:
+        - list: The path, as a list of cell IDs.
+        """
+        path = list(segments[0])
+        for cells in segments[1:]:
+            path.extend(cells[1:])
+        end_cells = min((cells for node, cells in end_links if node == last_node), key=len)
+        path.extend(end_cells[-2::-1])  # The link goes from the end cell to the node
+        return path
@@ -1,8 +1,29 @@
 import pygame
-import time
-import random
-from constants import LABYRINTH_RESOLUTION, DRAW_CASE_NUMBERS, BUTTON_COLOR, LINE_WIDTH, font
 import math
+from constants import LABYRINTH_RESOLUTION, DRAW_CASE_NUMBERS, BUTTON_COLOR, FONT_SIZE
+from assets import get_font
+from maze import Maze, GENERATION_ALGORITHMS, RESOLUTION_ALGORITHMS, CELL_UNVISITED, CELL_VISITED, CELL_BANNED
+
+
+def fit_cell_size(size, area, minimum=2):
+    """
+    Computes the biggest cell size (in pixels) for which a labyrinth fits in an area of the screen.
+
+    Drawing the labyrinth directly at this size avoids allocating huge images and scaling them down at every frame.
+
+    Parameters:
+    - size (tuple): The size of the labyrinth in cells (width, height).
+    - area (tuple): The size of the area in pixels (width, height).
+    - minimum (int): The minimum cell size. Below 2 pixels, the walls can't be told apart from the cells.
+
+    Returns:
+    - int: The size of a cell, in pixels.
+    """
+    return max(minimum, min(area[0] // size[0], area[1] // size[1]))
+
+
+# Above this number of changed walls, redrawing the whole labyrinth image is faster than repainting the changes one by one.
+INCREMENTAL_REDRAW_LIMIT = 256
 
 
 def generate_color(min, max, value):
@@ -36,30 +57,34 @@ def generate_color(min, max, value):
     return (red, green, 0)
 
 
-class Labyrinth(pygame.sprite.Sprite):
+class Labyrinth(Maze, pygame.sprite.Sprite):
     """
-    Represents a labyrinth object.
+    Represents a labyrinth object, as drawn in the game.
+
+    The walls, the generation and the resolution are implemented by the `Maze` class. This class adds the images of the
+    labyrinth and of the pathfinding layer, and the methods to draw them (whole, or tile by tile for the camera).
 
     Attributes:
-        width (int): The width of the labyrinth in cells.
-        height (int): The height of the labyrinth in cells.
-        matrix (list): The matrix representation of the labyrinth.
+        cell_size (int): The size of a cell on the images, in pixels.
+        line_width (int): The width of the walls and path lines on the images, in pixels.
         image (Surface): The surface representing the labyrinth.
         pathfinding_layer (Surface): The surface representing the pathfinding layer.
         rect (Rect): The rectangle representing the labyrinth.
-        has_changed (bool): Flag indicating if the labyrinth has changed (useful for optimization purposes)
-        walls (list): The list of walls in the labyrinth.
-        start (int): The ID of the start cell. By default, it's the top-left cell.
-        end (int): The ID of the end cell. By default, it's the bottom-right cell.
-        generation_algorithm (str): The algorithm used for generating the labyrinth.
-        resolution_algorithm (str): The algorithm used for solving the labyrinth.
-        looping_factor (float): The factor for randomly removing walls after generation.
-        generation_data (dict): The data for the labyrinth generation process.
-        resolution_data (dict): The data for the labyrinth resolution process.
+        drawn_version (int): The version of the walls drawn on the image, used to only repaint the walls that changed.
+        overlay_state (dict): What has been drawn on the pathfinding layer, used to only repaint the cells that changed.
+        The other attributes are described in the `Maze` class.
 
     """
 
-    def __init__(self, size, generation_algorithm, resolution_algorithm, looping_factor):
+    def __init__(
+        self,
+        size,
+        generation_algorithm,
+        resolution_algorithm,
+        looping_factor,
+        cell_size=LABYRINTH_RESOLUTION,
+        walls=None,
+    ):
         """
         Initializes a new instance of the Labyrinth class.
 
@@ -68,692 +93,424 @@ class Labyrinth(pygame.sprite.Sprite):
         - generation_algorithm (str): The algorithm to use for generating the labyrinth.
         - resolution_algorithm (str): The algorithm to use for resolving the labyrinth.
         - looping_factor (float): The factor for randomly removing walls after generation.
+        - cell_size (int): The size of a cell on the images, in pixels. By default, the images are drawn at a fixed
+          resolution and must be scaled to be displayed. Use `fit_cell_size` to draw them directly at the size they
+          are displayed at, which uses much less memory for big labyrinths.
+        - walls (WallGrid): The walls of an already generated labyrinth, None to start from an empty grid.
         """
-        super().__init__()
+        Maze.__init__(self, size, generation_algorithm, resolution_algorithm, looping_factor, walls)
+        pygame.sprite.Sprite.__init__(self)
 
-        self.width = size[0]
-        self.height = size[1]
-        self.matrix = [[j + i * self.width for j in range(self.width)] for i in range(self.height)]
+        self.cell_size = cell_size
+        self.line_width = max(1, cell_size // 10)  # The width of the walls, relative to the size of the cells
 
         # We want to create two separate surfaces for the labyrinth:
         # - The main labyrinth image, which will contain the walls and cells.
         # - The pathfinding layer, which will contain the pathfinding information
         # This allows for massive optimization, as the pathfinding layer does not change during the generation,
         # and the labyrinth image does not change during the resolution.
-        self.image = pygame.Surface((self.width * LABYRINTH_RESOLUTION, self.height * LABYRINTH_RESOLUTION))
-        self.pathfinding_layer = pygame.Surface(
-            (self.width * LABYRINTH_RESOLUTION, self.height * LABYRINTH_RESOLUTION), pygame.SRCALPHA, 32
-        )
-        self.rect = self.image.get_rect()
-        self.has_changed = True  # Flag indicating if the labyrinth has changed (useful for optimization purposes)
-
-        self.walls = []
-
-        self.start = 0
-        self.end = self.width * self.height - 1
-
-        self.generation_algorithm = generation_algorithm
-        self.resolution_algorithm = resolution_algorithm
-
-        self.looping_factor = looping_factor
-
-        # The generation data contains all the information needed for the generation process.
-        # This includes the current state of the generation, the stack of cells, the visited cells, the walls, etc.
-        # Using a mutable type (dict) allows for easy access and modification of the data without the use of global variables or
-        # multiple return values in functions.
-        # Storing them directly as attributes of the Labyrinth object allows for easy access and modification from other parts of the code,
-        # since the labyrinth object is passed around pretty much everywhere.
-
-        # We start the generation process by setting the current cell to a random cell in the labyrinth.
-        current = random.randint(0, self.width * self.height - 1)
-        self.generation_data = {
-            "is_generated": False,  # Flag indicating if the labyrinth has been generated.
-            "start_time": time.perf_counter(),  # The time when the generation process started.
-            "generation_time": 0,  # The total time taken to generate the labyrinth.
-            "step": 0,  # The current step in the generation process.
-            "action_count": 0,  # The total number of actions taken during the generation process.
-            "stack": [current],  # The stack of cells used during the generation process.
-            "visited": [current],  # The list of visited cells during the generation process.
-            "wall_index": 0,  # The current index of the wall being processed.
-            "perfect_wall_count": 0,  # The total number of walls in a perfect labyrinth.
-        }
-
-        if self.resolution_algorithm == "recursive-backtracking":
-            self.resolution_data = {
-                "is_solved": False,  # Flag indicating if the labyrinth has been solved.
-                "start_time": time.perf_counter(),  # The time when the resolution process started.
-                "resolution_time": 0,  # The total time taken to resolve the labyrinth.
-                "setupDone": False,  # Flag indicating if the resolution process has been set up.
-                "stack": [self.start],  # The stack of cells used during the resolution process.
-                "banned": [],  # The list of banned cells during the resolution process.
-                "visited": [],  # The list of visited cells during the resolution process.
-                "total_move_count": 0,  # The total number of moves taken during the resolution process.
-            }
-        elif self.resolution_algorithm == "a-star":
-            self.resolution_data = {
-                "is_solved": False,  # Flag indicating if the labyrinth has been solved.
-                "start_time": time.perf_counter(),  # The time when the resolution process started.
-                "resolution_time": 0,  # The total time taken to resolve the labyrinth.
-                "setupDone": False,  # Flag indicating if the resolution process has been set up.
-                "openSet": [],  # The set of nodes to be evaluated.
-                "cameFrom": {},  # The map of navigated nodes.
-                "gScore": {},  # The map of cost from start along best known path.
-                "fScore": {},  # The map of estimated total cost from start to goal through y.
-                "path": [],  # The final path from start to end.
-                "current": None,  # The current node being evaluated.
-                "total_move_count": 0,  # The total number of moves taken during the resolution process.
-            }
-
-    def id_to_coord(self, id):
+        # Both surfaces are only allocated the first time they are needed (see the `image` and `pathfinding_layer` properties),
+        # so a labyrinth that is only generated and solved never pays for them.
+        self.image_surface = None
+        self.pathfinding_surface = None
+        self.rect = pygame.Rect(0, 0, self.width * self.cell_size, self.height * self.cell_size)
+        self.drawn_version = None  # The version of the walls drawn on the image, None if nothing has been drawn yet
+        self.overlay_state = None  # What has been drawn on the pathfinding layer, None if nothing has been drawn yet
+
+    @property
+    def image(self):
         """
-        Converts a cell ID to its corresponding coordinates in the labyrinth.
-
-        Parameters:
-        - id (int): The cell ID.
-
-        Returns:
-        - tuple: The coordinates (x, y) of the cell.
+        The surface representing the labyrinth, allocated on first access.
         """
-        return (id % self.width, id // self.width)
+        if self.image_surface is None:
+            self.image_surface = pygame.Surface((self.width * self.cell_size, self.height * self.cell_size))
+        return self.image_surface
 
-    def coord_to_id(self, x, y=None):
+    @property
+    def pathfinding_layer(self):
+        """
+        The surface representing the pathfinding layer, allocated on first access.
         """
-        Converts coordinates to the corresponding cell ID in the labyrinth.
+        if self.pathfinding_surface is None:
+            self.pathfinding_surface = pygame.Surface(
+                (self.width * self.cell_size, self.height * self.cell_size), pygame.SRCALPHA, 32
+            )
+        return self.pathfinding_surface
 
-        Parameters:
-        - x (int or tuple): The x-coordinate or the coordinates (x, y) of the cell.
-        - y (int): The y-coordinate of the cell.
+    def get_image(self):
 
-        Returns:
-        - int: The cell ID.
-        """
-        if y is None:
-            y = x[1]
-            x = x[0]
-        return y * self.width + x
+        # Draw the labyrinth
 
-    def is_adjacent(self, case_1, case_2):
-        """
-        Checks if two cells are adjacent to each other.
+        if not self.has_changed:
+            return self.image
 
-        Parameters:
-        - case_1 (int): The ID of the first cell.
-        - case_2 (int): The ID of the second cell.
+        # If we know which walls changed since the last drawing, we only repaint the cells around them.
+        # Otherwise (first drawing, or walls written in bulk by a generation algorithm), we redraw everything.
+        changes = None if self.drawn_version is None else self.walls.get_changes_since(self.drawn_version)
+        if changes is not None and len(changes) <= INCREMENTAL_REDRAW_LIMIT:
+            for wall in changes:
+                self.redraw_area(wall[0], wall[1])
+        else:
+            self.image.set_clip(None)
+            self.image.fill(BUTTON_COLOR)  # We fill the labyrinth with a color
 
-        Returns:
-        - bool: True if the cells are adjacent, False otherwise.
-        """
-        case_1, case_2 = min(case_1, case_2), max(
-            case_1, case_2
-        )  # Allows for the function to work with unordered arguments
-        return case_1 in self.get_adjacent_cases(case_2)
+            if DRAW_CASE_NUMBERS:  # We want to draw the case numbers
+                for i in range(self.width * self.height):
+                    self.draw_case_number(i)
 
-    def get_adjacent_cases(self, case):
-        """
-        Gets the adjacent cells of a given cell.
+            for wall in self.walls:
+                self.draw_wall(wall[0], wall[1])
 
-        This do not take the walls into account, but allows for easy access to the adjacent cells when processing
-        the cells that are next to the borders of the labyrinth.
+        self.drawn_version = self.walls.version
+        self.has_changed = False  # The labyrinth has been drawn, so we don't need to redraw it
+        return self.image
+
+    def draw_case_number(self, case, surface=None, cell_size=None, origin=(0, 0)):
+        """
+        Draws the ID of a cell on the labyrinth image, or on another surface.
 
         Parameters:
         - case (int): The ID of the cell.
-
-        Returns:
-        - list: A list of adjacent cell IDs.
+        - surface (Surface): The surface to draw on. Defaults to the labyrinth image.
+        - cell_size (int): The size of a cell on that surface, in pixels. Defaults to the cell size of the labyrinth.
+        - origin (tuple): The position of the top-left corner of the surface in the labyrinth, in pixels.
         """
-        adjacent = []
-        if case % self.width != 0:
-            adjacent.append(case - 1)
-        if (case + 1) % self.width != 0:
-            adjacent.append(case + 1)
-        if case >= self.width:
-            adjacent.append(case - self.width)
-        if case < self.width * (self.height - 1):
-            adjacent.append(case + self.width)
-
-        return adjacent
-
-    def add_wall(self, case_1, case_2):
+        surface = self.image if surface is None else surface
+        cell_size = self.cell_size if cell_size is None else cell_size
+        coords = self.id_to_coord(case)
+        text = get_font(FONT_SIZE).render(str(case), 0, (255, 255, 255))
+        surface.blit(text, (coords[0] * cell_size - origin[0], coords[1] * cell_size - origin[1]))
+
+    def draw_wall(self, case_1, case_2, surface=None, cell_size=None, origin=(0, 0)):
         """
-        Adds a wall between two adjacent cells.
+        Draws the wall between two adjacent cells on the labyrinth image, or on another surface.
 
         Parameters:
-        - case_1 (int): The ID of the first cell.
+        - case_1 (int): The ID of the first cell (the upper or leftmost one).
         - case_2 (int): The ID of the second cell.
-
-        Returns:
-        - bool: True if the wall was added successfully, False otherwise.
+        - surface (Surface): The surface to draw on. Defaults to the labyrinth image.
+        - cell_size (int): The size of a cell on that surface, in pixels. Defaults to the cell size of the labyrinth.
+        - origin (tuple): The position of the top-left corner of the surface in the labyrinth, in pixels.
         """
-        if not self.is_adjacent(case_1, case_2):  # We can't add a wall between two non-adjacent cells
-            print(f"Impossible d'ajouter un mur : les cases {case_1} et {case_2} ne sont pas adjacentes.")
-            return False
-        case_1, case_2 = min(case_1, case_2), max(
-            case_1, case_2
-        )  # Allows for the function to work with unordered arguments
-        if (case_1, case_2) not in self.walls:  # We don't want to add the same wall twice
-            self.walls.append((case_1, case_2))
-            self.has_changed = True  # The labyrinth has changed, so we need to redraw it
-            return True
-        return False
-
-    def remove_wall(self, case_1, case_2):
+        surface = self.image if surface is None else surface
+        cell_size = self.cell_size if cell_size is None else cell_size
+        line_width = max(1, cell_size // 10)  # Same as self.line_width for the cell size of the labyrinth
+
+        # Horizontal or vertical wall ?
+        orientation = "V" if abs(case_1 - case_2) == 1 else "H"
+
+        case_1_coords = self.id_to_coord(case_1)
+        x = case_1_coords[0] * cell_size - origin[0]
+        y = case_1_coords[1] * cell_size - origin[1]
+
+        # If the wall is horizontal :
+        if orientation == "H":
+            # We want to draw a horizontal line that starts from the bottom-left corner of case 1 to its bottom-right corner.
+            # The coordinates of the bottom-left corner are x*cell_size, y*cell_size + cell_size
+            # The coordinates of the bottom-right corner are x*cell_size + cell_size, y*cell_size + cell_size
+            pygame.draw.line(surface, (255, 255, 255), (x, y + cell_size), (x + cell_size, y + cell_size), line_width)
+        elif orientation == "V":
+            pygame.draw.line(surface, (255, 255, 255), (x + cell_size, y), (x + cell_size, y + cell_size), line_width)
+
+    def draw_tile(self, surface, area, cell_size):
         """
-        Removes a wall between two adjacent cells.
+        Draws the walls of a rectangle of cells on a surface of the size of that rectangle.
 
-        Parameters:
-        - case_1 (int): The ID of the first cell.
-        - case_2 (int): The ID of the second cell.
+        The walls of the cells right around the rectangle are drawn too, since they can reach into it: the surface
+        then looks exactly like the same area of a labyrinth image drawn with that cell size.
 
-        Returns:
-        - bool: True if the wall was removed successfully, False otherwise.
-        """
-        case_1, case_2 = min(case_1, case_2), max(case_1, case_2)
-        if (case_1, case_2) in self.walls:
-            self.walls.remove((case_1, case_2))
-            self.has_changed = True
-            return True
-        print(f"Il n'y a pas de mur entre les cases {case_1} et {case_2}.")
-        return False
-
-    def fill_with_walls(self):
-        """
-        Fills the labyrinth with walls.
+        Parameters:
+        - surface (Surface): The surface to draw on.
+        - area (Rect): The rectangle of cells, in cells.
+        - cell_size (int): The size of a cell on the surface, in pixels.
         """
-        for i in range(self.width * self.height):  # We iterate over all the cells in the labyrinth
-            if i >= self.width * self.height - 1:
-                continue
-            localIterator = i % self.width  # We calculate the local iterator to know if we are at the end of a line
-            # Horizontal
-            if (i + 1) % self.width > localIterator:
-                self.add_wall(i, i + 1)
-            # Vertical
-            if i + self.width < self.width * self.height:
-                self.add_wall(i, i + self.width)
-
-    def can_move(self, case_1, case_2):
+        origin = (area.x * cell_size, area.y * cell_size)
+        right = self.walls.right
+        bottom = self.walls.bottom
+        surface.fill(BUTTON_COLOR)
+        for y in range(max(0, area.top - 1), min(self.height, area.bottom + 1)):
+            for case in range(
+                y * self.width + max(0, area.left - 1), y * self.width + min(self.width, area.right + 1)
+            ):
+                if DRAW_CASE_NUMBERS:
+                    self.draw_case_number(case, surface, cell_size, origin)
+                if right[case]:
+                    self.draw_wall(case, case + 1, surface, cell_size, origin)
+                if bottom[case]:
+                    self.draw_wall(case, case + self.width, surface, cell_size, origin)
+
+    def redraw_area(self, case_1, case_2):
         """
-        Checks if it is possible to move from one cell to another.
+        Repaints the area of the labyrinth image around the wall between two adjacent cells, whether it exists or not.
 
-        This method takes into account the walls in the labyrinth.
+        The area is the rectangle of the two cells, extended by a line width on each side so that the ends of the
+        neighboring walls are included. Drawing is clipped to that area, then the walls and numbers of every cell around
+        it are drawn again: the pixels outside of the area are left untouched.
 
         Parameters:
-        - case_1 (int): The ID of the first cell.
+        - case_1 (int): The ID of the first cell (the upper or leftmost one).
         - case_2 (int): The ID of the second cell.
-
-        Returns:
-        - bool: True if it is possible to move, False otherwise.
         """
-        case1, case2 = min(case_1, case_2), max(
-            case_1, case_2
-        )  # Allows for the function to work with unordered arguments
-        if not self.is_adjacent(case1, case2):  # We can't move between non-adjacent cells
-            return False
-        if (case1, case2) in self.walls:  # We can't move through walls
-            return False
-        return True
-
-    def generate_step(self):
-        """
-        Performs a step in the labyrinth generation process.
+        x_1, y_1 = self.id_to_coord(case_1)
+        x_2, y_2 = self.id_to_coord(case_2)
+        area = pygame.Rect(
+            x_1 * self.cell_size,
+            y_1 * self.cell_size,
+            (x_2 - x_1 + 1) * self.cell_size,
+            (y_2 - y_1 + 1) * self.cell_size,
+        ).inflate(2 * self.line_width, 2 * self.line_width)
+
+        self.image.set_clip(area)
+        self.image.fill(BUTTON_COLOR)
+        # The walls that can cross the area belong to the two cells or to the cells right around them.
+        for y in range(max(0, y_1 - 1), min(self.height, y_2 + 2)):
+            for x in range(max(0, x_1 - 1), min(self.width, x_2 + 2)):
+                case = self.coord_to_id((x, y))
+                if DRAW_CASE_NUMBERS:
+                    self.draw_case_number(case)
+                if self.walls.right[case]:
+                    self.draw_wall(case, case + 1)
+                if self.walls.bottom[case]:
+                    self.draw_wall(case, case + self.width)
+        self.image.set_clip(None)
 
-        This method allows for the generation process to be performed step by step, which is useful for visualizing the generation process.
-        This involves a pretty big refactoring of both the algorithms themselves, the way they are called, and the way they store and update their data.
-        Since the variables in this function are "cleared" at each call, we need to store the data in the labyrinth object itself.
+    def get_pathfinding_image(self):
+        # Draw the pathfinding layer
 
-        Returns:
-        - bool: True if the generation is complete, False otherwise.
-        """
-        if not self.generation_data["is_generated"]:
-
-            if self.generation_algorithm == "depth-first-search":
-                if (
-                    self.generation_data["step"] == 0
-                ):  # We fill the labyrinth with walls to start the generation process
-                    self.fill_with_walls()
-                    self.generation_data["step"] = 1
-                    print("Première étape terminée : remplissage des murs.")
-                    return False  # We return False to indicate that the generation is not complete, but to keep the process going
-                elif self.generation_data["step"] == 1:  # depth-first-search
-
-                    if len(self.generation_data["stack"]) == 0:  # We have finished the generation process
-                        self.generation_data["step"] = 2  # We move to the next step
-                        self.generation_data["perfect_wall_count"] = len(
-                            self.walls
-                        )  # We store the number of walls for the looping factor
-                        print("Deuxième étape terminée : labyrinthe parfait généré.")
-                        return False
-
-                    else:
-                        # The main part of the algorithm
-                        current = self.generation_data["stack"][
-                            -1
-                        ]  # We get the current cell as the last cell in the stack (FILO)
-                        adjacent_cases = self.get_adjacent_cases(current)
-                        unvisited_adjacent_cases = [
-                            case for case in adjacent_cases if case not in self.generation_data["visited"]
-                        ]  # We don't want to visit the same cell twice
-
-                        if len(unvisited_adjacent_cases) == 0:  # We have reached a dead end : we must backtrack
-                            self.generation_data["stack"].pop()  # We remove the current cell from the stack
-                            return False
-
-                        next_case = random.choice(
-                            unvisited_adjacent_cases
-                        )  # If we can still move, we choose a random adjacent cell
-                        self.remove_wall(
-                            current, next_case
-                        )  # and break the wall between the two cells to create a path
-                        self.generation_data["visited"].append(next_case)  # We mark the cell as visited
-                        self.generation_data["stack"].append(
-                            next_case
-                        )  # We add the cell to the stack (it will be picked as the current cell in the next iteration)
-                        self.generation_data["action_count"] += 1  # We increment the action count for statistics
-
-                elif self.generation_data["step"] == 2:  # looping factor
-
-                    if self.looping_factor != 0:  # We only loop if the factor is not 0
-                        for _ in range(
-                            int(len(self.walls) * self.looping_factor)
-                        ):  # The looping factor is a percentage of the total number of walls to be removed. Incidentally, this is also the number of iterations we will do.
-                            wall = random.choice(self.walls)  # We choose a random wall
-                            self.remove_wall(wall[0], wall[1])  # and remove it
-                            self.generation_data["action_count"] += 1  # We increment the action count for statistics
-                    self.generation_data["is_generated"] = True  # We have finished the generation process
-                    self.generation_data["step"] = 3  # We move to the next step
-                    print("Troisième et dernière étape terminée : murs aléatoires supprimés.")
-
-                    return True
+        if self.generation_data["is_generated"]:
 
+            # The layer is drawn in three passes, in this order: the colored cells, the path, then the crosses on the
+            # banned cells. Only the cells that changed since the last frame are repainted, along with the area around
+            # them (see `repaint_overlay_area`). The whole layer is only redrawn on the first frame of a resolution,
+            # when too many cells changed, or when the range of the A* colors changed (every cell changes color then).
+            dirty = self.get_overlay_changes()
+            if dirty is None or len(dirty) > INCREMENTAL_REDRAW_LIMIT:
+                self.pathfinding_layer.set_clip(None)
+                self.pathfinding_layer.fill((0, 0, 0, 0))  # Clear the surface
+                self.draw_overlay(range(self.width * self.height))
             else:
-                print("L'algorithme de génération n'est pas reconnu.")  # We don't recognize the generation algorithm
-                raise NotImplementedError  # We raise a NotImplementedError to indicate that the algorithm is not implemented
+                for case in dirty:
+                    self.repaint_overlay_area(case)
 
-        self.generation_data["generation_time"] = (
-            time.perf_counter() - self.generation_data["start_time"]
-        )  # We update the generation time. This allows us to keep track of the time taken to generate the labyrinth, independently of the framerate.
+        return self.pathfinding_layer
 
-    def resolve_step(self):
+    def get_overlay_changes(self):
         """
-        Performs a step in the labyrinth resolution process.
+        Brings the overlay state up to date with the resolution, and gets the cells whose overlay changed since the
+        last call.
+
+        The pathfinding layer and the tiles of a camera (see `Camera`) are both drawn from the overlay state, so they
+        use this method to know which cells must be repainted.
+
+        Returns:
+        - set: The IDs of the cells whose area must be repainted, or None if the whole overlay must be repainted.
         """
-        if not self.resolution_data["is_solved"]:
-
-            # We update the resolution time. This allows us to keep track of the time taken to resolve the labyrinth, independently of the framerate.
-            self.resolution_data["resolution_time"] = time.perf_counter() - self.resolution_data["start_time"]
-
-            if self.resolution_algorithm == "a-star":
-
-                def h(case):
-                    # We use the Manhattan distance as the heuristic function
-                    return self.MD(case, self.end)
-
-                def reconstruct_path(cameFrom, current):
-                    # We reconstruct the path from the cameFrom map
-                    totalPath = [current]
-                    while current in cameFrom.keys():
-                        current = cameFrom[current]
-                        totalPath.append(current)
-                    totalPath.reverse()  # We reverse the path to get the correct order
-                    return totalPath
-
-                # Initial setup of the A* algorithm : we set the start time, the openSet, the cameFrom map, the gScore and fScore maps, and the current cell
-
-                if not self.resolution_data["setupDone"]:
-                    self.resolution_data["start_time"] = time.perf_counter()
-                    print("Initialisation de l'algorithme A*...")
-                    self.resolution_data["openSet"] = [self.start]
-                    self.resolution_data["cameFrom"] = {}
-
-                    self.resolution_data["gScore"] = {}
-                    for x in range(self.width * self.height):
-                        self.resolution_data["gScore"][
-                            x
-                        ] = math.inf  # The gScore is initialized to infinity for all cells except the start cell
-                    self.resolution_data["gScore"][self.start] = 0
-                    self.resolution_data["fScore"] = {}
-                    for x in range(self.width * self.height):
-                        self.resolution_data["fScore"][
-                            x
-                        ] = math.inf  # The fScore is initialized to infinity for all cells except the start cell
-                    self.resolution_data["fScore"][self.start] = h(self.start)
-
-                    self.resolution_data["setupDone"] = True  # We have finished the setup
-
-                    print("Initialisation terminée.")
-
-                if len(self.resolution_data["openSet"]) > 0:  # We have cells to evaluate
-                    self.resolution_data["current"] = min(
-                        self.resolution_data["openSet"], key=lambda x: self.resolution_data["fScore"][x]
-                    )  # We get the cell with the lowest fScore
-                    if self.resolution_data["current"] == self.end:  # We have reached the end cell
-                        print("Chemin trouvé.")
-
-                        # Compute the final path
-                        self.resolution_data["path"] = reconstruct_path(
-                            self.resolution_data["cameFrom"], self.resolution_data["current"]
-                        )
-
-                        self.resolution_data["is_solved"] = True  # We have finished the resolution process
-                        return True
-
-                    self.resolution_data["openSet"].remove(
-                        self.resolution_data["current"]
-                    )  # We remove the current cell from the openSet
-                    adjacent = self.get_adjacent_cases(self.resolution_data["current"])  # We get the adjacent cells
-                    adjacent = [
-                        a for a in adjacent if self.can_move(self.resolution_data["current"], a)
-                    ]  # We filter the cells that can be moved to
-                    for neighbor in adjacent:
-                        tentative_gScore = (
-                            self.resolution_data["gScore"][self.resolution_data["current"]] + 1
-                        )  # We increment the gScore by 1
-                        if tentative_gScore < self.resolution_data["gScore"][neighbor]:  # We have found a better path
-                            self.resolution_data["cameFrom"][neighbor] = self.resolution_data[
-                                "current"
-                            ]  # We update the cameFrom map
-                            self.resolution_data["gScore"][neighbor] = tentative_gScore  # We update the gScore
-                            self.resolution_data["fScore"][neighbor] = tentative_gScore + h(
-                                neighbor
-                            )  # We update the fScore
-                            if (
-                                neighbor not in self.resolution_data["openSet"]
-                            ):  # We add the neighbor to the openSet if it's not already there
-                                self.resolution_data["openSet"].append(neighbor)
-
-                    # Compute the path (for visualization purposes)
-                    self.resolution_data["path"] = reconstruct_path(
-                        self.resolution_data["cameFrom"], self.resolution_data["current"]
-                    )
-
-                    self.resolution_data["total_move_count"] += 1  # We increment the move count
-
-                else:  # No path has been found
-                    print("Pas de chemin trouvé.")
-                    # We raise a RuntimeError to indicate that no path has been found
-                    raise RuntimeError("No path found.")
-
-            elif self.resolution_algorithm == "recursive-backtracking":
-
-                if not self.resolution_data["setupDone"]:
-                    self.resolution_data["start_time"] = time.perf_counter()
-                    print("Début de la résolution du labyrinthe par backtracking récursif...")
-                    self.resolution_data["setupDone"] = True
-
-                if self.resolution_data["stack"][-1] == self.end:  # We have reached the end cell
-                    print("Chemin trouvé.")
-                    self.resolution_data["is_solved"] = True
-                    return True
-                else:
-
-                    available = [
-                        i
-                        for i in self.get_adjacent_cases(self.resolution_data["stack"][-1])
-                        if self.can_move(i, self.resolution_data["stack"][-1])
-                        and i not in self.resolution_data["banned"]
-                        and i not in self.resolution_data["visited"]
-                    ]  # We filter the available cells : they must be adjacent, not banned, and not visited
-
-                    if available == []:  # We have reached a dead end : we must backtrack
-                        self.resolution_data["banned"].append(self.resolution_data["stack"].pop())
-
-                    else:  # We can still move
-                        self.resolution_data["stack"].append(
-                            random.choice(available)
-                        )  # We choose a random cell to move to
-                        self.resolution_data["visited"].append(
-                            self.resolution_data["stack"][-1]
-                        )  # We mark the cell as visited
-
-                    self.resolution_data["total_move_count"] += 1  # We increment the move count
-
-                    return False
-            else:
-                print("L'algorithme de résolution n'est pas reconnu.")
-                raise NotImplementedError  # We raise a NotImplementedError to indicate that the algorithm is not implemented
+        overlay = self.overlay_state
+        full_repaint = overlay is None or overlay["data"] is not self.resolution_data
+        if full_repaint:
+            overlay = self.overlay_state = {
+                "data": self.resolution_data,  # The resolution data the layer was drawn from
+                "path": [],  # The path drawn on the layer
+                "position": {},  # The index of each cell of the drawn path
+                "count": 0,  # The number of colored, banned or reached cells already drawn (sweeps for dead-end filling)
+                "range": None,  # The range of fScores used for the colors (A*)
+            }
+
+        dirty = set()  # The cells whose area needs to be repainted
 
-    def MD(self, case1, case2):
+        # The colored cells and the banned cells that appeared since the last frame
+        if self.resolution_algorithm == "recursive-backtracking":
+            dirty.update(self.resolution_data["banned"][overlay["count"] :])
+            overlay["count"] = len(self.resolution_data["banned"])
+        elif self.resolution_algorithm == "dead-end-filling":
+            for filled in self.resolution_data["filled"][overlay["count"] :]:
+                dirty.update(filled.tolist())
+            overlay["count"] = len(self.resolution_data["filled"])
+        elif self.resolution_algorithm == "bidirectional":
+            dirty.update(self.resolution_data["reached"][overlay["count"] :])
+            overlay["count"] = len(self.resolution_data["reached"])
+        elif self.resolution_algorithm == "a-star":
+            dirty.update(self.resolution_data["fScoreChanges"])
+            self.resolution_data["fScoreChanges"].clear()
+            if overlay["range"] != self.resolution_data["fScoreRange"]:
+                overlay["range"] = self.resolution_data["fScoreRange"]
+                full_repaint = True
+
+        # The path segments that were removed or added since the last frame. A cell is pushed on the path at most
+        # once during a resolution, so the drawn path and the current one are the same up to the last common cell.
+        path = self.resolution_data["stack" if self.resolution_algorithm == "recursive-backtracking" else "path"]
+        drawn_path = overlay["path"]
+        position = overlay["position"]
+        common = min(len(drawn_path), len(path))
+        while common > 0 and drawn_path[common - 1] != path[common - 1]:
+            common -= 1
+        if common > 0 and (len(drawn_path) > common or len(path) > common):
+            dirty.add(path[common - 1])  # The segment leaving the last common cell changed
+        for case in drawn_path[common:]:
+            del position[case]
+            dirty.add(case)
+        del drawn_path[common:]
+        for index in range(common, len(path)):
+            position[path[index]] = index
+            drawn_path.append(path[index])
+            dirty.add(path[index])
+
+        return None if full_repaint else dirty
+
+    def get_overlay_color(self, case):
         """
-        Calculates the Manhattan distance between two cells.
+        Gets the color of a cell on the pathfinding layer.
 
         Parameters:
-        - case1 (int or tuple): The ID of the first cell or the coordinates of the first cell.
-        - case2 (int or tuple): The ID of the second cell or the coordinates of the second cell.
+        - case (int): The ID of the cell.
 
         Returns:
-        - int: The Manhattan distance between the two cells.
-
+        - tuple: The RGBA color of the cell, or None if the cell is not colored.
         """
-        if isinstance(case1, int) and isinstance(case2, int):  # Check if the inputs are cell IDs
-            case1 = self.id_to_coord(case1)  # Convert the cell ID to coordinates
-            case2 = self.id_to_coord(case2)  # Convert the cell ID to coordinates
-        return abs(case1[0] - case2[0]) + abs(case1[1] - case2[1])  # Calculate the Manhattan distance
-
-    def resolve_recursive_backtracking(self, start, end):
+        if case == self.start or case == self.end:  # The start and end cells are never colored
+            return None
+
+        if self.resolution_algorithm == "a-star":
+            # We want to color each cell based on its fScore. The cells with an infinite fScore are pointless and would
+            # mess up the color gradient, so they are not colored.
+            fScore = self.resolution_data["fScore"][case] if self.resolution_data["setupDone"] else math.inf
+            if fScore == math.inf:
+                return None
+            # Generate a color based on the fScore of the cell, with an alpha channel to make it semi-transparent
+            return generate_color(*self.overlay_state["range"], fScore) + (100,)
+
+        elif self.resolution_algorithm == "bidirectional":
+            # The cells reached from the end are drawn in orange, the cells reached from the start in blue.
+            if case in self.resolution_data["endCameFrom"]:
+                return (255, 128, 0, 100)
+            if case in self.resolution_data["startCameFrom"]:
+                return (0, 128, 255, 100)
+
+        elif self.resolution_algorithm == "dead-end-filling":
+            # The filled cells are greyed out.
+            filling = self.resolution_data["filling"]
+            if filling is not None and not filling["alive"][case]:
+                return (0, 0, 0, 150)
+
+        return None
+
+    def draw_overlay(self, cases, surface=None, cell_size=None, origin=(0, 0)):
         """
-        Use the recursive backtracking algorithm to find a path from the start cell to the end cell, without storing data for visualization.
-        """
-        stack = [start]
-        banned = []
-        visited = []
-        while stack[-1] != end:
-            available = [
-                i
-                for i in self.get_adjacent_cases(stack[-1])
-                if self.can_move(i, stack[-1]) and i not in banned and i not in visited
-            ]
-            if available == []:
-                banned.append(stack.pop())
-            else:
-                stack.append(random.choice(available))
-                visited.append(stack[-1])
-        return stack
+        Draws the colored cells, the path segments and the banned crosses of some cells on the pathfinding layer, or on
+        another surface.
 
-    def resolve_a_star(self, start, end):
-        """
-        Use the A* algorithm to find a path from the start cell to the end cell, without storing data for visualization.
+        Parameters:
+        - cases (iterable): The IDs of the cells.
+        - surface (Surface): The surface to draw on. Defaults to the pathfinding layer.
+        - cell_size (int): The size of a cell on that surface, in pixels. Defaults to the cell size of the labyrinth.
+        - origin (tuple): The position of the top-left corner of the surface in the labyrinth, in pixels.
         """
-
-        def h(case):
-            return self.MD(case, end)
-
-        def reconstruct_path(cameFrom, current):
-            totalPath = [current]
-            while current in cameFrom.keys():
-                current = cameFrom[current]
-                totalPath.append(current)
-            totalPath.reverse()
-            return totalPath
-
-        openSet = [start]
-        cameFrom = {}
-
-        gScore = {}
-        for x in range(self.width * self.height):
-            gScore[x] = math.inf
-        gScore[start] = 0
-        fScore = {}
-        for x in range(self.width * self.height):
-            fScore[x] = math.inf
-        fScore[start] = h(start)
-
-        while len(openSet) > 0:
-            current = min(openSet, key=lambda x: fScore[x])
-            if current == end:
-                path = reconstruct_path(cameFrom, current)
-                return path
-
-            openSet.remove(current)
-            adjacent = self.get_adjacent_cases(current)
-            adjacent = [a for a in adjacent if self.can_move(current, a)]
-            for neighbor in adjacent:
-                tentative_gScore = gScore[current] + 1
-                if tentative_gScore < gScore[neighbor]:
-                    cameFrom[neighbor] = current
-                    gScore[neighbor] = tentative_gScore
-                    fScore[neighbor] = tentative_gScore + h(neighbor)
-                    if neighbor not in openSet:
-                        openSet.append(neighbor)
-
-        return False
-
-    def get_image(self):
-
-        # Draw the labyrinth
-
-        if not self.has_changed:
-            return self.image
-
-        self.image.fill(BUTTON_COLOR)  # We fill the labyrinth with a color
-
-        if DRAW_CASE_NUMBERS:  # We want to draw the case numbers
-            for i in range(self.width * self.height):
-                coords = self.id_to_coord(i)
-                text = font.render(str(i), 0, (255, 255, 255))
-                self.image.blit(text, (coords[0] * LABYRINTH_RESOLUTION, coords[1] * LABYRINTH_RESOLUTION))
-
-        for wall in self.walls:
-            # Horizontal or vertical wall ?
-            orientation = "V" if abs(wall[0] - wall[1]) == 1 else "H"
-
-            case_1_coords = self.id_to_coord(wall[0])
-
-            # If the wall is horizontal :
-            if orientation == "H":
-                # We want to draw a horizontal line that starts from the bottom-left corner of case 1 to its bottom-right corner.
-                # The coordinates of the bottom-left corner are x*LABYRINTH_RESOLUTION, y*LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION
-                # The coordinates of the bottom-right corner are x*LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION, y*LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION
-                pygame.draw.line(
-                    self.image,
-                    (255, 255, 255),
+        cases = list(cases)
+        layer = self.pathfinding_layer if surface is None else surface
+        cell_size = self.cell_size if cell_size is None else cell_size
+        line_width = max(1, cell_size // 10)
+
+        for case in cases:
+            color = self.get_overlay_color(case)
+            if color is not None:
+                coords = self.id_to_coord(case)
+                pygame.draw.rect(
+                    layer,
+                    color,
                     (
-                        case_1_coords[0] * LABYRINTH_RESOLUTION,
-                        case_1_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
+                        coords[0] * cell_size - origin[0],
+                        coords[1] * cell_size - origin[1],
+                        cell_size,
+                        cell_size,
                     ),
-                    (
-                        case_1_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                        case_1_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                    ),
-                    LINE_WIDTH,
                 )
-            elif orientation == "V":
-                pygame.draw.line(
-                    self.image,
-                    (255, 255, 255),
-                    (
-                        case_1_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                        case_1_coords[1] * LABYRINTH_RESOLUTION,
-                    ),
-                    (
-                        case_1_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                        case_1_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                    ),
-                    LINE_WIDTH,
+
+        # We want to draw a line between each cell in the path and the next one.
+        path = self.overlay_state["path"]
+        position = self.overlay_state["position"]
+        for case in cases:
+            index = position.get(case)
+            if index is None or index == len(path) - 1:
+                continue
+            case_1_coords = self.id_to_coord(case)
+            case_2_coords = self.id_to_coord(path[index + 1])
+            pygame.draw.line(
+                layer,
+                (0, 255, 0),
+                (
+                    case_1_coords[0] * cell_size + cell_size // 2 - origin[0],
+                    case_1_coords[1] * cell_size + cell_size // 2 - origin[1],
+                ),
+                (
+                    case_2_coords[0] * cell_size + cell_size // 2 - origin[0],
+                    case_2_coords[1] * cell_size + cell_size // 2 - origin[1],
+                ),
+                line_width,
+            )
+
+        # We want to draw a cross on each banned cell (recursive backtracking).
+        if self.resolution_algorithm == "recursive-backtracking" and self.resolution_data["state"] is not None:
+            state = self.resolution_data["state"]
+            for case in cases:
+                if state[case] != CELL_BANNED:
+                    continue
+                coords = self.id_to_coord(case)
+                top_right = (
+                    coords[0] * cell_size + cell_size - origin[0],
+                    coords[1] * cell_size - origin[1],
+                )
+                bottom_left = (
+                    coords[0] * cell_size - origin[0],
+                    coords[1] * cell_size + cell_size - origin[1],
                 )
 
-        self.has_changed = False  # The labyrinth has been drawn, so we don't need to redraw it
-        return self.image
+                pygame.draw.line(layer, (255, 0, 0), top_right, bottom_left, line_width)
 
-    def get_pathfinding_image(self):
-        # Draw the pathfinding layer
+    def repaint_overlay_area(self, case):
+        """
+        Repaints the area of the pathfinding layer around a cell.
 
-        if self.generation_data["is_generated"]:
+        The area is the cell, extended by a line width on each side. Drawing is clipped to that area, then the cell and
+        the cells around it are drawn again: the path segments and the crosses of the neighboring cells may cross it.
+        The segments between cells outside of that neighborhood never reach the area.
+
+        Parameters:
+        - case (int): The ID of the cell.
+        """
+        x, y = self.id_to_coord(case)
+        area = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size).inflate(
+            2 * self.line_width, 2 * self.line_width
+        )
 
-            # Clear the surface
-            self.pathfinding_layer.fill((0, 0, 0, 0))
-
-            if self.resolution_algorithm == "recursive-backtracking":
-
-                # We want to draw a line between each cell in the path, and a cross the banned cells.
-
-                path = self.resolution_data["stack"]
-                banned = self.resolution_data["banned"]
-
-                for index, case in enumerate(path):
-                    if index == 0:  # We don't want to draw a line between the first cell and the cell before it
-                        continue
-                    case_1_coords = self.id_to_coord(path[index - 1])
-                    case_2_coords = self.id_to_coord(case)
-                    pygame.draw.line(
-                        self.pathfinding_layer,
-                        (0, 255, 0),
-                        (
-                            case_1_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                            case_1_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                        ),
-                        (
-                            case_2_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                            case_2_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                        ),
-                        LINE_WIDTH,
-                    )
-
-                for case in banned:  # We want to draw a cross on each banned cell
-                    coords = self.id_to_coord(case)
-                    top_right = (
-                        coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                        coords[1] * LABYRINTH_RESOLUTION,
-                    )
-                    bottom_left = (
-                        coords[0] * LABYRINTH_RESOLUTION,
-                        coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION,
-                    )
-
-                    pygame.draw.line(self.pathfinding_layer, (255, 0, 0), top_right, bottom_left, LINE_WIDTH)
-
-            elif self.resolution_algorithm == "a-star":
-
-                # We want to draw a line between each cell in the path, and color each cell based on its fScore.
-
-                if self.resolution_data["setupDone"]:  # We only want to draw the path if the setup has been done
-                    finite_fScores = [
-                        self.resolution_data["fScore"][x]
-                        for x in self.resolution_data["fScore"]
-                        if self.resolution_data["fScore"][x] != math.inf
-                    ]  # We only want to draw the cells with a finite fScore, because the other are pointless and would mess up the color gradient
-                    min_fScore = min(
-                        finite_fScores
-                    )  # We need the minimum and maximum fScores to generate the color gradient
-                    max_fScore = max(finite_fScores)
-
-                    for case in range(self.width * self.height):
-                        # We don't want to draw the start and end cells, or cells with an infinite fScore
-                        if case == self.start or case == self.end or self.resolution_data["fScore"][case] == math.inf:
-                            continue
-                        coords = self.id_to_coord(case)
-                        # Generate a color based on the fScore of the cell
-                        color = generate_color(min_fScore, max_fScore, self.resolution_data["fScore"][case])
-                        # Draw a colored, semi-transparent rectangle on the cell
-                        pygame.draw.rect(
-                            self.pathfinding_layer,
-                            color + (100,),  # We add an alpha channel to make the color semi-transparent
-                            (
-                                coords[0] * LABYRINTH_RESOLUTION,
-                                coords[1] * LABYRINTH_RESOLUTION,
-                                LABYRINTH_RESOLUTION,
-                                LABYRINTH_RESOLUTION,
-                            ),
-                        )
-
-                path = self.resolution_data["path"]  # We get the path from the data
-
-                # This is the same as the recursive backtracking algorithm
-                for index, case in enumerate(path):
-                    if index == 0:
-                        continue
-                    case_1_coords = self.id_to_coord(path[index - 1])
-                    case_2_coords = self.id_to_coord(case)
-                    pygame.draw.line(
-                        self.pathfinding_layer,
-                        (0, 255, 0),
-                        (
-                            case_1_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                            case_1_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                        ),
-                        (
-                            case_2_coords[0] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                            case_2_coords[1] * LABYRINTH_RESOLUTION + LABYRINTH_RESOLUTION // 2,
-                        ),
-                        LINE_WIDTH,
-                    )
+        self.pathfinding_layer.set_clip(area)
+        self.pathfinding_layer.fill((0, 0, 0, 0))
+        # The segments ending in the neighborhood are drawn from the cell before them, which may be one cell further.
+        neighborhood = [
+            self.coord_to_id((nx, ny))
+            for ny in range(max(0, y - 2), min(self.height, y + 3))
+            for nx in range(max(0, x - 2), min(self.width, x + 3))
+        ]
+        self.draw_overlay(neighborhood)
+        self.pathfinding_layer.set_clip(None)
+
+    def draw_overlay_tile(self, surface, area, cell_size):
+        """
+        Draws the pathfinding overlay of a rectangle of cells on a transparent surface of the size of that rectangle.
 
-        return self.pathfinding_layer
+        As in `repaint_overlay_area`, the cells up to two cells around the rectangle are drawn too, since their path
+        segments and crosses can reach into it.
+
+        Parameters:
+        - surface (Surface): The surface to draw on, with an alpha channel.
+        - area (Rect): The rectangle of cells, in cells.
+        - cell_size (int): The size of a cell on the surface, in pixels.
+        """
+        surface.fill((0, 0, 0, 0))
+        if self.overlay_state is None:  # Nothing to draw before the resolution starts
+            return
+        cases = [
+            y * self.width + x
+            for y in range(max(0, area.top - 2), min(self.height, area.bottom + 2))
+            for x in range(max(0, area.left - 2), min(self.width, area.right + 2))
+        ]
+        self.draw_overlay(cases, surface, cell_size, (area.x * cell_size, area.y * cell_size))
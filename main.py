@@ -15,17 +15,27 @@ def main():
 
     menu = Menu()  # Create the main menu object.
 
+    resolution = str(screen.get_width()) + "x" + str(screen.get_height())
+    caption = None
+
     running = True
     while running:
         running = menu.update(clock)  # Update the main menu and check if the game should continue running.
 
-        screen.fill(constants.BG_COLOR)  # Fill the screen with the background color.
-        menu.draw()  # Draw the main menu on the screen.
-        pygame.display.flip()  # Update the display.
+        # Draw the main menu on the screen. Only the areas that changed are copied to the window, unless the whole
+        # screen was drawn again (when the current menu screen changes).
+        rects = menu.draw()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
 
-        # Display the resolution and the number of frames per second in the window title.
-        resolution = str(screen.get_width()) + "x" + str(screen.get_height())
-        pygame.display.set_caption(f"Labyrinthe - {resolution} - {int(clock.get_fps())} FPS")
+        # Display the resolution and the number of frames per second in the window title, when they change.
+        new_caption = f"Labyrinthe - {resolution} - {int(clock.get_fps())} FPS"
+        if new_caption != caption:
+            pygame.display.set_caption(new_caption)
+            caption = new_caption
 
 
-main()  # Run the main function to start the game.
+if __name__ == "__main__":
+    main()  # Run the main function to start the game.
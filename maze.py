@@ -0,0 +1,1555 @@
+import time
+import random
+from walls import WallGrid
+from disjointset import DisjointSet
+from junctiongraph import JunctionGraph
+from mazefile import write_maze, read_maze
+import math
+import heapq
+
+# The generation algorithms implemented by the Maze class, in the order they are cycled through in the menus.
+GENERATION_ALGORITHMS = ["depth-first-search", "kruskal", "prim"]
+
+# The resolution algorithms implemented by the Maze class, in the order they are cycled through in the menus.
+RESOLUTION_ALGORITHMS = ["recursive-backtracking", "a-star", "bidirectional", "dead-end-filling"]
+
+# The states of a cell during the recursive backtracking resolution. A cell is visited from the moment it is pushed on
+# the stack, and banned once it has been popped from it (every path through it leads to a dead end).
+CELL_UNVISITED = 0
+CELL_VISITED = 1
+CELL_BANNED = 2
+
+
+class Maze:
+    """
+    Represents the model of a labyrinth: its walls, and the state of its generation and resolution.
+
+    This class does not depend on pygame, so labyrinths can be generated and solved in scripts and worker processes
+    without loading SDL or the fonts of the game. Importing it only loads the standard library: numpy is imported by the
+    few methods that use it. The `Labyrinth` class adds the drawing methods used by the game on top of it.
+
+    Attributes:
+        width (int): The width of the labyrinth in cells.
+        height (int): The height of the labyrinth in cells.
+        matrix (list): The matrix representation of the labyrinth.
+        has_changed (bool): Flag indicating if the labyrinth has changed (useful for optimization purposes)
+        walls (WallGrid): The walls of the labyrinth, stored as two byte planes indexed by cell ID.
+        start (int): The ID of the start cell. By default, it's the top-left cell.
+        end (int): The ID of the end cell. By default, it's the bottom-right cell.
+        generation_algorithm (str): The algorithm used for generating the labyrinth.
+        resolution_algorithm (str): The algorithm used for solving the labyrinth.
+        looping_factor (float): The factor for randomly removing walls after generation.
+        seed (int): The seed of the random generator the labyrinth was generated with, None if unknown.
+        generation_data (dict): The data for the labyrinth generation process.
+        resolution_data (dict): The data for the labyrinth resolution process.
+
+    """
+
+    def __init__(self, size, generation_algorithm, resolution_algorithm, looping_factor, walls=None):
+        """
+        Initializes a new instance of the Maze class.
+
+        Parameters:
+        - size (tuple): The size of the labyrinth (width, height).
+        - generation_algorithm (str): The algorithm to use for generating the labyrinth.
+        - resolution_algorithm (str): The algorithm to use for resolving the labyrinth.
+        - looping_factor (float): The factor for randomly removing walls after generation.
+        - walls (WallGrid): The walls of an already generated labyrinth, None to start from an empty grid. The memory
+          used by the generation is then not allocated (see `from_walls`).
+        """
+        self.width = size[0]
+        self.height = size[1]
+        self.has_changed = True  # Flag indicating if the labyrinth has changed (useful for optimization purposes)
+
+        # The walls are stored in two byte planes (right walls and bottom walls) indexed by cell ID.
+        # This makes checking, adding and removing a wall a constant time operation.
+        self.walls = WallGrid(self.width, self.height) if walls is None else walls
+
+        self.search_arrays = None  # The arrays reused by resolve_a_star, allocated on its first call
+        self.junction_graph = None  # The corridor-contracted graph of the labyrinth, built on demand
+
+        self.start = 0
+        self.end = self.width * self.height - 1
+
+        self.generation_algorithm = generation_algorithm
+        self.resolution_algorithm = resolution_algorithm
+
+        self.looping_factor = looping_factor
+        self.seed = (
+            None  # The seed of the random generator the labyrinth was generated with, if known (see `generate`)
+        )
+
+        # The generation data contains all the information needed for the generation process.
+        # This includes the current state of the generation, the stack of cells, the visited cells, the walls, etc.
+        # Using a mutable type (dict) allows for easy access and modification of the data without the use of global variables or
+        # multiple return values in functions.
+        # Storing them directly as attributes of the Labyrinth object allows for easy access and modification from other parts of the code,
+        # since the labyrinth object is passed around pretty much everywhere.
+
+        # We start the generation process by setting the current cell to a random cell in the labyrinth.
+        current = random.randint(0, self.width * self.height - 1)
+        visited = None
+        if walls is None:  # The bitmap is only needed to generate the labyrinth
+            visited = bytearray(self.width * self.height)
+            visited[current] = 1
+        self.generation_data = {
+            "is_generated": False,  # Flag indicating if the labyrinth has been generated.
+            "start_time": time.perf_counter(),  # The time when the generation process started.
+            "generation_time": 0,  # The total time taken to generate the labyrinth.
+            "algorithm_time": 0,  # The time spent in the generation steps only, without the time between the frames.
+            "step": 0,  # The current step in the generation process.
+            "action_count": 0,  # The total number of actions taken during the generation process.
+            "stack": [current],  # The stack of cells used during the generation process.
+            "visited": visited,  # The bitmap of visited cells during the generation process (1 if visited).
+            "origin": current,  # The cell where the generation process starts (used by Prim's algorithm).
+            "wall_index": 0,  # The current index of the wall being processed.
+            "perfect_wall_count": 0,  # The total number of walls in a perfect labyrinth.
+        }
+
+        self.reset_resolution_data()
+
+    def reset_resolution_data(self):
+        """
+        Resets the resolution data, for the resolution algorithm, start and end cells of the labyrinth.
+
+        It must be called again when the start or end cell changes before the resolution starts, since the recursive
+        backtracking starts its stack from the start cell.
+        """
+        if self.resolution_algorithm == "recursive-backtracking":
+            self.resolution_data = {
+                "is_solved": False,  # Flag indicating if the labyrinth has been solved.
+                "start_time": time.perf_counter(),  # The time when the resolution process started.
+                "resolution_time": 0,  # The total time taken to resolve the labyrinth.
+                "algorithm_time": 0,  # The time spent in the resolution steps only, without the time between the frames.
+                "setupDone": False,  # Flag indicating if the resolution process has been set up.
+                "stack": [self.start],  # The stack of cells used during the resolution process.
+                "banned": [],  # The list of banned cells during the resolution process.
+                "visited": [],  # The list of visited cells during the resolution process.
+                "state": None,  # The state of each cell (see CELL_UNVISITED, CELL_VISITED and CELL_BANNED).
+                "total_move_count": 0,  # The total number of moves taken during the resolution process.
+            }
+        elif self.resolution_algorithm == "a-star":
+            self.resolution_data = {
+                "is_solved": False,  # Flag indicating if the labyrinth has been solved.
+                "start_time": time.perf_counter(),  # The time when the resolution process started.
+                "resolution_time": 0,  # The total time taken to resolve the labyrinth.
+                "algorithm_time": 0,  # The time spent in the resolution steps only, without the time between the frames.
+                "setupDone": False,  # Flag indicating if the resolution process has been set up.
+                "openSet": [],  # The binary heap of nodes to be evaluated.
+                "inOpenSet": bytearray(),  # The bitmap of nodes in the openSet.
+                "openSetOrder": [],  # The insertion rank of each node in the openSet, to break ties.
+                "insertionCount": 0,  # The number of insertions in the openSet.
+                "cameFrom": {},  # The map of navigated nodes.
+                "gScore": [],  # The array of cost from start along best known path.
+                "fScore": [],  # The array of estimated total cost from start to goal through y.
+                "fScoreCounts": {},  # The number of cells with each finite fScore, to keep track of the range.
+                "fScoreRange": (0, 0),  # The minimum and maximum finite fScores, kept up to date as scores change.
+                "fScoreChanges": [],  # The cells whose fScore changed since the overlay was last drawn.
+                "path": [],  # The final path from start to end.
+                "current": None,  # The current node being evaluated.
+                "total_move_count": 0,  # The total number of moves taken during the resolution process.
+            }
+        elif self.resolution_algorithm == "bidirectional":
+            self.resolution_data = {
+                "is_solved": False,  # Flag indicating if the labyrinth has been solved.
+                "start_time": time.perf_counter(),  # The time when the resolution process started.
+                "resolution_time": 0,  # The total time taken to resolve the labyrinth.
+                "algorithm_time": 0,  # The time spent in the resolution steps only, without the time between the frames.
+                "setupDone": False,  # Flag indicating if the resolution process has been set up.
+                "startFrontier": [],  # The last layer of cells reached from the start cell.
+                "endFrontier": [],  # The last layer of cells reached from the end cell.
+                "startCameFrom": {},  # The map of navigated nodes from the start cell, in the order they were reached.
+                "endCameFrom": {},  # The map of navigated nodes from the end cell, in the order they were reached.
+                "reached": [],  # The cells reached from either side, in order, so the overlay only draws the new ones.
+                "startDistance": {},  # The distance of each node reached from the start cell.
+                "endDistance": {},  # The distance of each node reached from the end cell.
+                "path": [],  # The final path from start to end.
+                "total_move_count": 0,  # The total number of moves taken during the resolution process.
+            }
+        elif self.resolution_algorithm == "dead-end-filling":
+            self.resolution_data = {
+                "is_solved": False,  # Flag indicating if the labyrinth has been solved.
+                "start_time": time.perf_counter(),  # The time when the resolution process started.
+                "resolution_time": 0,  # The total time taken to resolve the labyrinth.
+                "algorithm_time": 0,  # The time spent in the resolution steps only, without the time between the frames.
+                "setupDone": False,  # Flag indicating if the resolution process has been set up.
+                "filling": None,  # The arrays of the dead-end filling (see setup_dead_end_filling).
+                "filled": [],  # The arrays of cells filled at each sweep.
+                "filled_count": 0,  # The total number of filled cells.
+                "path": [],  # The final path from start to end.
+                "total_move_count": 0,  # The total number of sweeps done during the resolution process.
+            }
+
+    @property
+    def matrix(self):
+        """
+        The matrix representation of the labyrinth (the ID of each cell, line by line).
+
+        It is computed on demand rather than stored, since nothing needs it during the generation or the resolution.
+        """
+        return [[j + i * self.width for j in range(self.width)] for i in range(self.height)]
+
+    @classmethod
+    def from_walls(cls, walls, generation_algorithm, resolution_algorithm, looping_factor=0, **options):
+        """
+        Creates an already generated labyrinth from an existing wall grid.
+
+        This is used to load labyrinths that were generated elsewhere (streamed to disk, for example) for solving or display.
+
+        Parameters:
+        - walls (WallGrid): The walls of the labyrinth. Its size gives the size of the labyrinth.
+        - generation_algorithm (str): The algorithm that was used to generate the walls.
+        - resolution_algorithm (str): The algorithm to use for resolving the labyrinth.
+        - looping_factor (float): The looping factor that was used to generate the walls.
+        - options: The other arguments of the constructor of the class (`cell_size` for a `Labyrinth`).
+
+        Returns:
+        - Maze: The labyrinth, of the class this method is called on, marked as generated.
+        """
+        labyrinth = cls(
+            (walls.width, walls.height),
+            generation_algorithm,
+            resolution_algorithm,
+            looping_factor,
+            walls=walls,
+            **options,
+        )
+        labyrinth.generation_data["is_generated"] = True
+        labyrinth.generation_data["step"] = 3
+        labyrinth.generation_data["stack"] = []
+        labyrinth.generation_data["perfect_wall_count"] = len(walls)
+        labyrinth.has_changed = True
+        return labyrinth
+
+    def save(self, path):
+        """
+        Saves the labyrinth to a file, with its walls packed at 2 bits per cell (see `mazefile.py`).
+
+        The walls, the start and end cells, the seed (if known), the algorithms and the looping factor are saved, but not
+        the state of the resolution. The labyrinth must be generated first.
+
+        Parameters:
+        - path (str): The path of the file.
+
+        Raises:
+        - ValueError: If the labyrinth has not been generated.
+        """
+        if not self.generation_data["is_generated"]:
+            raise ValueError("The labyrinth must be generated before it is saved.")
+        write_maze(path, self)
+
+    @classmethod
+    def load(cls, path, lazy=True, **options):
+        """
+        Loads a labyrinth saved with `save`.
+
+        By default, the walls are not read from the file: they are read from a memory map of the file when they are
+        accessed, so loading a labyrinth takes the same time whatever its size. Accessing each wall is slower, though.
+
+        Parameters:
+        - path (str): The path of the file.
+        - lazy (bool): Whether to read the walls from the file when they are accessed, or to load them all at once.
+        - options: The other arguments of the constructor of the class (`cell_size` for a `Labyrinth`).
+
+        Returns:
+        - Maze: The labyrinth, of the class this method is called on, marked as generated.
+
+        Raises:
+        - ValueError: If the file is not a labyrinth file.
+        """
+        header, walls = read_maze(path, lazy)
+        labyrinth = cls.from_walls(
+            walls, header["generation_algorithm"], header["resolution_algorithm"], header["looping_factor"], **options
+        )
+        labyrinth.start = header["start"]
+        labyrinth.end = header["end"]
+        labyrinth.seed = header["seed"]
+        labyrinth.reset_resolution_data()  # The resolution starts from the saved start cell
+        return labyrinth
+
+    def id_to_coord(self, id):
+        """
+        Converts a cell ID to its corresponding coordinates in the labyrinth.
+
+        Parameters:
+        - id (int): The cell ID.
+
+        Returns:
+        - tuple: The coordinates (x, y) of the cell.
+        """
+        return (id % self.width, id // self.width)
+
+    def coord_to_id(self, x, y=None):
+        """
+        Converts coordinates to the corresponding cell ID in the labyrinth.
+
+        Parameters:
+        - x (int or tuple): The x-coordinate or the coordinates (x, y) of the cell.
+        - y (int): The y-coordinate of the cell.
+
+        Returns:
+        - int: The cell ID.
+        """
+        if y is None:
+            y = x[1]
+            x = x[0]
+        return y * self.width + x
+
+    def is_adjacent(self, case_1, case_2):
+        """
+        Checks if two cells are adjacent to each other.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+
+        Returns:
+        - bool: True if the cells are adjacent, False otherwise.
+        """
+        # Two cells are adjacent if there is a slot for a wall between them in the wall grid.
+        # This works with unordered arguments and is much cheaper than building the list of adjacent cells.
+        return self.walls.locate(case_1, case_2) is not None
+
+    def get_adjacent_cases(self, case):
+        """
+        Gets the adjacent cells of a given cell.
+
+        This do not take the walls into account, but allows for easy access to the adjacent cells when processing
+        the cells that are next to the borders of the labyrinth.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - list: A list of adjacent cell IDs.
+        """
+        adjacent = []
+        if case % self.width != 0:
+            adjacent.append(case - 1)
+        if (case + 1) % self.width != 0:
+            adjacent.append(case + 1)
+        if case >= self.width:
+            adjacent.append(case - self.width)
+        if case < self.width * (self.height - 1):
+            adjacent.append(case + self.width)
+
+        return adjacent
+
+    def get_accessible_cases(self, case):
+        """
+        Gets the adjacent cells of a given cell that can be moved to.
+
+        This is the same as filtering `get_adjacent_cases` with `can_move`, in the same order, but the walls are read directly
+        from the wall grid.
+
+        Parameters:
+        - case (int): The ID of the cell.
+
+        Returns:
+        - list: A list of accessible cell IDs.
+        """
+        width = self.width
+        x = case % width
+        accessible = []
+        if x != 0 and not self.walls.right[case - 1]:
+            accessible.append(case - 1)
+        if x != width - 1 and not self.walls.right[case]:
+            accessible.append(case + 1)
+        if case >= width and not self.walls.bottom[case - width]:
+            accessible.append(case - width)
+        if case < width * (self.height - 1) and not self.walls.bottom[case]:
+            accessible.append(case + width)
+        return accessible
+
+    def add_wall(self, case_1, case_2):
+        """
+        Adds a wall between two adjacent cells.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+
+        Returns:
+        - bool: True if the wall was added successfully, False otherwise.
+        """
+        if not self.is_adjacent(case_1, case_2):  # We can't add a wall between two non-adjacent cells
+            print(f"Impossible d'ajouter un mur : les cases {case_1} et {case_2} ne sont pas adjacentes.")
+            return False
+        if self.walls.add(case_1, case_2):  # The wall grid does not add the same wall twice
+            self.has_changed = True  # The labyrinth has changed, so we need to redraw it
+            return True
+        return False
+
+    def remove_wall(self, case_1, case_2):
+        """
+        Removes a wall between two adjacent cells.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+
+        Returns:
+        - bool: True if the wall was removed successfully, False otherwise.
+        """
+        case_1, case_2 = min(case_1, case_2), max(case_1, case_2)
+        if self.walls.remove(case_1, case_2):
+            self.has_changed = True
+            return True
+        print(f"Il n'y a pas de mur entre les cases {case_1} et {case_2}.")
+        return False
+
+    def fill_with_walls(self):
+        """
+        Fills the labyrinth with walls.
+
+        The wall grid fills both of its planes at once, which is much faster than adding the walls one by one.
+        """
+        self.walls.fill()
+        self.has_changed = True
+
+    def can_move(self, case_1, case_2):
+        """
+        Checks if it is possible to move from one cell to another.
+
+        This method takes into account the walls in the labyrinth.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+
+        Returns:
+        - bool: True if it is possible to move, False otherwise.
+        """
+        location = self.walls.locate(case_1, case_2)  # Works with unordered arguments
+        if location is None:  # We can't move between non-adjacent cells
+            return False
+        plane, index = location
+        return plane[index] == 0  # We can't move through walls
+
+    def generate_step(self):
+        """
+        Performs a step in the labyrinth generation process.
+
+        This method allows for the generation process to be performed step by step, which is useful for visualizing the generation process.
+        This involves a pretty big refactoring of both the algorithms themselves, the way they are called, and the way they store and update their data.
+        Since the variables in this function are "cleared" at each call, we need to store the data in the labyrinth object itself.
+
+        Returns:
+        - bool: True if the generation is complete, False otherwise.
+        """
+        if not self.generation_data["is_generated"]:
+
+            if self.generation_algorithm not in GENERATION_ALGORITHMS:
+                print("L'algorithme de génération n'est pas reconnu.")  # We don't recognize the generation algorithm
+                raise NotImplementedError  # We raise a NotImplementedError to indicate that the algorithm is not implemented
+
+            if self.generation_data["step"] == 0:  # We fill the labyrinth with walls to start the generation process
+                self.fill_with_walls()
+                self.setup_generation()
+                self.generation_data["step"] = 1
+                print("Première étape terminée : remplissage des murs.")
+                return False  # We return False to indicate that the generation is not complete, but to keep the process going
+
+            elif self.generation_data["step"] == 1:  # The actual generation algorithm
+
+                if self.generation_algorithm == "depth-first-search":
+
+                    if len(self.generation_data["stack"]) == 0:  # We have finished the generation process
+                        self.generation_data["step"] = 2  # We move to the next step
+                        self.generation_data["perfect_wall_count"] = len(
+                            self.walls
+                        )  # We store the number of walls for the looping factor
+                        print("Deuxième étape terminée : labyrinthe parfait généré.")
+                        return False
+
+                    else:
+                        # The main part of the algorithm
+                        current = self.generation_data["stack"][
+                            -1
+                        ]  # We get the current cell as the last cell in the stack (FILO)
+                        adjacent_cases = self.get_adjacent_cases(current)
+                        unvisited_adjacent_cases = [
+                            case for case in adjacent_cases if not self.generation_data["visited"][case]
+                        ]  # We don't want to visit the same cell twice
+
+                        if len(unvisited_adjacent_cases) == 0:  # We have reached a dead end : we must backtrack
+                            self.generation_data["stack"].pop()  # We remove the current cell from the stack
+                            return False
+
+                        next_case = random.choice(
+                            unvisited_adjacent_cases
+                        )  # If we can still move, we choose a random adjacent cell
+                        self.remove_wall(
+                            current, next_case
+                        )  # and break the wall between the two cells to create a path
+                        self.generation_data["visited"][next_case] = 1  # We mark the cell as visited
+                        self.generation_data["stack"].append(
+                            next_case
+                        )  # We add the cell to the stack (it will be picked as the current cell in the next iteration)
+                        self.generation_data["action_count"] += 1  # We increment the action count for statistics
+
+                else:
+                    # Kruskal's and Prim's algorithms are written so that they can stop after a given number of broken walls.
+                    # A step breaks a single wall, which is what we want to display.
+                    if self.generation_algorithm == "kruskal":
+                        is_done = self.generate_kruskal(1)
+                    else:
+                        is_done = self.generate_prim(1)
+
+                    if is_done:
+                        self.generation_data["step"] = 2
+                        self.generation_data["perfect_wall_count"] = len(self.walls)
+                        print("Deuxième étape terminée : labyrinthe parfait généré.")
+                        return False
+
+            elif self.generation_data["step"] == 2:  # looping factor
+
+                self.remove_random_walls()
+                self.generation_data["is_generated"] = True  # We have finished the generation process
+                self.generation_data["step"] = 3  # We move to the next step
+                print("Troisième et dernière étape terminée : murs aléatoires supprimés.")
+
+                return True
+
+        self.generation_data["generation_time"] = (
+            time.perf_counter() - self.generation_data["start_time"]
+        )  # We update the generation time. This allows us to keep track of the time taken to generate the labyrinth, independently of the framerate.
+
+    def remove_random_walls(self):
+        """
+        Removes random walls from the labyrinth, according to the looping factor.
+
+        This is the last step of the generation process, shared by `generate_step` and `generate`.
+        """
+        if self.looping_factor != 0:  # We only loop if the factor is not 0
+            # The looping factor is a percentage of the total number of walls to be removed.
+            # Picking a random wall and removing it, over and over, is the same as sampling distinct walls
+            # from the list of walls : we only build that list once instead of once per removed wall.
+            for wall in random.sample(list(self.walls), int(len(self.walls) * self.looping_factor)):
+                self.remove_wall(wall[0], wall[1])
+                self.generation_data["action_count"] += 1  # We increment the action count for statistics
+
+    def generate(self, seed=None):
+        """
+        Generates the whole labyrinth at once, without the step by step visualization.
+
+        This is the entry point to use when the generation process does not need to be displayed (in the game, or in headless scripts).
+        The algorithms run in a tight loop over local variables instead of going through `generation_data` and the
+        wall methods at each step, but they use the random generator in the exact same order as `generate_step`:
+        for the same seed, both methods produce the same walls.
+        If the generation has already been started with `generate_step`, it is completed from where it stopped.
+
+        Parameters:
+        - seed (int): The seed of the random generator, None to use its current state. The seed is recorded in the
+          `seed` attribute, and saved with the labyrinth (see `save`).
+
+        Returns:
+        - bool: True, since the generation is complete.
+
+        Raises:
+        - ValueError: If a seed is given after the generation has started.
+        """
+        if seed is not None:
+            if self.generation_data["is_generated"] or self.generation_data["step"] != 0:
+                raise ValueError("The seed must be given before the generation starts.")
+            random.seed(seed)
+            self.seed = seed
+
+            # The first cell of the generation was drawn by the constructor, from the previous state of the random
+            # generator. It is drawn again, so that the walls only depend on the seed.
+            data = self.generation_data
+            data["visited"][data["origin"]] = 0
+            current = random.randint(0, self.width * self.height - 1)
+            data["visited"][current] = 1
+            data["stack"] = [current]
+            data["origin"] = current
+
+        if self.generation_data["is_generated"]:
+            return True
+
+        if self.generation_algorithm not in GENERATION_ALGORITHMS:
+            print("L'algorithme de génération n'est pas reconnu.")
+            raise NotImplementedError
+        start_time = time.perf_counter()
+
+        if self.generation_data["step"] == 0:
+            self.fill_with_walls()
+            self.setup_generation()
+            self.generation_data["step"] = 1
+        if self.generation_data["step"] == 1:
+            if self.generation_algorithm == "depth-first-search":
+                self.generate_depth_first_search()
+            elif self.generation_algorithm == "kruskal":
+                self.generate_kruskal()
+            else:
+                self.generate_prim()
+            self.generation_data["step"] = 2
+            self.generation_data["perfect_wall_count"] = len(self.walls)
+        self.remove_random_walls()
+
+        self.generation_data["is_generated"] = True
+        self.generation_data["step"] = 3
+        end_time = time.perf_counter()
+        self.generation_data["generation_time"] = end_time - self.generation_data["start_time"]
+        self.generation_data["algorithm_time"] += end_time - start_time
+        self.has_changed = True
+        return True
+
+    def generate_depth_first_search(self):
+        """
+        Runs the depth-first-search carver until the stack of `generation_data` is empty.
+
+        The visited cells are read from the bitmap of `generation_data`, and the walls are broken directly in the planes
+        of the wall grid. The adjacent cells are checked in the same order as `get_adjacent_cases` returns them
+        (left, right, up, down) so that `random.choice` picks the same cells as in `generate_step`.
+        """
+        width = self.width
+        last_line = self.width * (self.height - 1)  # The cells from this ID onwards have no cell below them
+        right = self.walls.right
+        bottom = self.walls.bottom
+        stack = self.generation_data["stack"]
+        visited = self.generation_data["visited"]
+        choice = random.choice
+        action_count = 0
+
+        while stack:
+            current = stack[-1]
+            x = current % width
+            unvisited_adjacent_cases = []
+            if x != 0 and not visited[current - 1]:
+                unvisited_adjacent_cases.append(current - 1)
+            if x != width - 1 and not visited[current + 1]:
+                unvisited_adjacent_cases.append(current + 1)
+            if current >= width and not visited[current - width]:
+                unvisited_adjacent_cases.append(current - width)
+            if current < last_line and not visited[current + width]:
+                unvisited_adjacent_cases.append(current + width)
+
+            if not unvisited_adjacent_cases:  # Dead end : we backtrack
+                stack.pop()
+                continue
+
+            next_case = choice(unvisited_adjacent_cases)
+            # We break the wall between the two cells: it is stored in the plane of the upper or leftmost cell.
+            # The vertical moves are checked first, since `current + 1` is the cell below when the labyrinth is one cell wide.
+            if next_case == current + width:
+                bottom[current] = 0
+            elif next_case == current - width:
+                bottom[next_case] = 0
+            elif next_case == current + 1:
+                right[current] = 0
+            else:
+                right[next_case] = 0
+            visited[next_case] = 1
+            stack.append(next_case)
+            action_count += 1
+
+        self.walls.count -= action_count  # Every action broke exactly one wall
+        self.walls.version += 1
+        self.generation_data["action_count"] += action_count
+
+    def setup_generation(self):
+        """
+        Prepares the data needed by the Kruskal and Prim generation algorithms, once the labyrinth is filled with walls.
+
+        - Kruskal's algorithm processes every wall in a random order. The walls are stored as integers (`2 * case` for the
+          right wall of a cell, `2 * case + 1` for its bottom wall) rather than tuples, which is much lighter for big labyrinths.
+          The cells connected so far are tracked by a disjoint-set.
+        - Prim's algorithm grows the labyrinth from the origin cell. It keeps the frontier (the cells next to the labyrinth
+          that are not part of it yet) in a list, along with the index of each cell in that list (-1 if it's not in the frontier),
+          so that a cell can be found and removed from the frontier in constant time.
+        """
+        if self.generation_algorithm == "kruskal":
+            edges = [2 * case for case in range(self.width * self.height) if self.walls.right[case]]
+            edges += [2 * case + 1 for case in range(self.width * self.height) if self.walls.bottom[case]]
+            random.shuffle(edges)
+            self.generation_data["edges"] = edges
+            self.generation_data["wall_index"] = 0
+            self.generation_data["sets"] = DisjointSet(self.width * self.height)
+
+        elif self.generation_algorithm == "prim":
+            origin = self.generation_data["origin"]
+            self.generation_data["frontier"] = []
+            self.generation_data["frontier_index"] = [-1] * (self.width * self.height)
+            self.add_to_frontier(origin)
+
+    def generate_kruskal(self, max_actions=None):
+        """
+        Runs the randomized Kruskal algorithm.
+
+        The walls are processed in a random order: a wall is broken if the two cells it separates are not connected yet.
+        The algorithm stops as soon as every cell is connected, since no wall can be broken after that.
+
+        Parameters:
+        - max_actions (int): The maximum number of walls to break before returning. None to run the algorithm to completion.
+
+        Returns:
+        - bool: True if the perfect labyrinth is complete, False otherwise.
+        """
+        width = self.width
+        right = self.walls.right
+        bottom = self.walls.bottom
+        edges = self.generation_data["edges"]
+        sets = self.generation_data["sets"]
+        union = sets.union
+        wall_index = self.generation_data["wall_index"]
+        action_count = 0
+
+        while wall_index < len(edges) and sets.set_count > 1:
+            if max_actions is not None and action_count >= max_actions:
+                break
+            edge = edges[wall_index]
+            wall_index += 1
+            case_1 = edge >> 1
+            if edge & 1:  # Bottom wall
+                case_2 = case_1 + width
+                plane = bottom
+            else:  # Right wall
+                case_2 = case_1 + 1
+                plane = right
+            if union(case_1, case_2):  # The cells were not connected yet : we break the wall
+                plane[case_1] = 0
+                action_count += 1
+                if max_actions is not None:  # Step by step: the change is recorded so that only this wall is redrawn
+                    self.walls.record(case_1, case_2)
+
+        self.walls.count -= action_count
+        if max_actions is None:
+            self.walls.version += 1
+        self.generation_data["wall_index"] = wall_index
+        self.generation_data["action_count"] += action_count
+        if action_count:
+            self.has_changed = True
+        return wall_index >= len(edges) or sets.set_count <= 1
+
+    def add_to_frontier(self, case):
+        """
+        Adds a cell to the labyrinth being generated by Prim's algorithm, and its unvisited neighbors to the frontier.
+
+        Parameters:
+        - case (int): The ID of the cell.
+        """
+        visited = self.generation_data["visited"]
+        frontier = self.generation_data["frontier"]
+        frontier_index = self.generation_data["frontier_index"]
+        visited[case] = 1
+        for adjacent in self.get_adjacent_cases(case):
+            if not visited[adjacent] and frontier_index[adjacent] == -1:
+                frontier_index[adjacent] = len(frontier)
+                frontier.append(adjacent)
+
+    def generate_prim(self, max_actions=None):
+        """
+        Runs the randomized Prim algorithm.
+
+        At each iteration, a random cell of the frontier is connected to a random neighbor that is already in the labyrinth.
+        The cell is removed from the frontier by swapping it with the last cell of the list, which is a constant time operation.
+
+        Parameters:
+        - max_actions (int): The maximum number of walls to break before returning. None to run the algorithm to completion.
+
+        Returns:
+        - bool: True if the perfect labyrinth is complete, False otherwise.
+        """
+        visited = self.generation_data["visited"]
+        frontier = self.generation_data["frontier"]
+        frontier_index = self.generation_data["frontier_index"]
+        action_count = 0
+
+        while frontier:
+            if max_actions is not None and action_count >= max_actions:
+                break
+            # We pick a random cell in the frontier and remove it by moving the last cell of the frontier in its place.
+            index = random.randrange(len(frontier))
+            case = frontier[index]
+            last = frontier.pop()
+            if last != case:
+                frontier[index] = last
+                frontier_index[last] = index
+            frontier_index[case] = -1
+
+            # We connect it to a random neighbor that is already part of the labyrinth.
+            neighbor = random.choice([adjacent for adjacent in self.get_adjacent_cases(case) if visited[adjacent]])
+            self.walls.remove(case, neighbor)
+            self.add_to_frontier(case)
+            action_count += 1
+
+        self.generation_data["action_count"] += action_count
+        if action_count:
+            self.has_changed = True
+        return not frontier
+
+    def resolve_step(self):
+        """
+        Performs a step in the labyrinth resolution process.
+        """
+        if not self.resolution_data["is_solved"]:
+
+            # We update the resolution time. This allows us to keep track of the time taken to resolve the labyrinth, independently of the framerate.
+            self.resolution_data["resolution_time"] = time.perf_counter() - self.resolution_data["start_time"]
+
+            if self.resolution_algorithm == "a-star":
+
+                def h(case):
+                    # We use the Manhattan distance as the heuristic function
+                    return self.MD(case, self.end)
+
+                def reconstruct_path(cameFrom, current):
+                    # We reconstruct the path from the cameFrom map
+                    totalPath = [current]
+                    while current in cameFrom.keys():
+                        current = cameFrom[current]
+                        totalPath.append(current)
+                    totalPath.reverse()  # We reverse the path to get the correct order
+                    return totalPath
+
+                # Initial setup of the A* algorithm : we set the start time, the openSet, the cameFrom map, the gScore and fScore arrays, and the current cell
+
+                if not self.resolution_data["setupDone"]:
+                    self.resolution_data["start_time"] = time.perf_counter()
+                    print("Initialisation de l'algorithme A*...")
+                    # The openSet is a binary heap of (fScore, order, cell) tuples, so the cell with the lowest fScore is found in O(log n).
+                    # The order is the rank of the cell's insertion in the openSet: among cells with the same fScore, the oldest one is
+                    # picked first, which gives the same paths as picking the minimum of a list.
+                    # When the fScore of a cell in the openSet decreases, a new tuple is pushed and the old one is ignored when popped.
+                    self.resolution_data["openSet"] = [(h(self.start), 0, self.start)]
+                    self.resolution_data["inOpenSet"] = bytearray(
+                        self.width * self.height
+                    )  # 1 if the cell is in the openSet
+                    self.resolution_data["inOpenSet"][self.start] = 1
+                    self.resolution_data["openSetOrder"] = [0] * (self.width * self.height)
+                    self.resolution_data["insertionCount"] = 1
+                    self.resolution_data["cameFrom"] = {}
+
+                    # The scores are stored in arrays indexed by cell ID, initialized to infinity for all cells except the start cell
+                    self.resolution_data["gScore"] = [math.inf] * (self.width * self.height)
+                    self.resolution_data["gScore"][self.start] = 0
+                    self.resolution_data["fScore"] = [math.inf] * (self.width * self.height)
+                    self.resolution_data["fScoreCounts"] = {}
+                    self.resolution_data["fScoreRange"] = (h(self.start), h(self.start))
+                    self.update_fscore(self.start, h(self.start))
+
+                    self.resolution_data["setupDone"] = True  # We have finished the setup
+
+                    print("Initialisation terminée.")
+
+                # We remove the outdated tuples from the top of the heap: cells that left the openSet, or that have a better fScore since.
+                openSet = self.resolution_data["openSet"]
+                while openSet and (
+                    not self.resolution_data["inOpenSet"][openSet[0][2]]
+                    or openSet[0][0] != self.resolution_data["fScore"][openSet[0][2]]
+                ):
+                    heapq.heappop(openSet)
+
+                if len(openSet) > 0:  # We have cells to evaluate
+                    self.resolution_data["current"] = openSet[0][2]  # We get the cell with the lowest fScore
+                    if self.resolution_data["current"] == self.end:  # We have reached the end cell
+                        print("Chemin trouvé.")
+
+                        # Compute the final path
+                        self.resolution_data["path"] = reconstruct_path(
+                            self.resolution_data["cameFrom"], self.resolution_data["current"]
+                        )
+
+                        self.resolution_data["is_solved"] = True  # We have finished the resolution process
+                        return True
+
+                    heapq.heappop(openSet)  # We remove the current cell from the openSet
+                    self.resolution_data["inOpenSet"][self.resolution_data["current"]] = 0
+                    adjacent = self.get_adjacent_cases(self.resolution_data["current"])  # We get the adjacent cells
+                    adjacent = [
+                        a for a in adjacent if self.can_move(self.resolution_data["current"], a)
+                    ]  # We filter the cells that can be moved to
+                    for neighbor in adjacent:
+                        tentative_gScore = (
+                            self.resolution_data["gScore"][self.resolution_data["current"]] + 1
+                        )  # We increment the gScore by 1
+                        if tentative_gScore < self.resolution_data["gScore"][neighbor]:  # We have found a better path
+                            self.resolution_data["cameFrom"][neighbor] = self.resolution_data[
+                                "current"
+                            ]  # We update the cameFrom map
+                            self.resolution_data["gScore"][neighbor] = tentative_gScore  # We update the gScore
+                            self.update_fscore(neighbor, tentative_gScore + h(neighbor))  # We update the fScore
+                            if not self.resolution_data["inOpenSet"][
+                                neighbor
+                            ]:  # We add the neighbor to the openSet if it's not already there
+                                self.resolution_data["inOpenSet"][neighbor] = 1
+                                self.resolution_data["openSetOrder"][neighbor] = self.resolution_data["insertionCount"]
+                                self.resolution_data["insertionCount"] += 1
+                            heapq.heappush(
+                                openSet,
+                                (
+                                    self.resolution_data["fScore"][neighbor],
+                                    self.resolution_data["openSetOrder"][neighbor],
+                                    neighbor,
+                                ),
+                            )
+
+                    # Compute the path (for visualization purposes)
+                    self.resolution_data["path"] = reconstruct_path(
+                        self.resolution_data["cameFrom"], self.resolution_data["current"]
+                    )
+
+                    self.resolution_data["total_move_count"] += 1  # We increment the move count
+
+                else:  # No path has been found
+                    print("Pas de chemin trouvé.")
+                    # We raise a RuntimeError to indicate that no path has been found
+                    raise RuntimeError("No path found.")
+
+            elif self.resolution_algorithm == "bidirectional":
+
+                if not self.resolution_data["setupDone"]:
+                    self.resolution_data["start_time"] = time.perf_counter()
+                    print("Début de la résolution du labyrinthe par parcours en largeur bidirectionnel...")
+                    self.resolution_data["startFrontier"] = [self.start]
+                    self.resolution_data["endFrontier"] = [self.end]
+                    self.resolution_data["startCameFrom"] = {self.start: -1}
+                    self.resolution_data["endCameFrom"] = {self.end: -1}
+                    self.resolution_data["reached"] = [self.start, self.end]
+                    self.resolution_data["startDistance"] = {self.start: 0}
+                    self.resolution_data["endDistance"] = {self.end: 0}
+                    self.resolution_data["setupDone"] = True
+
+                if self.start == self.end:
+                    self.resolution_data["path"] = [self.start]
+                    self.resolution_data["is_solved"] = True
+                    return True
+
+                if not self.resolution_data["startFrontier"] or not self.resolution_data["endFrontier"]:
+                    print("Pas de chemin trouvé.")
+                    raise RuntimeError("No path found.")
+
+                # A step expands a whole layer of the smallest frontier.
+                if len(self.resolution_data["startFrontier"]) <= len(self.resolution_data["endFrontier"]):
+                    self.resolution_data["startFrontier"], meeting, move_count = self.expand_bidirectional_layer(
+                        self.resolution_data["startFrontier"],
+                        self.resolution_data["startCameFrom"],
+                        self.resolution_data["startDistance"],
+                        self.resolution_data["endDistance"],
+                        self.resolution_data["reached"],
+                    )
+                else:
+                    self.resolution_data["endFrontier"], meeting, move_count = self.expand_bidirectional_layer(
+                        self.resolution_data["endFrontier"],
+                        self.resolution_data["endCameFrom"],
+                        self.resolution_data["endDistance"],
+                        self.resolution_data["startDistance"],
+                        self.resolution_data["reached"],
+                    )
+                self.resolution_data["total_move_count"] += move_count
+
+                if meeting is not None:  # The two frontiers have met
+                    print("Chemin trouvé.")
+                    self.resolution_data["path"] = self.join_bidirectional_path(
+                        meeting, self.resolution_data["startCameFrom"], self.resolution_data["endCameFrom"]
+                    )
+                    self.resolution_data["is_solved"] = True
+                    return True
+
+                return False
+
+            elif self.resolution_algorithm == "dead-end-filling":
+
+                if not self.resolution_data["setupDone"]:
+                    self.resolution_data["start_time"] = time.perf_counter()
+                    print("Début de la résolution du labyrinthe par remplissage des impasses...")
+                    self.resolution_data["filling"] = self.setup_dead_end_filling(self.start, self.end)
+                    self.resolution_data["filled"].append(self.resolution_data["filling"]["initial"])
+                    self.resolution_data["filled_count"] += len(self.resolution_data["filling"]["initial"])
+                    self.resolution_data["setupDone"] = True
+
+                filling = self.resolution_data["filling"]
+                if len(filling["frontier"]) == 0:  # There are no dead ends left: the remaining cells form the path
+                    path = self.get_dead_end_filling_path(filling, self.start, self.end)
+                    if not path:
+                        print("Pas de chemin trouvé.")
+                        raise RuntimeError("No path found.")
+                    print("Chemin trouvé.")
+                    self.resolution_data["path"] = path
+                    self.resolution_data["is_solved"] = True
+                    return True
+
+                # A step runs whole sweeps until a 32th of the labyrinth has been filled, so that even very large
+                # labyrinths are filled in a handful of frames.
+                filled_in_step = 0
+                while len(filling["frontier"]) > 0 and filled_in_step < max(1, self.width * self.height // 32):
+                    filled = self.dead_end_filling_sweep(filling)
+                    self.resolution_data["filled"].append(filled)
+                    self.resolution_data["filled_count"] += len(filled)
+                    self.resolution_data["total_move_count"] += 1
+                    filled_in_step += len(filled)
+
+                return False
+
+            elif self.resolution_algorithm == "recursive-backtracking":
+
+                if not self.resolution_data["setupDone"]:
+                    self.resolution_data["start_time"] = time.perf_counter()
+                    print("Début de la résolution du labyrinthe par backtracking récursif...")
+                    self.resolution_data["state"] = bytearray(self.width * self.height)
+                    self.resolution_data["state"][self.start] = CELL_VISITED  # The start cell is already on the stack
+                    self.resolution_data["setupDone"] = True
+
+                state = self.resolution_data["state"]
+
+                if self.resolution_data["stack"][-1] == self.end:  # We have reached the end cell
+                    print("Chemin trouvé.")
+                    self.resolution_data["is_solved"] = True
+                    return True
+                else:
+
+                    available = [
+                        i for i in self.get_accessible_cases(self.resolution_data["stack"][-1]) if not state[i]
+                    ]  # We filter the available cells : they must be accessible, not banned, and not visited
+
+                    if available == []:  # We have reached a dead end : we must backtrack
+                        self.resolution_data["banned"].append(self.resolution_data["stack"].pop())
+                        state[self.resolution_data["banned"][-1]] = CELL_BANNED
+
+                    else:  # We can still move
+                        self.resolution_data["stack"].append(
+                            random.choice(available)
+                        )  # We choose a random cell to move to
+                        self.resolution_data["visited"].append(
+                            self.resolution_data["stack"][-1]
+                        )  # We mark the cell as visited
+                        state[self.resolution_data["stack"][-1]] = CELL_VISITED
+
+                    self.resolution_data["total_move_count"] += 1  # We increment the move count
+
+                    return False
+            else:
+                print("L'algorithme de résolution n'est pas reconnu.")
+                raise NotImplementedError  # We raise a NotImplementedError to indicate that the algorithm is not implemented
+
+    def update_fscore(self, case, value):
+        """
+        Sets the fScore of a cell during the step by step A* resolution, and keeps the range of the fScores up to date.
+
+        The number of cells with each finite fScore is counted, so the minimum and maximum are only searched again when
+        the last cell holding one of them changes. The cell is also recorded so that the overlay only repaints it.
+
+        Parameters:
+        - case (int): The ID of the cell.
+        - value (int): The new fScore of the cell.
+        """
+        data = self.resolution_data
+        counts = data["fScoreCounts"]
+        old = data["fScore"][case]
+        if old != math.inf:
+            counts[old] -= 1
+            if counts[old] == 0:
+                del counts[old]
+        counts[value] = counts.get(value, 0) + 1
+        data["fScore"][case] = value
+        data["fScoreChanges"].append(case)
+
+        min_fScore, max_fScore = data["fScoreRange"]
+        if value < min_fScore or value > max_fScore or (old in (min_fScore, max_fScore) and old not in counts):
+            data["fScoreRange"] = (min(counts), max(counts))
+
+    def MD(self, case1, case2):
+        """
+        Calculates the Manhattan distance between two cells.
+
+        Parameters:
+        - case1 (int or tuple): The ID of the first cell or the coordinates of the first cell.
+        - case2 (int or tuple): The ID of the second cell or the coordinates of the second cell.
+
+        Returns:
+        - int: The Manhattan distance between the two cells.
+
+        """
+        if isinstance(case1, int) and isinstance(case2, int):  # Check if the inputs are cell IDs
+            case1 = self.id_to_coord(case1)  # Convert the cell ID to coordinates
+            case2 = self.id_to_coord(case2)  # Convert the cell ID to coordinates
+        return abs(case1[0] - case2[0]) + abs(case1[1] - case2[1])  # Calculate the Manhattan distance
+
+    def resolve_recursive_backtracking(self, start, end, use_junction_graph=False):
+        """
+        Use the recursive backtracking algorithm to find a path from the start cell to the end cell, without storing data for visualization.
+
+        The visited and banned cells are tracked in a state array indexed by cell ID, so checking a neighbor is a single
+        index operation instead of a scan over the lists of visited and banned cells. The walls are read directly from the
+        wall grid, and the neighbors are considered in the same order as in `resolve_step`.
+
+        Parameters:
+        - start (int): The ID of the start cell.
+        - end (int): The ID of the end cell.
+        - use_junction_graph (bool): Whether to run the search on the junction graph, which moves through a whole
+          corridor at once (see `get_junction_graph`).
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        if use_junction_graph:
+            return self.get_junction_graph().resolve_recursive_backtracking(start, end)
+
+        width = self.width
+        last_line = width * (self.height - 1)
+        right = self.walls.right
+        bottom = self.walls.bottom
+        state = bytearray(width * self.height)
+        state[start] = CELL_VISITED
+        stack = [start]
+        choice = random.choice
+
+        while stack:
+            case = stack[-1]
+            if case == end:
+                return stack
+
+            x = case % width
+            available = []
+            if x != 0 and not right[case - 1] and not state[case - 1]:
+                available.append(case - 1)
+            if x != width - 1 and not right[case] and not state[case + 1]:
+                available.append(case + 1)
+            if case >= width and not bottom[case - width] and not state[case - width]:
+                available.append(case - width)
+            if case < last_line and not bottom[case] and not state[case + width]:
+                available.append(case + width)
+
+            if available:
+                case = choice(available)
+                state[case] = CELL_VISITED
+                stack.append(case)
+            else:  # We have reached a dead end : we must backtrack
+                state[stack.pop()] = CELL_BANNED
+
+        return False
+
+    def run_steps(self, max_steps=1, budget=None):
+        """
+        Performs generation steps, then resolution steps once the labyrinth is generated, to animate both processes.
+
+        The steps stop when `max_steps` steps are done, when the time budget is spent, or when the labyrinth is solved.
+        The time spent in the steps is added to the `algorithm_time` of `generation_data` or `resolution_data`, so that
+        the time taken by the algorithms can be told apart from the time spent waiting for the next frame.
+
+        Parameters:
+        - max_steps (int): The maximum number of steps to perform (math.inf for no limit).
+        - budget (float): The time the steps can take, in seconds, None for no limit. At least one step is performed.
+
+        Returns:
+        - int: The number of steps performed.
+        """
+        start_time = time.perf_counter()
+        end_time = start_time
+        steps = 0
+        while steps < max_steps and not self.resolution_data["is_solved"]:
+            if not self.generation_data["is_generated"]:
+                self.generate_step()
+                data = self.generation_data
+            else:
+                self.resolve_step()
+                data = self.resolution_data
+            step_end_time = time.perf_counter()
+            data["algorithm_time"] += step_end_time - end_time
+            if data is self.resolution_data:  # `resolve_step` only updates it before the step
+                data["resolution_time"] = step_end_time - data["start_time"]
+            end_time = step_end_time
+            steps += 1
+            if budget is not None and end_time - start_time >= budget:
+                break
+        return steps
+
+    def solve(self, start=None, end=None):
+        """
+        Finds a path from the start cell to the end cell at once, with the resolution algorithm of the labyrinth.
+
+        This is the entry point to use when the resolution process does not need to be displayed, as `generate` is for
+        the generation. The labyrinth must be generated first.
+
+        Parameters:
+        - start (int): The ID of the start cell. Defaults to the start of the labyrinth.
+        - end (int): The ID of the end cell. Defaults to the end of the labyrinth.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        if self.resolution_algorithm == "recursive-backtracking":
+            return self.resolve_recursive_backtracking(start, end)
+        elif self.resolution_algorithm == "a-star":
+            return self.resolve_a_star(start, end)
+        elif self.resolution_algorithm == "bidirectional":
+            return self.resolve_bidirectional(start, end)
+        elif self.resolution_algorithm == "dead-end-filling":
+            return self.resolve_dead_end_filling(start, end)
+        print("L'algorithme de résolution n'est pas reconnu.")
+        raise NotImplementedError
+
+    def get_search_arrays(self):
+        """
+        Gets the arrays used by `resolve_a_star`, allocating them on the first call.
+
+        The arrays are indexed by cell ID and reused from one search to the next. Instead of resetting every cell to
+        infinity before each search, each search gets a new stamp: the data of a cell is only valid for the current search
+        if its stamp matches. Starting a new search is therefore a constant time operation.
+
+        Returns:
+        - dict: The arrays, and the stamp of the new search.
+        """
+        if self.search_arrays is None:
+            size = self.width * self.height
+            self.search_arrays = {
+                "stamp": 0,  # The stamp of the current search
+                "seen": [0] * size,  # The stamp of the last search that reached the cell
+                "inOpenSet": [0] * size,  # The stamp of the last search that put the cell in the openSet
+                "openSetOrder": [0] * size,  # The rank of the cell's insertion in the openSet
+                "gScore": [0] * size,
+                "fScore": [0] * size,
+                "cameFrom": [0] * size,
+            }
+        self.search_arrays["stamp"] += 1
+        return self.search_arrays
+
+    def get_junction_graph(self):
+        """
+        Gets the junction graph of the labyrinth, where every corridor is contracted into a single edge.
+
+        The graph is built on the first call, and rebuilt whenever the walls have changed since it was built.
+
+        Returns:
+        - JunctionGraph: The junction graph of the labyrinth.
+        """
+        if self.junction_graph is None or self.junction_graph.version != self.walls.version:
+            self.junction_graph = JunctionGraph(self.walls)
+        return self.junction_graph
+
+    def resolve_a_star(self, start, end, use_junction_graph=False):
+        """
+        Use the A* algorithm to find a path from the start cell to the end cell, without storing data for visualization.
+
+        This is the same algorithm as the A* branch of `resolve_step`, with the same tie-breaking between cells, but it uses
+        the preallocated arrays of `get_search_arrays` and reads the walls directly from the wall grid. This matters because
+        the enemies of the game call this method very often.
+
+        Parameters:
+        - start (int): The ID of the start cell.
+        - end (int): The ID of the end cell.
+        - use_junction_graph (bool): Whether to run the search on the junction graph (see `get_junction_graph`).
+          The path found is as short, but may differ when there are several shortest paths.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        if use_junction_graph:
+            return self.get_junction_graph().resolve_a_star(start, end)
+
+        width = self.width
+        last_line = self.width * (self.height - 1)
+        right = self.walls.right
+        bottom = self.walls.bottom
+        end_x, end_y = end % width, end // width
+
+        arrays = self.get_search_arrays()
+        stamp = arrays["stamp"]
+        seen = arrays["seen"]
+        inOpenSet = arrays["inOpenSet"]
+        openSetOrder = arrays["openSetOrder"]
+        gScore = arrays["gScore"]
+        fScore = arrays["fScore"]
+        cameFrom = arrays["cameFrom"]
+
+        seen[start] = stamp
+        gScore[start] = 0
+        fScore[start] = abs(start % width - end_x) + abs(start // width - end_y)
+        cameFrom[start] = -1  # The start cell has no predecessor
+        inOpenSet[start] = stamp
+        openSetOrder[start] = 0
+        insertionCount = 1
+        openSet = [(fScore[start], 0, start)]
+
+        while openSet:
+            f, order, current = heapq.heappop(openSet)
+            if inOpenSet[current] != stamp or f != fScore[current]:  # Outdated tuple
+                continue
+            if current == end:
+                path = [current]
+                while cameFrom[current] != -1:
+                    current = cameFrom[current]
+                    path.append(current)
+                path.reverse()
+                return path
+
+            inOpenSet[current] = 0
+            x = current % width
+            # The adjacent cells that can be moved to, in the same order as get_adjacent_cases
+            adjacent = []
+            if x != 0 and not right[current - 1]:
+                adjacent.append(current - 1)
+            if x != width - 1 and not right[current]:
+                adjacent.append(current + 1)
+            if current >= width and not bottom[current - width]:
+                adjacent.append(current - width)
+            if current < last_line and not bottom[current]:
+                adjacent.append(current + width)
+
+            tentative_gScore = gScore[current] + 1
+            for neighbor in adjacent:
+                if seen[neighbor] != stamp or tentative_gScore < gScore[neighbor]:
+                    seen[neighbor] = stamp
+                    cameFrom[neighbor] = current
+                    gScore[neighbor] = tentative_gScore
+                    fScore[neighbor] = (
+                        tentative_gScore + abs(neighbor % width - end_x) + abs(neighbor // width - end_y)
+                    )
+                    if inOpenSet[neighbor] != stamp:
+                        inOpenSet[neighbor] = stamp
+                        openSetOrder[neighbor] = insertionCount
+                        insertionCount += 1
+                    heapq.heappush(openSet, (fScore[neighbor], openSetOrder[neighbor], neighbor))
+
+        return False
+
+    def expand_bidirectional_layer(self, frontier, cameFrom, distance, other_distance, reached=None):
+        """
+        Expands a whole layer of one of the two frontiers of the bidirectional breadth-first search.
+
+        The layer has to be expanded completely before stopping: the first meeting point found is not necessarily on the
+        shortest path, but the best meeting point of the layer is.
+
+        Parameters:
+        - frontier (list): The cells of the layer to expand.
+        - cameFrom (dict): The map of navigated nodes of this side, updated in place.
+        - distance (dict): The distance of each node reached by this side, updated in place.
+        - other_distance (dict): The distance of each node reached by the other side.
+        - reached (list): The list the newly reached cells are appended to, or None. The overlay of the labyrinth uses
+          it to only repaint the new cells, as `fScoreChanges` for A*.
+
+        Returns:
+        - tuple: The next layer, the best meeting cell (or None if the frontiers have not met) and the number of expanded cells.
+        """
+        next_frontier = []
+        meeting = None
+        meeting_length = math.inf
+        for case in frontier:
+            for neighbor in self.get_accessible_cases(case):
+                if neighbor in distance:
+                    continue
+                cameFrom[neighbor] = case
+                distance[neighbor] = distance[case] + 1
+                next_frontier.append(neighbor)
+                if reached is not None:
+                    reached.append(neighbor)
+                if neighbor in other_distance and distance[neighbor] + other_distance[neighbor] < meeting_length:
+                    meeting = neighbor
+                    meeting_length = distance[neighbor] + other_distance[neighbor]
+        return next_frontier, meeting, len(frontier)
+
+    def join_bidirectional_path(self, meeting, startCameFrom, endCameFrom):
+        """
+        Builds the path going through the meeting cell of the bidirectional breadth-first search.
+
+        Parameters:
+        - meeting (int): The cell reached by both sides.
+        - startCameFrom (dict): The map of navigated nodes from the start cell.
+        - endCameFrom (dict): The map of navigated nodes from the end cell.
+
+        Returns:
+        - list: The path from the start cell to the end cell.
+        """
+        path = []
+        current = meeting
+        while current != -1:
+            path.append(current)
+            current = startCameFrom[current]
+        path.reverse()
+        current = endCameFrom[meeting]
+        while current != -1:
+            path.append(current)
+            current = endCameFrom[current]
+        return path
+
+    def resolve_bidirectional(self, start, end):
+        """
+        Use a bidirectional breadth-first search to find a shortest path from the start cell to the end cell, without storing data for visualization.
+
+        Two searches are grown at the same time, one from each end, always expanding the smallest frontier, until they meet.
+        In a labyrinth with long corridors, each search only has to go halfway, which roughly halves the number of expanded cells.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        if start == end:
+            return [start]
+        startFrontier, endFrontier = [start], [end]
+        startCameFrom, endCameFrom = {start: -1}, {end: -1}
+        startDistance, endDistance = {start: 0}, {end: 0}
+
+        while startFrontier and endFrontier:
+            if len(startFrontier) <= len(endFrontier):
+                startFrontier, meeting, _ = self.expand_bidirectional_layer(
+                    startFrontier, startCameFrom, startDistance, endDistance
+                )
+            else:
+                endFrontier, meeting, _ = self.expand_bidirectional_layer(
+                    endFrontier, endCameFrom, endDistance, startDistance
+                )
+            if meeting is not None:
+                return self.join_bidirectional_path(meeting, startCameFrom, endCameFrom)
+
+        return False
+
+    def setup_dead_end_filling(self, start, end):
+        """
+        Prepares the arrays used by the dead-end filling algorithm.
+
+        The algorithm works on NumPy arrays indexed by cell ID:
+        - `neighbors` gives, for each cell, the IDs of the four cells it can move to. A missing passage (a wall or the
+          border of the labyrinth) points to an extra cell, `size`, which is never alive.
+        - `alive` tells if a cell has not been filled yet.
+        - `degree` is the number of passages of each cell leading to a cell that is still alive.
+        The cells without any passage are filled right away, and the cells with a single passage (the dead ends)
+        form the frontier of the first sweep. The start and end cells are never filled.
+
+        Parameters:
+        - start (int): The ID of the start cell.
+        - end (int): The ID of the end cell.
+
+        Returns:
+        - dict: The arrays of the algorithm, along with the cells filled during the setup ("initial").
+        """
+        import numpy as np  # Imported here, so that importing the maze module stays fast
+
+        width = self.width
+        size = self.width * self.height
+        right, bottom = self.walls.as_arrays()
+        cases = np.arange(size)
+
+        # The walls on the borders of the labyrinth are not stored in the wall grid, so we close these passages by hand.
+        open_right = (right == 0) & (cases % width != width - 1)
+        open_bottom = bottom == 0
+        open_bottom[size - width :] = False
+        open_left = np.zeros(size, dtype=bool)
+        open_left[1:] = open_right[:-1]
+        open_up = np.zeros(size, dtype=bool)
+        open_up[width:] = open_bottom[: size - width]
+
+        neighbors = np.full((size + 1, 4), size, dtype=np.int32)
+        neighbors[:size, 0] = np.where(open_left, cases - 1, size)
+        neighbors[:size, 1] = np.where(open_right, cases + 1, size)
+        neighbors[:size, 2] = np.where(open_up, cases - width, size)
+        neighbors[:size, 3] = np.where(open_bottom, cases + width, size)
+
+        degree = open_left.astype(np.int8) + open_right + open_up + open_bottom
+
+        alive = np.ones(size + 1, dtype=bool)
+        alive[size] = False
+        protected = np.zeros(size + 1, dtype=bool)
+        protected[start] = True
+        protected[end] = True
+
+        initial = np.flatnonzero((degree == 0) & ~protected[:size])
+        alive[initial] = False
+
+        return {
+            "neighbors": neighbors,
+            "degree": degree,
+            "alive": alive,
+            "protected": protected,
+            "frontier": np.flatnonzero((degree == 1) & ~protected[:size]),
+            "initial": initial,
+        }
+
+    def dead_end_filling_sweep(self, filling):
+        """
+        Fills every dead end of the frontier at once, with vectorized operations.
+
+        Each dead end has a single passage to a living cell: it is filled, and the degree of that cell decreases.
+        The cells that become dead ends form the frontier of the next sweep. The cells that lose their last passage
+        (when two dead ends lead to the same cell) are filled right away.
+
+        Parameters:
+        - filling (dict): The arrays of the algorithm, updated in place.
+
+        Returns:
+        - numpy.ndarray: The IDs of the cells filled during the sweep.
+        """
+        import numpy as np
+
+        alive = filling["alive"]
+        degree = filling["degree"]
+        cases = filling["frontier"]
+
+        # The single living neighbor of each dead end, found before any of them is filled.
+        neighbors = filling["neighbors"][cases]
+        neighbors = neighbors[alive[neighbors]]
+
+        alive[cases] = False
+        np.subtract.at(degree, neighbors, 1)  # Handles several dead ends leading to the same cell
+
+        candidates = np.unique(neighbors)
+        candidates = candidates[alive[candidates] & ~filling["protected"][candidates]]
+        isolated = candidates[degree[candidates] <= 0]
+        alive[isolated] = False
+        filling["frontier"] = candidates[degree[candidates] == 1]
+
+        return np.concatenate((cases, isolated))
+
+    def get_dead_end_filling_path(self, filling, start, end):
+        """
+        Gets the path left once every dead end has been filled.
+
+        In a perfect labyrinth, the cells that are still alive form a single corridor from the start to the end cell:
+        each of them has exactly two living neighbors (one for the start and end cells). The next cell of the corridor
+        is then read from the neighbor table, without any search. If the labyrinth has loops, the remaining cells
+        contain several paths: we fall back to the A* algorithm in that case.
+
+        Parameters:
+        - filling (dict): The arrays of the algorithm, once there are no dead ends left.
+        - start (int): The ID of the start cell.
+        - end (int): The ID of the end cell.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        import numpy as np
+
+        alive = filling["alive"]
+        degree = filling["degree"]
+        if start == end:
+            return [start]
+
+        corridor = np.flatnonzero(alive)
+        ends_degree = degree[[start, end]]
+        if (ends_degree != 1).any() or (degree[corridor] != 2).sum() != 2:
+            return self.resolve_a_star(start, end)
+
+        # The living neighbors of each cell of the corridor, as two columns (the second one is unused at the ends).
+        neighbors = filling["neighbors"][corridor]
+        neighbors = neighbors[alive[neighbors]]
+        split = np.cumsum(degree[corridor]) - degree[corridor]
+        first = dict(zip(corridor.tolist(), neighbors[split].tolist()))
+        second = dict(zip(corridor.tolist(), neighbors[np.minimum(split + 1, len(neighbors) - 1)].tolist()))
+
+        path = [start]
+        previous = -1
+        current = start
+        while current != end:
+            following = first[current] if first[current] != previous else second[current]
+            previous, current = current, following
+            path.append(current)
+            if len(path) > len(corridor):  # The corridor is not connected to the end (it should not happen)
+                return self.resolve_a_star(start, end)
+        return path
+
+    def resolve_dead_end_filling(self, start, end):
+        """
+        Use the dead-end filling algorithm to find a path from the start cell to the end cell, without storing data for visualization.
+
+        Every dead end (a cell with a single open passage, other than the start and end cells) is filled, over and over,
+        until there are none left. Each sweep fills all the dead ends at once with NumPy, so there is no per-cell search:
+        on a perfect labyrinth, the cells left are exactly the path.
+
+        Returns:
+        - list: The path from the start cell to the end cell, or False if there is none.
+        """
+        filling = self.setup_dead_end_filling(start, end)
+        while len(filling["frontier"]) > 0:
+            self.dead_end_filling_sweep(filling)
+        return self.get_dead_end_filling_path(filling, start, end)
@@ -0,0 +1,181 @@
+"""
+Saves labyrinths to a compact binary file, and loads them back through a memory map.
+
+A labyrinth file starts with a header, followed by the names of the algorithms and by the two wall planes of the
+labyrinth (see `WallGrid`), packed at one bit per cell: 2 bits per cell in total, 8 times less than in memory.
+The planes are not read when the file is loaded: they are mapped in memory, and the walls are read from the mapped
+pages when the solvers access them (see `BitPlane`). Opening a labyrinth of several gigabytes is then immediate, and
+only the parts of the file that are used are loaded from the disk.
+
+The labyrinths are saved and loaded with `Maze.save` and `Maze.load` (or `Labyrinth.save` and `Labyrinth.load`).
+"""
+
+import mmap
+import struct
+
+from walls import BitPlane, WallGrid
+
+# The header holds the magic number, the version of the format, the width and height of the labyrinth, the start and end
+# cells, the number of walls, whether the seed is known and the seed, the looping factor, and the lengths of the names
+# of the generation and resolution algorithms, which follow the header in UTF-8.
+MAZE_FILE_MAGIC = b"LABY"
+MAZE_FILE_VERSION = 1
+MAZE_FILE_HEADER = struct.Struct("<4sHIIQQQ?qdHH")
+
+CHUNK_CELLS = 1 << 24  # The number of cells packed at once when a file is written (a multiple of 8)
+
+
+def get_plane_size(cell_count):
+    """
+    Gets the size of a packed wall plane in a labyrinth file.
+
+    Parameters:
+    - cell_count (int): The number of cells of the labyrinth.
+
+    Returns:
+    - int: The size of the plane, in bytes.
+    """
+    return (cell_count + 7) // 8
+
+
+def write_plane(file, plane):
+    """
+    Packs a wall plane at one bit per cell and writes it to a file, a chunk of cells at a time.
+
+    Parameters:
+    - file (file): The file, opened in binary mode.
+    - plane (bytearray or BitPlane): The wall plane.
+    """
+    if isinstance(plane, BitPlane):  # The plane is already packed, it is copied as it is
+        with memoryview(plane.buffer) as view:
+            file.write(view[plane.offset : plane.offset + get_plane_size(len(plane))])
+        return
+
+    import numpy as np  # Imported here, so that loading a labyrinth file does not need NumPy
+
+    cells = np.frombuffer(plane, dtype=np.uint8)
+    for first_cell in range(0, len(cells), CHUNK_CELLS):
+        file.write(np.packbits(cells[first_cell : first_cell + CHUNK_CELLS], bitorder="little").tobytes())
+
+
+def write_maze(path, labyrinth):
+    """
+    Writes a generated labyrinth to a file.
+
+    Parameters:
+    - path (str): The path of the file.
+    - labyrinth (Maze): The labyrinth.
+    """
+    generation_algorithm = labyrinth.generation_algorithm.encode()
+    resolution_algorithm = labyrinth.resolution_algorithm.encode()
+    with open(path, "wb") as file:
+        file.write(
+            MAZE_FILE_HEADER.pack(
+                MAZE_FILE_MAGIC,
+                MAZE_FILE_VERSION,
+                labyrinth.width,
+                labyrinth.height,
+                labyrinth.start,
+                labyrinth.end,
+                len(labyrinth.walls),
+                labyrinth.seed is not None,
+                labyrinth.seed or 0,
+                labyrinth.looping_factor,
+                len(generation_algorithm),
+                len(resolution_algorithm),
+            )
+        )
+        file.write(generation_algorithm)
+        file.write(resolution_algorithm)
+        write_plane(file, labyrinth.walls.right)
+        write_plane(file, labyrinth.walls.bottom)
+
+
+def read_header(buffer):
+    """
+    Reads the header of a labyrinth file.
+
+    Parameters:
+    - buffer (buffer): The content of the file, or at least its beginning (a mmap object, or bytes).
+
+    Returns:
+    - dict: The width, height, start, end, wall_count, seed (None if unknown), looping_factor, generation_algorithm and
+      resolution_algorithm of the labyrinth, and the position of its planes in the file (planes_offset).
+
+    Raises:
+    - ValueError: If the file is not a labyrinth file, or was written with another version of the format.
+    """
+    if len(buffer) < MAZE_FILE_HEADER.size:
+        raise ValueError("Not a labyrinth file.")
+    (
+        magic,
+        version,
+        width,
+        height,
+        start,
+        end,
+        wall_count,
+        has_seed,
+        seed,
+        looping_factor,
+        generation_length,
+        resolution_length,
+    ) = MAZE_FILE_HEADER.unpack_from(buffer)
+    if magic != MAZE_FILE_MAGIC:
+        raise ValueError("Not a labyrinth file.")
+    if version != MAZE_FILE_VERSION:
+        raise ValueError(f"Unsupported labyrinth file version: {version}.")
+
+    offset = MAZE_FILE_HEADER.size
+    generation_algorithm = bytes(buffer[offset : offset + generation_length]).decode()
+    offset += generation_length
+    resolution_algorithm = bytes(buffer[offset : offset + resolution_length]).decode()
+    offset += resolution_length
+    return {
+        "width": width,
+        "height": height,
+        "start": start,
+        "end": end,
+        "wall_count": wall_count,
+        "seed": seed if has_seed else None,
+        "looping_factor": looping_factor,
+        "generation_algorithm": generation_algorithm,
+        "resolution_algorithm": resolution_algorithm,
+        "planes_offset": offset,
+    }
+
+
+def read_maze(path, lazy=True):
+    """
+    Reads the header and the walls of a labyrinth file.
+
+    Parameters:
+    - path (str): The path of the file.
+    - lazy (bool): Whether to read the walls from a memory map of the file when they are accessed. Otherwise, the
+      planes are unpacked into byte planes at once, which takes more time and memory (one byte per wall), but makes
+      reading the walls faster afterwards.
+
+    Returns:
+    - tuple: The header of the file (see `read_header`) and the walls of the labyrinth (WallGrid).
+
+    Raises:
+    - ValueError: If the file is not a labyrinth file, or if it is truncated.
+    """
+    with open(path, "rb") as file:
+        # The map is private: the walls of the labyrinth can still be changed in memory, but the file is left untouched.
+        # It stays open after the file is closed, until the planes using it are deleted.
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    header = read_header(buffer)
+    cell_count = header["width"] * header["height"]
+    plane_size = get_plane_size(cell_count)
+    if len(buffer) < header["planes_offset"] + 2 * plane_size:
+        raise ValueError("The labyrinth file is truncated.")
+
+    right = BitPlane(buffer, header["planes_offset"], cell_count)
+    bottom = BitPlane(buffer, header["planes_offset"] + plane_size, cell_count)
+    if not lazy:
+        right = bytearray(right.unpack())
+        bottom = bytearray(bottom.unpack())
+        buffer.close()
+    return header, WallGrid(header["width"], header["height"], right, bottom, header["wall_count"])
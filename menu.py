@@ -1,7 +1,5 @@
 import pygame
-from constants import WIDTH, BUTTON_COLOR
-from menuresolutioncustom import Resolution_Custom
-from game import Game
+from constants import WIDTH, BUTTON_COLOR, BG_COLOR
 from menufactory import MenuFactory, Button, Text
 
 
@@ -20,11 +18,15 @@ class Menu:
         quit (bool): Flag to indicate if the game should quit.
         screen (pygame.Surface): The game screen.
         stack (list): A stack to keep track of the menu screens.
+        drawn_screen (MenuFactory): The menu screen drawn at the last frame, None if nothing has been drawn yet.
+        needs_full_redraw (bool): Flag indicating if the window must be drawn entirely at the next frame.
     """
 
     def __init__(self):
         self.quit = False
         self.screen = pygame.display.get_surface()
+        self.drawn_screen = None
+        self.needs_full_redraw = True
         self.stack = []
         self.stack.append(Main_Menu(self.stack))  # Start with the main menu screen.
 
@@ -45,14 +47,30 @@ class Menu:
             clock
         )  # Update the current menu screen. This will effectively pause all other screens in the stack, and not waste resources on them.
 
-        for event in pygame.event.get():  # Process events
-            if event.type == pygame.QUIT:  # Check if the user wants to quit (by closing the window)
+        events = pygame.event.get()
+        if (
+            not events
+            and self.stack[-1].is_idle()
+            and self.stack[-1] is self.drawn_screen
+            and not self.needs_full_redraw
+        ):
+            # Nothing will change on the screen until the user does something, so we wait for it without using the CPU.
+            events = [pygame.event.wait()]
+
+        for event in events:  # Process events
+            if event.type == pygame.WINDOWEXPOSED:  # The content of the window was lost (e.g. hidden by another one)
+                self.needs_full_redraw = True
+            elif event.type == pygame.QUIT:  # Check if the user wants to quit (by closing the window)
                 return False
             elif event.type == pygame.MOUSEBUTTONDOWN:  # Check if the user clicked on the screen
                 if event.button == 1:
                     self.stack[-1].on_click(
                         event.pos
                     )  # Pass the click position to the current menu screen that will handle it.
+            elif event.type == pygame.MOUSEWHEEL:  # Check if the user scrolled
+                self.stack[-1].on_scroll(event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:  # Check if the user is dragging the mouse
+                self.stack[-1].on_drag(event.pos, event.rel)
             elif event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
                 self.stack[-1].on_key(
                     event.key, event.type == pygame.KEYDOWN
@@ -63,8 +81,20 @@ class Menu:
     def draw(self):
         """
         Draw the current menu screen.
+
+        The screen is drawn entirely when the current menu screen changes. Otherwise, only the areas that changed since
+        the last frame are drawn again.
+
+        Returns:
+            list: The areas of the window that changed, or None if the whole window must be updated.
         """
-        self.stack[-1].draw()
+        if self.stack[-1] is not self.drawn_screen or self.needs_full_redraw:
+            self.screen.fill(BG_COLOR)  # Fill the screen with the background color.
+            self.stack[-1].draw()
+            self.drawn_screen = self.stack[-1]
+            self.needs_full_redraw = False
+            return None
+        return self.stack[-1].draw_changes()
 
     def back(self):
         """
@@ -123,11 +153,18 @@ class Main_Menu(MenuFactory):
     def resolution_custom(self):
         """
         Open the resolution custom menu screen.
+        The screen is imported here, so that its modules are only loaded when it is first opened, not when the game starts.
         """
+        from menuresolutioncustom import Resolution_Custom
+
         self.stack.append(Resolution_Custom(self.stack))
 
     def start_game(self):
         """
         Start the game.
+        The game screen is imported here, so that its modules are only loaded when it is first opened, not when the game
+        starts.
         """
+        from game import Game
+
         self.stack.append(Game(self.stack))
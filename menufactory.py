@@ -1,5 +1,89 @@
+from collections import OrderedDict
+
 import pygame
 import constants
+from assets import get_font
+
+TEXT_CACHE_CAPACITY = 256  # The number of rendered texts kept in memory
+
+
+class TextCache:
+    """
+    A cache of rendered texts, which forgets the least recently used ones when it is full.
+
+    Rendering a text with a font is much slower than blitting it. Most labels switch between a few texts (a counter
+    that rarely changes, the name of an algorithm), so each text is only rendered once.
+
+    Attributes:
+    - capacity (int): The maximum number of texts kept in the cache.
+    - surfaces (OrderedDict): The rendered texts, keyed by (font, text, color), from the least recently used to the
+      most recently used.
+    - hits (int): The number of texts found in the cache.
+    - misses (int): The number of texts that had to be rendered.
+    """
+
+    def __init__(self, capacity=TEXT_CACHE_CAPACITY):
+        """
+        Initialize an empty cache.
+
+        Parameters:
+        - capacity (int): The maximum number of texts kept in the cache.
+        """
+        self.capacity = capacity
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        """
+        Get a rendered text from the cache, or render it if it is not in the cache.
+
+        The surfaces are shared between the labels, so they must not be modified.
+
+        Parameters:
+        - font (pygame.font.Font): The font of the text.
+        - text (str): The text.
+        - color (tuple): The color of the text.
+
+        Returns:
+        - pygame.Surface: The rendered text.
+        """
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, 0, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.capacity:
+            self.surfaces.popitem(last=False)  # The least recently used text
+        return surface
+
+    def get_hit_rate(self):
+        """
+        Get the proportion of the texts that were found in the cache.
+
+        Returns:
+        - float: The hit rate, between 0 and 1.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+
+text_cache = TextCache()  # The cache is shared by all the labels of all the menus
+
+
+def get_text_cache_stats():
+    """
+    Get a summary of the use of the text cache, to be displayed for debugging.
+
+    Returns:
+    - str: The hit rate of the text cache, and the number of texts it holds.
+    """
+    return f"Cache texte : {text_cache.get_hit_rate():.0%} ({len(text_cache.surfaces)} textes)"
 
 
 class MenuFactory:
@@ -10,9 +94,14 @@ class MenuFactory:
     It implements basic features such as updating, drawing, handling mouse clicks, and handling key events.
     Adding new UI elements to menus is done by adding them to the 'buttons' and 'elements' groups.
 
+    The screen is drawn in two ways. When a menu is displayed for the first time, `draw` draws it entirely. Then, at each
+    frame, `draw_changes` only draws again the areas that changed, and returns them so that only these areas are
+    copied to the window (see `Menu.draw`).
+
     Attributes:
     - buttons (pygame.sprite.Group): A group of buttons in the menu.
     - elements (pygame.sprite.Group): A group of elements in the menu.
+    - dirty_rects (list): The areas of the screen that changed since the last frame, to be drawn again.
     """
 
     def __init__(self):
@@ -26,6 +115,7 @@ class MenuFactory:
             pygame.sprite.Group()
         )  # Holds the buttons in the menu. Is separated from elements to handle click events.
         self.elements = pygame.sprite.Group()  # Holds non-interactable elements in the menu.
+        self.dirty_rects = []  # The areas of the screen that changed since the last frame
 
     def update(self, clock):
         """
@@ -41,10 +131,70 @@ class MenuFactory:
         """
         Draw the elements and buttons in the menu.
         """
+        self.dirty_rects = []  # Everything is drawn, so nothing is left to draw again
+        for el in self.elements:
+            el.draw()
+        for el in self.buttons:
+            el.draw()
+
+    def mark_dirty(self, rect):
+        """
+        Marks an area of the screen as changed, so that it is drawn again at the next frame.
+
+        Parameters:
+        - rect: The area of the screen.
+        """
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def draw_changes(self):
+        """
+        Draw again the areas of the screen that changed since the last frame.
+
+        By default, these are the areas marked with `mark_dirty` and the areas of the texts that changed. Menus with
+        animated content, such as the game screen, override this method to draw their own changes too.
+
+        Returns:
+        - list: The areas of the screen that were drawn again.
+        """
+        for el in self.elements:
+            if getattr(el, "dirty_rect", None) is not None:  # Only the texts can change
+                self.dirty_rects.append(el.dirty_rect)
+                el.dirty_rect = None
+
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        for rect in rects:
+            self.redraw_area(rect)
+        return rects
+
+    def redraw_area(self, rect):
+        """
+        Clear an area of the screen, then draw the elements and buttons that cross it again.
+
+        Parameters:
+        - rect (pygame.Rect): The area of the screen.
+        """
+        screen = pygame.display.get_surface()
+        screen.set_clip(rect)  # The elements outside of the area are not drawn, and the others are cut
+        screen.fill(constants.BG_COLOR)
         for el in self.elements:
             el.draw()
         for el in self.buttons:
             el.draw()
+        screen.set_clip(None)
+
+    def is_idle(self):
+        """
+        Check if the menu only changes in response to events.
+
+        When it does, the main loop waits for the next event instead of drawing frames that would not change anything.
+        Menus with animated content override this method.
+
+        Returns:
+        - bool: True if the menu is idle, False otherwise.
+        """
+        # The changes that are not drawn yet must be drawn before waiting.
+        return not self.dirty_rects and all(getattr(el, "dirty_rect", None) is None for el in self.elements)
 
     def on_click(self, pos):
         """
@@ -79,6 +229,31 @@ class MenuFactory:
         """
         pass
 
+    def on_scroll(self, amount, pos):
+        """
+        Handle the mouse wheel event in the menu.
+
+        This method is empty by default, but can be overridden in subclasses, such as in the resolution screen to zoom.
+
+        Parameters:
+        - amount: The number of steps scrolled, positive when scrolling up.
+        - pos: The position of the mouse when scrolling.
+        """
+        pass
+
+    def on_drag(self, pos, rel):
+        """
+        Handle the mouse motion while the left button is held down.
+
+        This method is empty by default, but can be overridden in subclasses, such as in the resolution screen to move
+        the view of the labyrinth.
+
+        Parameters:
+        - pos: The position of the mouse.
+        - rel: The motion of the mouse since the last event.
+        """
+        pass
+
 
 class Button(pygame.sprite.Sprite):
     """
@@ -123,16 +298,27 @@ class Button(pygame.sprite.Sprite):
         self.function = function  # The function to be called when the button is clicked.
         self.rect = pygame.Rect(x, y, width, height)
         self.image = pygame.Surface((width, height))
-        self.image.fill(color)
-        self.font = (
-            constants.font
-        )  # The font is cached in the constants module for easy access : loading files from disk is slow.
+        # The font is cached in the assets module, and only loaded by the first button : loading files from disk is slow.
+        self.font = get_font(constants.FONT_SIZE)
+        self.set_text(text)
+
+    def set_text(self, text):
+        """
+        Change the text displayed on the button.
+
+        The menu must mark the area of the button as changed (see `MenuFactory.mark_dirty`) to display it.
+
+        Parameters:
+        - text (str): The new text.
+        """
+        self.text = text
+        self.image.fill(self.color)
         self.text_render = self.font.render(text, 0, (255, 255, 255))
         self.image.blit(
             self.text_render,
             (
-                width / 2 - self.text_render.get_width() / 2,
-                height / 2 - self.text_render.get_height() / 2,
+                self.width / 2 - self.text_render.get_width() / 2,
+                self.height / 2 - self.text_render.get_height() / 2,
             ),
         )  # Center the text on the button.
 
@@ -157,9 +343,11 @@ class Text(pygame.sprite.Sprite):
     - image (pygame.Surface): The image of the text element.
     - rect (pygame.Rect): The rectangle representing the text element.
     - screen (pygame.Surface): The screen surface.
+    - dirty_rect (pygame.Rect): The area of the screen that changed since the text was last drawn, None if there is none.
+    - counter (bool): Flag indicating if the text changes at almost every frame, like a counter.
     """
 
-    def __init__(self, x, y, color, text):
+    def __init__(self, x, y, color, text, counter=False):
         """
         Initialize the Text object.
 
@@ -168,19 +356,23 @@ class Text(pygame.sprite.Sprite):
         - y (int): The y-coordinate of the text element.
         - color (tuple): The color of the text.
         - text (str): The text to be displayed.
+        - counter (bool): Flag indicating if the text changes at almost every frame. The text is then rendered
+          directly instead of being cached (see `TextCache`), since it would never be displayed again.
         """
         super().__init__()
         self.x = x
         self.y = y
         self.color = color
         self.text = text
-        self.font = constants.font_big  # The font is cached in the constants module for easy access.
-        self.text_render = self.font.render(text, 0, color)
+        self.counter = counter
+        self.font = get_font(constants.BIG_FONT_SIZE)  # The font is cached in the assets module for easy access.
+        self.text_render = self.render(text)
 
         self.image = self.text_render
         self.rect = self.image.get_rect()
 
         self.screen = pygame.display.get_surface()
+        self.dirty_rect = None
 
     def update_text(self, text):
         """
@@ -191,10 +383,32 @@ class Text(pygame.sprite.Sprite):
         Parameters:
         - text (str): The new text to be displayed.
         """
+        if text == self.text:  # Most labels are updated at every frame, but rarely change
+            return
+        # Both the area of the previous text and the area of the new one must be drawn again.
+        old_area = self.image.get_rect(topleft=(self.x, self.y))
         self.text = text
-        self.text_render = self.font.render(text, 0, self.color)
+        self.text_render = self.render(text)
         self.image = self.text_render
         self.rect = self.image.get_rect()
+        area = old_area.union(self.image.get_rect(topleft=(self.x, self.y)))
+        self.dirty_rect = area if self.dirty_rect is None else self.dirty_rect.union(area)
+
+    def render(self, text):
+        """
+        Render a text with the font and the color of the text element.
+
+        Parameters:
+        - text (str): The text to render.
+
+        Returns:
+        - pygame.Surface: The rendered text.
+        """
+        if self.counter:
+            # Composing the digits from cached glyphs was tried, but blitting them one by one is several times slower
+            # than rendering these short texts with the font.
+            return self.font.render(text, 0, self.color)
+        return text_cache.render(self.font, text, self.color)
 
     def draw(self):
         """
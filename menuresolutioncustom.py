@@ -1,7 +1,8 @@
 import menufactory
 import pygame
 from resolution import Resolution
-from constants import BUTTON_COLOR
+from constants import BUTTON_COLOR, HEIGHT
+from labyrinth import GENERATION_ALGORITHMS, RESOLUTION_ALGORITHMS, fit_cell_size
 
 
 class Resolution_Custom(menufactory.MenuFactory):
@@ -78,9 +79,8 @@ class Resolution_Custom(menufactory.MenuFactory):
         self.elements.add(generation_text)
         self.generation_label = menufactory.Text(10, 240, (255, 255, 255), "depth-first-search")
         self.elements.add(self.generation_label)
-        # generation_button = menufactory.Button(10, 280, 100, 40, BUTTON_COLOR, "Changer", self.toggle_generation)
-        # self.buttons.add(generation_button)
-        # ^^^ This line may be uncommented to add a button to toggle between generation methods if any is implemented later on.
+        generation_button = menufactory.Button(10, 280, 100, 40, BUTTON_COLOR, "Changer", self.toggle_generation)
+        self.buttons.add(generation_button)
 
         # Button to select the maze solving method
         resolution_text = menufactory.Text(10, 340, (255, 255, 255), "Méthode de résolution")
@@ -125,8 +125,9 @@ class Resolution_Custom(menufactory.MenuFactory):
         """
         self.grid_size += 1
         self.grid_size_label.update_text(str(self.grid_size))
-        if self.grid_size >= 75:
-            print("ATTENTION : Un labyrinthe de taille supérieure à 75x75 peut causer des problèmes d'affichage !")
+        # The labyrinth is drawn at the size of the screen area, so the cells get smaller as the grid gets bigger.
+        if fit_cell_size((self.grid_size, self.grid_size), (HEIGHT - 40, HEIGHT - 40), minimum=0) < 4:
+            print("ATTENTION : Les murs d'un labyrinthe de cette taille seront difficiles à distinguer à l'écran !")
 
     def decrease_grid_size(self):
         """
@@ -136,14 +137,19 @@ class Resolution_Custom(menufactory.MenuFactory):
             self.grid_size -= 1
             self.grid_size_label.update_text(str(self.grid_size))
 
+    def toggle_generation(self):
+        """
+        Cycles between the "depth-first-search", "kruskal" and "prim" maze generation methods.
+        """
+        index = GENERATION_ALGORITHMS.index(self.generation_label.text)
+        self.generation_label.update_text(GENERATION_ALGORITHMS[(index + 1) % len(GENERATION_ALGORITHMS)])
+
     def toggle_resolution(self):
         """
-        Toggles between the "a-star" and "recursive-backtracking" maze solving methods.
+        Cycles between the maze solving methods of `RESOLUTION_ALGORITHMS`, in the order of the list.
         """
-        if self.resolution_label.text == "a-star":
-            self.resolution_label.update_text("recursive-backtracking")
-        else:
-            self.resolution_label.update_text("a-star")
+        index = RESOLUTION_ALGORITHMS.index(self.resolution_label.text)
+        self.resolution_label.update_text(RESOLUTION_ALGORITHMS[(index + 1) % len(RESOLUTION_ALGORITHMS)])
 
     def increase_looping_factor(self):
         """
@@ -1,7 +1,15 @@
-from menufactory import MenuFactory, Button, Text
+from menufactory import MenuFactory, Button, Text, get_text_cache_stats
 from labyrinth import Labyrinth
+from camera import Camera
 from constants import *
 import pygame
+import math
+import time
+
+STEP_BUDGET = 0.012  # The time the generation or resolution steps can take during a frame, in seconds
+# The number of steps performed at each frame for each speed. At the maximum speed, the steps fill the time budget, and
+# the instant speed completes the labyrinth in a single frame.
+SPEEDS = {"1x": 1, "10x": 10, "max": math.inf, "instant": None}
 
 
 class Resolution(MenuFactory):
@@ -25,18 +33,30 @@ class Resolution(MenuFactory):
         sizeLabel (Text): The label for displaying the size of the labyrinth.
         loopingFactorLabel (Text): The label for displaying the looping factor of the labyrinth generation.
         generationTimeLabel (Text): The label for displaying the generation time.
+        generationAlgorithmTimeLabel (Text): The label for displaying the time spent in the generation algorithm.
         generationStepLabel (Text): The label for displaying the current generation step.
         resolutionMethodLabel (Text): The label for displaying the resolution method.
         resolutionMethodLabel2 (Text): The label for displaying the resolution method (recursive backtracking).
         resolutionTimeLabel (Text): The label for displaying the resolution time.
+        resolutionAlgorithmTimeLabel (Text): The label for displaying the time spent in the resolution algorithm.
         totalMoveCountLabel (Text): The label for displaying the total move count.
         pathLengthLabel (Text): The label for displaying the path length.
         visitedCountLabel (Text): The label for displaying the number of visited cells (recursive backtracking).
         bannedCountLabel (Text): The label for displaying the number of banned cells (recursive backtracking).
+        filledCountLabel (Text): The label for displaying the number of filled cells (dead-end filling).
+        frameTimeLabel (Text): The label for displaying the time taken to draw a frame.
+        camera (Camera): The view on the labyrinth, which can be moved and zoomed.
+        frame_time (float): The time taken to draw the last frames, in seconds (smoothed over several frames).
+        speed (str): The speed of the animation of the generation and resolution (see SPEEDS).
+        speed_button (Button): The button to change the speed.
 
     Methods:
         update(clock): Updates the menu elements and labels.
-        draw(): Draws the labyrinth and pathfinding images on the screen.
+        change_speed(): Switches to the next speed of the animation.
+        draw(): Draws the visible part of the labyrinth and of the pathfinding layer on the screen.
+        on_key(key, down): Moves or zooms the view with the keyboard.
+        on_scroll(amount, pos): Zooms the view around the mouse.
+        on_drag(pos, rel): Moves the view with the mouse.
     """
 
     def __init__(
@@ -52,9 +72,11 @@ class Resolution(MenuFactory):
         self.stack = stack
         self.screen = pygame.display.get_surface()
 
-        self.labyrinth = Labyrinth(
-            (size, size), generation_method, resolution_method, looping_factor
-        )  # Create a labyrinth object
+        self.labyrinth = Labyrinth((size, size), generation_method, resolution_method, looping_factor)
+
+        # The labyrinth is seen through a camera, in the area on the left of the labels. At first, the whole labyrinth
+        # is shown (as long as the cells are not too small), then the view can be moved and zoomed.
+        self.camera = Camera(self.labyrinth, pygame.Rect(20, 20, HEIGHT - 40, HEIGHT - 40))
 
         quit_button = Button(
             self.screen.get_width() - 100,
@@ -67,6 +89,19 @@ class Resolution(MenuFactory):
         )
         self.buttons.add(quit_button)
 
+        # The speed of the animation, changed by clicking on the button
+        self.speed = "1x"
+        self.speed_button = Button(
+            self.screen.get_width() - 280,
+            self.screen.get_height() - 50,
+            160,
+            30,
+            BUTTON_COLOR,
+            f"Vitesse : {self.speed}",
+            self.change_speed,
+        )
+        self.buttons.add(self.speed_button)
+
         # Statistics about the generation and resolution
         self.statusLabel = Text(self.screen.get_width() // 2 + 120, 10, (255, 255, 255), "Statut : Génération")
         self.elements.add(self.statusLabel)
@@ -79,47 +114,96 @@ class Resolution(MenuFactory):
         )
         self.elements.add(self.loopingFactorLabel)
         self.generationTimeLabel = Text(
-            self.screen.get_width() // 2 + 120, 85, (255, 255, 255), "Temps de génération : 0"
+            self.screen.get_width() // 2 + 120, 85, (255, 255, 255), "Temps de génération : 0", counter=True
         )
         self.elements.add(self.generationTimeLabel)
-        self.generationStepLabel = Text(self.screen.get_width() // 2 + 120, 110, (255, 255, 255), "Étape : 0")
+        # The time spent in the algorithm itself, without the time spent drawing the frames in between
+        self.generationAlgorithmTimeLabel = Text(
+            self.screen.get_width() // 2 + 120, 110, (255, 255, 255), "Temps de calcul : 0", counter=True
+        )
+        self.elements.add(self.generationAlgorithmTimeLabel)
+        self.generationStepLabel = Text(
+            self.screen.get_width() // 2 + 120, 135, (255, 255, 255), "Étape : 0", counter=True
+        )
         self.elements.add(self.generationStepLabel)
 
         # Blank space of 25 pixels
 
         self.resolutionMethodLabel = Text(
             self.screen.get_width() // 2 + 120,
-            150,
+            175,
             (255, 255, 255),
             f"Méthode de résolution : {'A*' if resolution_method == 'a-star' else ''}",
         )
         self.elements.add(self.resolutionMethodLabel)
         if resolution_method != "a-star":  # On a new line
             self.resolutionMethodLabel2 = Text(
-                self.screen.get_width() // 2 + 120, 175, (255, 255, 255), f"Recursive backtracking"
+                self.screen.get_width() // 2 + 120,
+                200,
+                (255, 255, 255),
+                {
+                    "bidirectional": "BFS bidirectionnel",
+                    "dead-end-filling": "Remplissage des impasses",
+                }.get(resolution_method, "Recursive backtracking"),
             )
             self.elements.add(self.resolutionMethodLabel2)
 
         self.resolutionTimeLabel = Text(
-            self.screen.get_width() // 2 + 120, 200, (255, 255, 255), "Temps de résolution : 0"
+            self.screen.get_width() // 2 + 120, 225, (255, 255, 255), "Temps de résolution : 0", counter=True
         )
         self.elements.add(self.resolutionTimeLabel)
+        self.resolutionAlgorithmTimeLabel = Text(
+            self.screen.get_width() // 2 + 120, 250, (255, 255, 255), "Temps de calcul : 0", counter=True
+        )
+        self.elements.add(self.resolutionAlgorithmTimeLabel)
 
-        self.totalMoveCountLabel = Text(self.screen.get_width() // 2 + 120, 225, (255, 255, 255), "Étape : 0")
+        self.totalMoveCountLabel = Text(
+            self.screen.get_width() // 2 + 120, 275, (255, 255, 255), "Étape : 0", counter=True
+        )
         self.elements.add(self.totalMoveCountLabel)
 
-        self.pathLengthLabel = Text(self.screen.get_width() // 2 + 120, 250, (255, 255, 255), "Longueur du chemin : 0")
+        self.pathLengthLabel = Text(
+            self.screen.get_width() // 2 + 120, 300, (255, 255, 255), "Longueur du chemin : 0", counter=True
+        )
         self.elements.add(self.pathLengthLabel)
 
         # Adding the visited / banned stats only if the resolution method is recursive backtracking
         if self.labyrinth.resolution_algorithm == "recursive-backtracking":
             self.visitedCountLabel = Text(
-                self.screen.get_width() // 2 + 120, 275, (255, 255, 255), "Cases visitées : 0"
+                self.screen.get_width() // 2 + 120, 325, (255, 255, 255), "Cases visitées : 0", counter=True
             )
             self.elements.add(self.visitedCountLabel)
-            self.bannedCountLabel = Text(self.screen.get_width() // 2 + 120, 300, (255, 255, 255), "Cases bannies : 0")
+            self.bannedCountLabel = Text(
+                self.screen.get_width() // 2 + 120, 350, (255, 255, 255), "Cases bannies : 0", counter=True
+            )
             self.elements.add(self.bannedCountLabel)
 
+        # The time taken to draw a frame, which only depends on the size of the view
+        self.frameTimeLabel = Text(
+            self.screen.get_width() // 2 + 120, 390, (255, 255, 255), "Temps d'affichage : 0", counter=True
+        )
+        self.elements.add(self.frameTimeLabel)
+        self.frame_time = 0
+
+        # The hit rate of the text cache, for debugging
+        if DRAW_TEXT_CACHE_STATS:
+            self.cacheStatsLabel = Text(self.screen.get_width() // 2 + 120, 415, (255, 255, 255), "", counter=True)
+            self.elements.add(self.cacheStatsLabel)
+
+        self.elements.add(
+            Text(self.screen.get_width() // 2 + 120, 440, (255, 255, 255), "Molette ou +/- : zoom, R : recentrer")
+        )
+        self.elements.add(
+            Text(self.screen.get_width() // 2 + 120, 465, (255, 255, 255), "Glisser ou flèches : déplacer la vue")
+        )
+
+        # Adding the filled cells count if the resolution method is dead-end filling
+        if self.labyrinth.resolution_algorithm == "dead-end-filling":
+            self.filledCountLabel = Text(
+                self.screen.get_width() // 2 + 120, 325, (255, 255, 255), "Cases comblées : 0", counter=True
+            )
+            self.elements.add(self.filledCountLabel)
+
     def update(self, clock):
         """
         Updates the menu elements and labels.
@@ -136,16 +220,27 @@ class Resolution(MenuFactory):
         self.generationTimeLabel.update_text(
             f"Temps de génération : {self.labyrinth.generation_data['generation_time']:.2f}s"
         )
+        self.generationAlgorithmTimeLabel.update_text(
+            f"Temps de calcul : {self.labyrinth.generation_data['algorithm_time']:.2f}s"
+        )
         self.generationStepLabel.update_text(f"Étape : {self.labyrinth.generation_data['action_count']}")
 
         self.resolutionTimeLabel.update_text(
             f"Temps de résolution : {self.labyrinth.resolution_data['resolution_time']:.2f}s"
         )
+        self.resolutionAlgorithmTimeLabel.update_text(
+            f"Temps de calcul : {self.labyrinth.resolution_data['algorithm_time']:.2f}s"
+        )
 
         self.totalMoveCountLabel.update_text(f"Étape : {self.labyrinth.resolution_data['total_move_count']}")
+        self.frameTimeLabel.update_text(f"Temps d'affichage : {self.frame_time * 1000:.2f}ms")
+        if DRAW_TEXT_CACHE_STATS:
+            self.cacheStatsLabel.update_text(get_text_cache_stats())
 
-        if self.labyrinth.resolution_algorithm == "a-star":
+        if self.labyrinth.resolution_algorithm in ("a-star", "bidirectional", "dead-end-filling"):
             self.pathLengthLabel.update_text(f"Longueur du chemin : {len(self.labyrinth.resolution_data['path'])}")
+            if self.labyrinth.resolution_algorithm == "dead-end-filling":
+                self.filledCountLabel.update_text(f"Cases comblées : {self.labyrinth.resolution_data['filled_count']}")
         elif self.labyrinth.resolution_algorithm == "recursive-backtracking":
             self.pathLengthLabel.update_text(
                 f"Longueur du chemin : {len(self.labyrinth.resolution_data['stack']) - 1}"
@@ -155,32 +250,108 @@ class Resolution(MenuFactory):
             self.visitedCountLabel.update_text(f"Cases visitées : {len(self.labyrinth.resolution_data['visited'])}")
             self.bannedCountLabel.update_text(f"Cases bannies : {len(self.labyrinth.resolution_data['banned'])}")
 
-        if not self.labyrinth.generation_data["is_generated"]:
-            self.labyrinth.generate_step()
+        steps = SPEEDS[self.speed]
+        if steps is None:
+            # The generation has a faster method than its steps. The resolution steps fill the data of the overlay,
+            # so they are still used, but without waiting for the next frames.
+            self.labyrinth.generate()
+            self.labyrinth.run_steps(math.inf)
         else:
-            if not self.labyrinth.resolution_data["is_solved"]:
-                self.labyrinth.resolve_step()
+            # Several steps can be performed at each frame, as long as they leave time to draw the frame.
+            self.labyrinth.run_steps(steps, STEP_BUDGET)
+
+    def change_speed(self):
+        """
+        Switches to the next speed of the animation.
+        """
+        speeds = list(SPEEDS)
+        self.speed = speeds[(speeds.index(self.speed) + 1) % len(speeds)]
+        self.speed_button.set_text(f"Vitesse : {self.speed}")
+        self.mark_dirty(self.speed_button.rect)
 
     def draw(self):
         """
-        Draws the labyrinth and pathfinding images on the screen.
+        Draws the visible part of the labyrinth and of the pathfinding layer on the screen.
 
-        This works in the same way as in the `Game` class.
+        This works in the same way as in the `Game` class, where the camera follows the character instead.
         """
+        start = time.perf_counter()
         super().draw()
 
-        labyrinth_image = self.labyrinth.get_image()
-        labyrinth_image_height = labyrinth_image.get_size()[1]
-        displayable_height = HEIGHT - 40
-        ratio = displayable_height / labyrinth_image_height
-        labyrinth_image = pygame.transform.scale(
-            labyrinth_image, (int(ratio * labyrinth_image.get_size()[0]), displayable_height)
-        )
-        pathfinding_image = self.labyrinth.get_pathfinding_image()
-        pathfinding_image = pygame.transform.scale(
-            pathfinding_image, (int(ratio * pathfinding_image.get_size()[0]), displayable_height)
-        )
+        # Only the tiles of the labyrinth and of the pathfinding layer that are in the view are drawn.
+        self.camera.draw(self.screen)
+
+        # The frame time is smoothed, otherwise the label would change too fast to be read.
+        self.frame_time = 0.9 * self.frame_time + 0.1 * (time.perf_counter() - start)
+
+    def draw_changes(self):
+        """
+        Draws again the tiles of the labyrinth and of the pathfinding layer that changed since the last frame.
+
+        Returns:
+            list: The areas of the screen that were drawn again.
+        """
+        start = time.perf_counter()
+        rects = self.camera.draw(self.screen, only_changes=True)
+        # The frames where the view did not change would only lower the average. They are not measured, otherwise the
+        # frame time label itself would be drawn again at every frame.
+        if rects:
+            self.frame_time = 0.9 * self.frame_time + 0.1 * (time.perf_counter() - start)
+        return rects + super().draw_changes()
+
+    def is_idle(self):
+        """
+        Checks if the screen is complete, once the labyrinth is solved and all the visible tiles are rendered.
+
+        Returns:
+            bool: True if the screen only changes when the user moves or zooms the view, False otherwise.
+        """
+        return self.labyrinth.resolution_data["is_solved"] and self.camera.pending_tiles == 0 and super().is_idle()
+
+    def on_key(self, key, down):
+        """
+        Moves or zooms the view with the keyboard.
+
+        Parameters:
+        - key (int): The key code.
+        - down (bool): Indicates if the key is pressed down.
+        """
+        if not down:
+            return
+        step = self.camera.viewport.width // 4  # A quarter of the view at each key press
+        if key == pygame.K_UP or key == pygame.K_z:
+            self.camera.pan(0, -step)
+        elif key == pygame.K_DOWN or key == pygame.K_s:
+            self.camera.pan(0, step)
+        elif key == pygame.K_LEFT or key == pygame.K_q:
+            self.camera.pan(-step, 0)
+        elif key == pygame.K_RIGHT or key == pygame.K_d:
+            self.camera.pan(step, 0)
+        elif key in (pygame.K_PLUS, pygame.K_KP_PLUS, pygame.K_EQUALS):
+            self.camera.zoom(1)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.camera.zoom(-1)
+        elif key == pygame.K_r:
+            self.camera.fit()
+
+    def on_scroll(self, amount, pos):
+        """
+        Zooms the view around the mouse, if it is over the labyrinth.
+
+        Parameters:
+        - amount (int): The number of steps scrolled, positive when scrolling up.
+        - pos (tuple): The position of the mouse.
+        """
+        if self.camera.viewport.collidepoint(pos):
+            self.camera.zoom(amount, pos)
 
-        # Draw the two layers to the screen.
-        self.screen.blit(labyrinth_image, (20, 20))
-        self.screen.blit(pathfinding_image, (20, 20))
+    def on_drag(self, pos, rel):
+        """
+        Moves the view with the mouse, if it is over the labyrinth.
+
+        Parameters:
+        - pos (tuple): The position of the mouse.
+        - rel (tuple): The motion of the mouse since the last event.
+        """
+        if self.camera.viewport.collidepoint(pos):
+            self.camera.pan(-rel[0], -rel[1])
@@ -0,0 +1,256 @@
+JOURNAL_LIMIT = 4096  # The maximum number of changes kept in the journal of a wall grid
+
+
+class BitPlane:
+    """
+    A plane of walls packed at one bit per cell, read directly from a buffer such as a memory-mapped file.
+
+    It can be used in place of the byte planes of a `WallGrid`: indexing it with a cell ID gives 1 if there is a wall,
+    0 otherwise. Nothing is read from the buffer until a wall is accessed, so a plane of several gigabytes is available
+    at once, and the operating system only loads the pages of the file that are read. Each access is slower than with a
+    byte plane, so the planes should be unpacked (see `unpack`) when every wall is going to be read many times.
+
+    The bit of cell `i` is the bit `i % 8` (from the least significant) of the byte `i // 8` of the plane.
+
+    Attributes:
+        buffer (buffer): The buffer holding the plane. It must support indexing and the buffer protocol (a bytearray,
+            or a mmap object). Writing to the plane writes to the buffer.
+        offset (int): The position of the plane in the buffer, in bytes.
+        length (int): The number of cells of the plane.
+    """
+
+    def __init__(self, buffer, offset, length):
+        self.buffer = buffer
+        self.offset = offset
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        return (self.buffer[self.offset + (index >> 3)] >> (index & 7)) & 1
+
+    def __setitem__(self, index, value):
+        position = self.offset + (index >> 3)
+        if value:
+            self.buffer[position] |= 1 << (index & 7)
+        else:
+            self.buffer[position] &= ~(1 << (index & 7)) & 0xFF
+
+    def unpack(self):
+        """
+        Unpacks the plane into an array of bytes, with NumPy.
+
+        Returns:
+        - numpy.ndarray: The plane, as an array of `length` uint8 values (1 if there is a wall).
+        """
+        import numpy as np  # Imported here, so that importing the maze module stays fast
+
+        packed = np.frombuffer(self.buffer, dtype=np.uint8, count=(self.length + 7) // 8, offset=self.offset)
+        return np.unpackbits(packed, count=self.length, bitorder="little")
+
+
+class WallGrid:
+    """
+    Stores the walls of a labyrinth as two byte planes indexed by cell ID.
+
+    A labyrinth only has two kinds of inner walls: the wall on the right side of a cell (between `i` and `i + 1`)
+    and the wall on the bottom side of a cell (between `i` and `i + width`). Every other wall is the right or bottom
+    wall of another cell, so two planes of `width * height` bytes are enough to describe any labyrinth.
+    Checking, adding or removing a wall is a single index operation, instead of a linear scan over a list of tuples.
+
+    The grid still behaves like the old list of `(case_1, case_2)` tuples when iterated over, which keeps the code
+    that loops over `labyrinth.walls` (such as `get_image`) working without modification.
+
+    Attributes:
+        width (int): The width of the labyrinth in cells.
+        height (int): The height of the labyrinth in cells.
+        right (bytearray): The right walls plane. `right[i]` is 1 if there is a wall between `i` and `i + 1`.
+        bottom (bytearray): The bottom walls plane. `bottom[i]` is 1 if there is a wall between `i` and `i + width`.
+        count (int): The number of walls currently in the grid.
+        version (int): Incremented every time the walls change, so that the structures built from them (such as the
+            junction graph) know when to rebuild. Code that writes the planes directly must increment it as well.
+        journal (list): The walls added or removed one by one, as `(case_1, case_2)` tuples, in order.
+        journal_start (int): The version of the grid before the first change of the journal.
+    """
+
+    def __init__(self, width, height, right=None, bottom=None, count=0):
+        """
+        Initializes a wall grid, empty unless existing planes are given.
+
+        Parameters:
+        - width (int): The width of the labyrinth in cells.
+        - height (int): The height of the labyrinth in cells.
+        - right (bytearray or BitPlane): The right walls plane, None for an empty plane.
+        - bottom (bytearray or BitPlane): The bottom walls plane, None for an empty plane.
+        - count (int): The number of walls in the given planes.
+        """
+        self.width = width
+        self.height = height
+        self.right = bytearray(width * height) if right is None else right
+        self.bottom = bytearray(width * height) if bottom is None else bottom
+        self.count = count
+        self.version = 0
+        self.journal = []
+        self.journal_start = 0
+
+    def locate(self, case_1, case_2):
+        """
+        Finds the plane and the index storing the wall between two cells.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+
+        Returns:
+        - tuple: The plane (bytearray) and the index of the wall in it, or None if the cells are not adjacent.
+        """
+        if case_1 > case_2:  # Allows for the function to work with unordered arguments
+            case_1, case_2 = case_2, case_1
+        if case_1 < 0 or case_2 >= self.width * self.height:
+            return None
+        if case_2 == case_1 + 1 and case_2 % self.width != 0:  # The cells are on the same line
+            return self.right, case_1
+        if case_2 == case_1 + self.width:
+            return self.bottom, case_1
+        return None
+
+    def has_wall(self, case_1, case_2):
+        """
+        Checks if there is a wall between two adjacent cells.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+
+        Returns:
+        - bool: True if there is a wall, False otherwise (or if the cells are not adjacent).
+        """
+        location = self.locate(case_1, case_2)
+        if location is None:
+            return False
+        plane, index = location
+        return plane[index] == 1
+
+    def add(self, case_1, case_2):
+        """
+        Adds a wall between two adjacent cells.
+
+        Returns:
+        - bool: True if the wall was added, False if it already existed or if the cells are not adjacent.
+        """
+        location = self.locate(case_1, case_2)
+        if location is None:
+            return False
+        plane, index = location
+        if plane[index]:
+            return False
+        plane[index] = 1
+        self.count += 1
+        self.record(case_1, case_2)
+        return True
+
+    def remove(self, case_1, case_2):
+        """
+        Removes the wall between two adjacent cells.
+
+        Returns:
+        - bool: True if the wall was removed, False if there was no wall or if the cells are not adjacent.
+        """
+        location = self.locate(case_1, case_2)
+        if location is None:
+            return False
+        plane, index = location
+        if not plane[index]:
+            return False
+        plane[index] = 0
+        self.count -= 1
+        self.record(case_1, case_2)
+        return True
+
+    def record(self, case_1, case_2):
+        """
+        Records a change of a single wall in the journal, and increments the version of the grid.
+
+        The journal only describes the changes since `journal_start` if every version in between was recorded. When the
+        planes have been written directly (a bulk change), the journal is restarted from the current version.
+        The oldest half of the journal is dropped when it grows over `JOURNAL_LIMIT` changes.
+
+        Parameters:
+        - case_1 (int): The ID of the first cell.
+        - case_2 (int): The ID of the second cell.
+        """
+        if self.journal_start + len(self.journal) != self.version:  # Some changes were not recorded
+            self.journal = []
+            self.journal_start = self.version
+        elif len(self.journal) >= JOURNAL_LIMIT:
+            dropped = len(self.journal) // 2
+            del self.journal[:dropped]
+            self.journal_start += dropped
+        self.journal.append((min(case_1, case_2), max(case_1, case_2)))
+        self.version += 1
+
+    def get_changes_since(self, version):
+        """
+        Gets the walls that were added or removed since a given version of the grid.
+
+        Parameters:
+        - version (int): The version of the grid.
+
+        Returns:
+        - list: The changed walls as `(case_1, case_2)` tuples, or None if they are unknown (the changes were not all
+          recorded, or were dropped from the journal). The caller must then assume that any wall may have changed.
+        """
+        if version < self.journal_start or self.journal_start + len(self.journal) != self.version:
+            return None
+        return self.journal[version - self.journal_start :]
+
+    def fill(self):
+        """
+        Adds every possible inner wall to the grid.
+
+        This is done line by line with slice assignments, which is much faster than adding the walls one by one.
+        """
+        width, height = self.width, self.height
+        line = b"\x01" * (width - 1) + b"\x00"  # The last cell of a line has no right wall inside the labyrinth
+        self.right[:] = line * height
+        self.bottom[:] = b"\x01" * (width * (height - 1)) + b"\x00" * width  # The last line has no bottom wall
+        self.count = (width - 1) * height + width * (height - 1)
+        self.version += 1
+
+    def as_arrays(self):
+        """
+        Gets the two planes as NumPy arrays, for vectorized algorithms.
+
+        The arrays share their memory with the byte planes: no copy is made, and changing the walls changes the arrays.
+        Packed planes (see `BitPlane`) are unpacked into new arrays instead.
+
+        Returns:
+        - tuple: The right and bottom planes, as arrays of `width * height` uint8 values (1 if there is a wall).
+        """
+        import numpy as np  # Imported here, so that importing the maze module stays fast
+
+        if isinstance(self.right, BitPlane):
+            return self.right.unpack(), self.bottom.unpack()
+        return np.frombuffer(self.right, dtype=np.uint8), np.frombuffer(self.bottom, dtype=np.uint8)
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, wall):
+        return self.has_wall(wall[0], wall[1])
+
+    def __iter__(self):
+        """
+        Iterates over the walls as `(case_1, case_2)` tuples, with `case_1 < case_2`.
+
+        The walls are yielded in the same order as `Labyrinth.fill_with_walls` creates them.
+        """
+        width = self.width
+        right = self.right
+        bottom = self.bottom
+        for i in range(width * self.height):
+            if right[i]:
+                yield (i, i + 1)
+            if bottom[i]:
+                yield (i, i + width)